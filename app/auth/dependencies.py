@@ -1,32 +1,74 @@
 # app/auth/dependencies.py
 
+import uuid
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.auth.principal_cache import principal_cache
+from app.database import get_async_read_db, get_read_db
 from app.models.user import User
 from app.schemas.user import UserResponse
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
+
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
 
 def get_current_user(
-    db,
+    db: Session = Depends(get_read_db),
     token: str = Depends(oauth2_scheme)
 ) -> UserResponse:
-    """Dependency to get current user from JWT token."""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
+    """Dependency to get current user from JWT token.
+
+    Users are served from the principal cache when possible, so most
+    requests do not query the database; misses read from a replica.
+    """
     user_id = User.verify_token(token)
     if user_id is None:
         raise credentials_exception
-    
+
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    generation = principal_cache.generation
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise credentials_exception
         
-    return UserResponse.model_validate(user)  # Updated from from_orm
+    principal = UserResponse.model_validate(user)  # Updated from from_orm
+    principal_cache.put(user_id, principal, generation)
+    return principal
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_read_db),
+    token: str = Depends(oauth2_scheme)
+) -> UserResponse:
+    """Same as get_current_user, for async routes: a cache miss awaits the database."""
+    user_id = User.verify_token(token)
+    if user_id is None:
+        raise credentials_exception
+
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    generation = principal_cache.generation
+    user = await db.get(User, user_id)
+    if user is None:
+        raise credentials_exception
+
+    principal = UserResponse.model_validate(user)
+    principal_cache.put(user_id, principal, generation)
+    return principal
 
 def get_current_active_user(
     current_user: UserResponse = Depends(get_current_user)
@@ -37,4 +79,13 @@ def get_current_active_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+def get_optional_user_id(
+    token: Optional[str] = Depends(optional_oauth2_scheme)
+) -> Optional[uuid.UUID]:
+    """Dependency returning the user id of a valid bearer token, if one was sent.
+
+    Only the token is checked; the database is not queried.
+    """
+    return User.verify_token(token) if token else None
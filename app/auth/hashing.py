@@ -0,0 +1,260 @@
+# app/auth/hashing.py
+
+"""
+Password hashing off the event loop.
+
+bcrypt costs 100-300 ms of CPU per call. Run inline it blocks every other
+request served by the same worker, so the async helpers here hand the work
+to a small dedicated thread pool (the bcrypt extension releases the GIL
+while hashing).
+
+The pool is bounded twice: at most ``HASH_POOL_SIZE`` hashes run at once and
+at most ``HASH_MAX_QUEUE`` more may wait. Beyond that a call fails
+immediately with ``HashingSaturatedError`` rather than queueing for
+seconds; routes turn it into ``503 Service Unavailable``.
+
+The bcrypt cost is calibrated at startup (``calibrate_bcrypt``): the
+highest number of rounds whose measured hashing time stays within
+``BCRYPT_TARGET_MS`` on this machine, unless ``BCRYPT_ROUNDS`` pins it.
+Workers on one host share the first worker's result through a small file so
+they never disagree, which would otherwise make logins rehash back and forth.
+The file is named after the calibration settings and the parent (master)
+process, so changing the settings or restarting the server calibrates
+afresh, while workers the master respawns reuse the running cost.
+
+Bulk imports hash thousands of passwords at once; ``hash_passwords`` spreads
+them over a process pool instead, in chunks, at the calibrated cost.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+
+from passlib.context import CryptContext
+from passlib.hash import bcrypt
+
+from app.config import settings
+
+
+T = TypeVar("T")
+
+
+class HashingSaturatedError(RuntimeError):
+    """Raised when the hashing pool and its queue are full."""
+
+
+class HashingPool:
+    """A bounded thread pool with queue-depth metrics and fast rejection."""
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0  # queued + running
+        self._running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.peak_queued = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    def _call(self, func: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            self._running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _release(self, future: Future) -> None:
+        # A done callback, so a call cancelled while still queued frees its slot too.
+        with self._lock:
+            self._pending -= 1
+            if not future.cancelled():
+                self.completed += 1
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run ``func(*args)`` on the pool and await its result.
+
+        Raises:
+        - HashingSaturatedError: If ``workers + max_queue`` calls are already pending.
+        """
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HashingSaturatedError("Password hashing is saturated, retry later")
+            self._pending += 1
+            self.peak_queued = max(self.peak_queued, self._pending - self.workers)
+            try:
+                future = self._get_executor().submit(self._call, func, *args)
+            except BaseException:
+                self._pending -= 1
+                raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "peak_queued": self.peak_queued,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+hashing_pool = HashingPool(settings.HASH_POOL_SIZE, settings.HASH_MAX_QUEUE)
+
+
+async def hash_password_async(context: CryptContext, password: str) -> str:
+    return await hashing_pool.run(context.hash, password)
+
+
+async def verify_password_async(context: CryptContext, password: str, password_hash: str) -> bool:
+    return await hashing_pool.run(context.verify, password, password_hash)
+
+
+def measure_bcrypt(rounds: int, samples: int = 3) -> float:
+    """Median seconds to hash one password at ``rounds``."""
+    handler = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        handler.hash("calibration-password")
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def calibrate_rounds(target_ms: float, min_rounds: int, max_rounds: int, probe_rounds: int = 8) -> int:
+    """
+    Highest rounds in ``[min_rounds, max_rounds]`` expected to hash within
+    ``target_ms``. Each extra round doubles the work, so a cheap probe at
+    ``probe_rounds`` is extrapolated instead of timing the expensive costs.
+    """
+    probe_ms = measure_bcrypt(probe_rounds) * 1000
+    rounds = min_rounds
+    while rounds < max_rounds and probe_ms * 2 ** (rounds + 1 - probe_rounds) <= target_ms:
+        rounds += 1
+    return rounds
+
+
+def configure_bcrypt(context: CryptContext, rounds: int, tolerance: int = 0) -> None:
+    """
+    Hash new passwords at ``rounds`` and make ``context.needs_update`` flag
+    stored hashes below it or more than ``tolerance`` rounds above it.
+    """
+    context.update(
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds + tolerance,
+    )
+
+
+def _shared_rounds(path: str, calibrate: Callable[[], int]) -> int:
+    """Rounds recorded at ``path`` by another worker, or calibrate and record them."""
+    try:
+        with open(path) as fh:
+            return int(fh.read())
+    except (FileNotFoundError, ValueError):
+        pass
+    rounds = calibrate()
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "w") as fh:
+            fh.write(str(rounds))
+        # link() fails if another worker published first; theirs wins.
+        os.link(tmp, path)
+    except FileExistsError:
+        with open(path) as fh:
+            rounds = int(fh.read())
+    finally:
+        os.unlink(tmp)
+    return rounds
+
+
+def calibration_path() -> str:
+    """File shared by the workers of one server for the current calibration settings."""
+    base = settings.BCRYPT_CALIBRATION_FILE or os.path.join(tempfile.gettempdir(), "calc_bcrypt_rounds")
+    return (
+        f"{base}-{settings.BCRYPT_TARGET_MS:g}ms"
+        f"-{settings.BCRYPT_MIN_ROUNDS}-{settings.BCRYPT_MAX_ROUNDS}-{os.getppid()}"
+    )
+
+
+def calibrate_bcrypt(context: CryptContext) -> int:
+    """Startup hook: choose the bcrypt cost and apply it to ``context``."""
+    rounds = settings.BCRYPT_ROUNDS
+    if not rounds:
+        rounds = _shared_rounds(
+            calibration_path(),
+            lambda: calibrate_rounds(
+                settings.BCRYPT_TARGET_MS, settings.BCRYPT_MIN_ROUNDS, settings.BCRYPT_MAX_ROUNDS
+            ),
+        )
+    configure_bcrypt(context, rounds, settings.BCRYPT_ROUNDS_TOLERANCE)
+    return rounds
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # spawn: forking a process that already runs threads is unsafe.
+            _process_pool = ProcessPoolExecutor(
+                max_workers=settings.HASH_PROCESS_POOL_SIZE or os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=True, cancel_futures=True)
+            _process_pool = None
+
+
+def _hash_chunk(passwords: Sequence[str], rounds: int) -> List[str]:
+    """Pool task; the cost is passed in because calibration only ran in the parent."""
+    handler = bcrypt.using(rounds=rounds)
+    return [handler.hash(password[:72]) for password in passwords]
+
+
+def hash_passwords(context: CryptContext, passwords: Sequence[str], chunk_size: int = 32) -> List[str]:
+    """Hash many passwords on the process pool at ``context``'s bcrypt cost, preserving order."""
+    if not passwords:
+        return []
+    rounds = context.handler("bcrypt").default_rounds
+    chunks = [passwords[start:start + chunk_size] for start in range(0, len(passwords), chunk_size)]
+    if len(chunks) == 1:
+        return _hash_chunk(chunks[0], rounds)
+    hashes: List[str] = []
+    for chunk in _get_process_pool().map(_hash_chunk, chunks, [rounds] * len(chunks)):
+        hashes.extend(chunk)
+    return hashes
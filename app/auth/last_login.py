@@ -0,0 +1,147 @@
+# app/auth/last_login.py
+
+"""
+Write-behind buffer for ``users.last_login``.
+
+A successful login only records ``user id -> timestamp`` in memory,
+keeping the latest value per user, so a login storm costs no write
+transaction per request. A background thread flushes the buffer every
+``LAST_LOGIN_FLUSH_INTERVAL`` seconds, or as soon as
+``LAST_LOGIN_MAX_PENDING`` users are waiting, with one bulk
+
+    UPDATE users SET last_login = v.last_login
+    FROM (VALUES ...) AS v (id, last_login)
+    WHERE users.id = v.id AND (users.last_login IS NULL OR users.last_login < v.last_login)
+
+per ``LAST_LOGIN_MAX_BATCH`` users. Those two limits bound what a crash
+can lose. A failed flush puts its rows back to be retried with the next
+one. ``updated_at`` is left alone: a login is not a profile change.
+
+While the buffer is not running (no application lifespan, e.g. scripts
+and most tests) ``record`` returns False and the caller writes directly.
+"""
+
+import logging
+import threading
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import DateTime, column, or_, table, update, values
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.config import settings
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Lightweight table clause: importing the User model here would be circular.
+_users = table("users", column("id", UUID(as_uuid=True)), column("last_login", DateTime))
+
+
+class LastLoginBuffer:
+    """Coalescing map of pending last-login times plus a flushing thread."""
+
+    def __init__(
+        self,
+        session_factory: Callable = SessionLocal,
+        flush_interval: float = settings.LAST_LOGIN_FLUSH_INTERVAL,
+        max_pending: int = settings.LAST_LOGIN_MAX_PENDING,
+        max_batch: int = settings.LAST_LOGIN_MAX_BATCH,
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_batch = max_batch
+        self._pending: Dict[uuid.UUID, datetime] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"recorded": 0, "coalesced": 0, "written": 0, "failed": 0, "flushes": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stopping
+
+    def record(self, user_id: uuid.UUID, when: datetime) -> bool:
+        """Buffer a login time; returns False if not running, in which case nothing was buffered."""
+        if not self.running:
+            return False
+        with self._lock:
+            previous = self._pending.get(user_id)
+            if previous is None or when > previous:
+                self._pending[user_id] = when
+            self._stats["recorded"] += 1
+            if previous is not None:
+                self._stats["coalesced"] += 1
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wake.set()
+        return True
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="last-login-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Flush everything buffered so far and stop the background thread."""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, pending=len(self._pending))
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Write all pending times now; returns the number of users written."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        rows: List[Tuple[uuid.UUID, datetime]] = list(pending.items())
+        try:
+            with self.session_factory() as session:
+                for start in range(0, len(rows), self.max_batch):
+                    session.execute(self._statement(rows[start:start + self.max_batch]))
+                session.commit()
+        except Exception:
+            logger.exception("Failed to write last_login for %d users", len(rows))
+            with self._lock:
+                self._stats["failed"] += len(rows)
+                # Retry with the next flush, unless a newer login arrived meanwhile.
+                for user_id, when in rows:
+                    if self._pending.get(user_id, when) <= when:
+                        self._pending[user_id] = when
+            return 0
+        with self._lock:
+            self._stats["written"] += len(rows)
+            self._stats["flushes"] += 1
+        return len(rows)
+
+    @staticmethod
+    def _statement(rows: List[Tuple[uuid.UUID, datetime]]):
+        logins = values(
+            column("id", UUID(as_uuid=True)), column("last_login", DateTime), name="logins"
+        ).data(rows)
+        return (
+            update(_users)
+            .where(_users.c.id == logins.c.id)
+            .where(or_(_users.c.last_login.is_(None), _users.c.last_login < logins.c.last_login))
+            .values(last_login=logins.c.last_login)
+        )
+
+
+last_login_buffer = LastLoginBuffer()
@@ -0,0 +1,161 @@
+# app/auth/login_throttle.py
+
+"""
+Failed-login throttle.
+
+Credential stuffing turns every guess against a known username into a full
+bcrypt verification. This tracker counts failed logins per account and per
+client IP over a sliding window. Once either count reaches its limit
+(``LOGIN_MAX_ACCOUNT_FAILURES`` / ``LOGIN_MAX_IP_FAILURES`` per
+``LOGIN_FAILURE_WINDOW`` seconds), further attempts are rejected before the
+user lookup and before bcrypt. Each rejection counts as a verification
+avoided.
+
+Each key costs one small tuple: the start of the current fixed window and
+the failure counts of the current and previous windows. The sliding count
+weights the previous window by how much of it still overlaps the last
+``window`` seconds. Keys are kept in least-recently-failed order, and those
+whose windows have passed are evicted from the old end as new failures
+arrive. ``LOGIN_THROTTLE_MAX_KEYS`` bounds the total.
+
+Accounts are keyed by user id once the login lookup has found the user
+(``link``): the username and the email then share one count, so switching
+between them does not double the guesses. Identifiers that match no user
+are counted as typed, lowercased. The identifier to id mapping is an LRU
+bounded by ``LOGIN_THROTTLE_MAX_KEYS`` as well.
+
+A successful login clears the account's failures but not the IP's.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import settings
+
+# window start, failures in that window, failures in the window before
+Entry = Tuple[float, int, int]
+
+
+class LoginThrottle:
+    """Sliding-window failure counts per account and per IP."""
+
+    def __init__(self, max_account_failures: int, max_ip_failures: int, window: float, maxsize: int):
+        self.max_account_failures = max_account_failures
+        self.max_ip_failures = max_ip_failures
+        self.window = window
+        self.maxsize = maxsize
+        self.failures = 0
+        self.verifications_avoided = 0
+        self._entries: "OrderedDict[str, Entry]" = OrderedDict()
+        # lowercased username or email -> account key of the user it names
+        self._accounts: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _keys(self, username: str, ip: Optional[str]) -> Tuple[str, str]:
+        # Logins match usernames and emails case-insensitively; so must the throttle.
+        identifier = username.lower()
+        return self._accounts.get(identifier, f"account:{identifier}"), f"ip:{ip or 'unknown'}"
+
+    def link(self, user_id: Any, *identifiers: str) -> None:
+        """Count failures for any of ``identifiers`` (username, email) against ``user_id``."""
+        account = f"account:{user_id}"
+        with self._lock:
+            for identifier in identifiers:
+                if identifier:
+                    self._accounts[identifier.lower()] = account
+                    self._accounts.move_to_end(identifier.lower())
+            while len(self._accounts) > self.maxsize:
+                self._accounts.popitem(last=False)
+
+    def _current(self, entry: Optional[Entry], now: float) -> Entry:
+        """``entry`` rolled forward to the window containing ``now``."""
+        start = now - now % self.window
+        if entry is None or entry[0] < start - self.window:
+            return start, 0, 0
+        if entry[0] < start:
+            return start, 0, entry[1]
+        return entry
+
+    def _retry_after(self, entry: Entry, limit: int, now: float) -> float:
+        """Seconds until the sliding count of ``entry`` drops below ``limit``; 0 if it already is."""
+        start, current, previous = entry
+        elapsed = (now - start) / self.window
+        if previous * (1 - elapsed) + current < limit:
+            return 0.0
+        if current < limit:
+            # The previous window's weight fades linearly over this one.
+            wait = self.window * (1 - (limit - current) / previous) - (now - start)
+        else:
+            wait = (start + self.window - now) + self.window * (1 - limit / current)
+        return max(wait, 0.001)
+
+    def check(self, username: str, ip: Optional[str], now: Optional[float] = None) -> float:
+        """
+        Seconds the caller must wait before this attempt may proceed, or 0.
+        A rejected attempt is counted as a bcrypt verification avoided.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            account, address = self._keys(username, ip)
+            retry_after = 0.0
+            for key, limit in ((account, self.max_account_failures), (address, self.max_ip_failures)):
+                entry = self._entries.get(key)
+                if entry is not None and limit > 0:
+                    retry_after = max(retry_after, self._retry_after(self._current(entry, now), limit, now))
+            if retry_after:
+                self.verifications_avoided += 1
+            return retry_after
+
+    def record_failure(self, username: str, ip: Optional[str], now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            self.failures += 1
+            for key in self._keys(username, ip):
+                start, current, previous = self._current(self._entries.get(key), now)
+                self._entries[key] = (start, current + 1, previous)
+                self._entries.move_to_end(key)
+            self._evict(now)
+
+    def record_success(self, username: str, ip: Optional[str]) -> None:
+        with self._lock:
+            account, _ = self._keys(username, ip)
+            self._entries.pop(account, None)
+
+    def _evict(self, now: float) -> None:
+        # Oldest failures first; an entry is dead once both of its windows have passed.
+        horizon = now - now % self.window - self.window
+        while self._entries:
+            oldest = next(iter(self._entries.values()))
+            if oldest[0] >= horizon and len(self._entries) <= self.maxsize:
+                break
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._accounts.clear()
+            self.failures = 0
+            self.verifications_avoided = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "tracked": len(self._entries),
+                "linked_identifiers": len(self._accounts),
+                "maxsize": self.maxsize,
+                "failures": self.failures,
+                "verifications_avoided": self.verifications_avoided,
+            }
+
+
+login_throttle = LoginThrottle(
+    settings.LOGIN_MAX_ACCOUNT_FAILURES,
+    settings.LOGIN_MAX_IP_FAILURES,
+    settings.LOGIN_FAILURE_WINDOW,
+    settings.LOGIN_THROTTLE_MAX_KEYS,
+)
@@ -0,0 +1,126 @@
+# app/auth/principal_cache.py
+
+"""
+Cache of authenticated principals.
+
+``get_current_user`` runs on every protected request, but a user's row
+almost never changes. Validated ``UserResponse`` objects are therefore kept
+per user id, bounded by ``PRINCIPAL_CACHE_SIZE`` entries (LRU) and
+``PRINCIPAL_CACHE_TTL`` seconds.
+
+Updates made through the ORM invalidate the entry: a mapper
+``after_update``/``after_delete`` listener drops it at flush time, and the
+session's ``after_commit`` drops it again so a request that read the old
+row concurrently cannot leave it cached. Bulk ``UPDATE`` statements and
+other processes bypass these events; for them (and for the other uvicorn
+workers) the TTL bounds how stale a principal can get.
+
+Cached objects are shared between requests and must not be mutated.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.user import User
+from app.schemas.user import UserResponse
+
+
+class PrincipalCache:
+    """Thread-safe LRU of user id -> UserResponse with a TTL."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Bumped by every invalidation; see put().
+        self.generation = 0
+        self._entries: "OrderedDict[uuid.UUID, Tuple[UserResponse, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, user_id: uuid.UUID) -> Optional[UserResponse]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(user_id)
+                    self.hits += 1
+                    return entry[0]
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def put(self, user_id: uuid.UUID, principal: UserResponse, generation: int) -> None:
+        """
+        Cache ``principal``, loaded after reading ``generation``. It is
+        dropped if any invalidation happened since, because the row may have
+        been read before that change.
+        """
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[user_id] = (principal, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self.hits = self.misses = self.invalidations = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User) -> None:
+    if target.id is None:
+        return
+    principal_cache.invalidate(target.id)
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_principals", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    for user_id in session.info.pop("changed_principals", ()):
+        principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_users(session: Session) -> None:
+    session.info.pop("changed_principals", None)
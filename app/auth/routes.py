@@ -0,0 +1,151 @@
+# app/auth/routes.py
+
+"""
+Registration and login routes, and the admin bulk import.
+
+Both hash or verify a bcrypt password, so they use the async ``User``
+methods, which run bcrypt on the bounded hashing pool. When that pool is
+saturated the request fails fast with ``503`` and a ``Retry-After`` header.
+Their database work goes through the async session, so it does not hold a
+threadpool slot either. Logins throttled after repeated failures (see
+``app.auth.login_throttle``) are rejected with ``429`` before either.
+"""
+
+import math
+import secrets
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Request, status
+from sqlalchemy.exc import IntegrityError
+
+from app.auth.dependencies import oauth2_scheme
+from app.auth.hashing import HashingSaturatedError, hashing_pool
+from app.auth.last_login import last_login_buffer
+from app.auth.login_throttle import login_throttle
+from app.auth.principal_cache import principal_cache
+from app.auth.token_cache import token_cache
+from app.config import settings
+from app.database import get_async_db, get_db
+from app.models.user import User, pwd_context
+from app.rate_limit import login_rate_limit
+from app.schemas.base import UserCreate
+from app.schemas.user import Token, UserLogin, UserResponse
+
+router = APIRouter(tags=["auth"])
+
+
+def saturated(e: HashingSaturatedError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": "1"},
+    )
+
+
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def register(user_data: UserCreate, db=Depends(get_async_db)):
+    try:
+        user = await User.register_async(db, user_data.model_dump())
+        await db.commit()
+    except HashingSaturatedError as e:
+        raise saturated(e)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username or email already exists",
+        )
+    return UserResponse.model_validate(user)
+
+
+@router.post("/login", response_model=Token, dependencies=[Depends(login_rate_limit)])
+async def login(credentials: UserLogin, request: Request, db=Depends(get_async_db)):
+    ip = request.client.host if request.client else None
+    # Throttled attempts never reach the user lookup or bcrypt.
+    retry_after = login_throttle.check(credentials.username, ip)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts, retry later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+    try:
+        token = await User.authenticate_async(db, credentials.username, credentials.password)
+    except HashingSaturatedError as e:
+        raise saturated(e)
+    if token is None:
+        login_throttle.record_failure(credentials.username, ip)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    login_throttle.record_success(credentials.username, ip)
+    return token
+
+
+def require_admin_key(x_admin_key: Optional[str] = Header(None)) -> None:
+    """Admin routes are hidden unless ADMIN_API_KEY is set, and need it in ``X-Admin-Key``."""
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if x_admin_key is None or not secrets.compare_digest(x_admin_key, settings.ADMIN_API_KEY):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin key")
+
+
+@router.get("/auth/hashing/stats", dependencies=[Depends(require_admin_key)])
+def hashing_stats():
+    """Running, queued and rejected counts of the bcrypt pool, and the bcrypt cost."""
+    return {**hashing_pool.stats(), "bcrypt_rounds": pwd_context.handler("bcrypt").default_rounds}
+
+
+@router.post("/admin/users/bulk", dependencies=[Depends(require_admin_key)])
+def bulk_register(rows: List[Any] = Body(...), db=Depends(get_db)):
+    """
+    Register a list of users in one request. Invalid or conflicting rows are
+    reported by index in ``errors``; the others are created.
+    """
+    if len(rows) > settings.BULK_REGISTER_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_REGISTER_MAX_ROWS} users per request",
+        )
+    report = User.register_many(db, rows)
+    db.commit()
+    return report
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(token: str = Depends(oauth2_scheme)):
+    """Revoke the bearer token for the rest of its lifetime, in this worker process."""
+    if not User.revoke_token(token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get("/auth/tokens/stats", dependencies=[Depends(require_admin_key)])
+def token_stats():
+    """Size, revocations and hit counts of the verified-token cache."""
+    return token_cache.stats()
+
+
+@router.get("/auth/principals/stats", dependencies=[Depends(require_admin_key)])
+def principal_stats():
+    """Size, hit and invalidation counts of the principal cache."""
+    return principal_cache.stats()
+
+
+@router.get("/auth/login-throttle/stats", dependencies=[Depends(require_admin_key)])
+def login_throttle_stats():
+    """Tracked keys, failed logins and bcrypt verifications avoided by the login throttle."""
+    return login_throttle.stats()
+
+
+@router.get("/auth/last-login/stats", dependencies=[Depends(require_admin_key)])
+def last_login_stats():
+    """Pending, coalesced and written counts of the last_login write-behind buffer."""
+    return last_login_buffer.stats()
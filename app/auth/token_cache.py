@@ -0,0 +1,140 @@
+# app/auth/token_cache.py
+
+"""
+Cache of verified access tokens.
+
+Chatty clients send the same bearer token thousands of times, and each
+``User.verify_token`` call would otherwise repeat the HMAC check, the JSON
+parsing and the UUID construction. Verified tokens are remembered here,
+keyed by the SHA-256 digest of the token (the raw token is never stored),
+until their own ``exp`` claim, so a cached token never outlives its
+signature's validity.
+
+``revoke`` makes a token fail verification from then on, even though its
+signature is still valid; the revocation is kept until the token expires.
+Callers verify the token first (see ``User.revoke_token``), so only
+genuine, expiring tokens are ever recorded. Revocations are bounded by
+``TOKEN_REVOCATIONS_MAX``; past that, the revocation closest to expiry is
+dropped early.
+
+Revocations live in this cache, so they apply to the current worker
+process only: another uvicorn worker keeps accepting the token until its
+``exp``. Keep ``ACCESS_TOKEN_EXPIRE_MINUTES`` short accordingly.
+"""
+
+import hashlib
+import heapq
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+
+
+class TokenCache:
+    """Thread-safe, size-bounded LRU of token digest -> (user id, expiry)."""
+
+    def __init__(self, maxsize: int = 10_000, max_revoked: int = 100_000):
+        self.maxsize = maxsize
+        self.max_revoked = max_revoked
+        self.hits = 0
+        self.misses = 0
+        self.revocations_dropped = 0
+        self._entries: "OrderedDict[bytes, Tuple[uuid.UUID, float]]" = OrderedDict()
+        # digest -> expiry of revoked tokens, and the same pairs as a heap
+        # ordered by expiry so expired ones are purged in amortized O(log n).
+        self._revoked: Dict[bytes, float] = {}
+        self._revoked_heap: List[Tuple[float, bytes]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def lookup(self, token: str, now: Optional[float] = None) -> Tuple[bool, Optional[uuid.UUID]]:
+        """
+        Return ``(found, user_id)``. A revoked token is found with user id
+        None; on a miss the caller verifies the token and calls ``store``.
+        """
+        now = time.time() if now is None else now
+        digest = self._digest(token)
+        with self._lock:
+            revoked_until = self._revoked.get(digest)
+            if revoked_until is not None:
+                if revoked_until > now:
+                    self.hits += 1
+                    return True, None
+                del self._revoked[digest]
+            entry = self._entries.get(digest)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(digest)
+                    self.hits += 1
+                    return True, entry[0]
+                del self._entries[digest]
+            self.misses += 1
+            return False, None
+
+    def store(self, token: str, user_id: uuid.UUID, expires_at: float) -> None:
+        if self.maxsize <= 0:
+            return
+        digest = self._digest(token)
+        with self._lock:
+            if digest in self._revoked:
+                return
+            self._entries[digest] = (user_id, expires_at)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def revoke(self, token: str, expires_at: float, now: Optional[float] = None) -> None:
+        """
+        Reject ``token`` until ``expires_at``, its verified ``exp`` claim.
+        Revocations are not subject to LRU eviction (that would silently
+        un-revoke a token); expired ones are purged here instead.
+        """
+        now = time.time() if now is None else now
+        digest = self._digest(token)
+        with self._lock:
+            self._entries.pop(digest, None)
+            if digest in self._revoked:
+                return
+            heap = self._revoked_heap
+            while heap and (heap[0][0] <= now or len(self._revoked) >= self.max_revoked):
+                until, other = heapq.heappop(heap)
+                if self._revoked.get(other) == until:
+                    del self._revoked[other]
+                    if until > now:
+                        self.revocations_dropped += 1
+            if expires_at <= now or self.max_revoked <= 0:
+                return
+            self._revoked[digest] = expires_at
+            heapq.heappush(heap, (expires_at, digest))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._revoked.clear()
+            self._revoked_heap.clear()
+            self.hits = 0
+            self.misses = 0
+            self.revocations_dropped = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "revoked": len(self._revoked),
+                "revocations_dropped": self.revocations_dropped,
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+token_cache = TokenCache(maxsize=settings.TOKEN_CACHE_SIZE, max_revoked=settings.TOKEN_REVOCATIONS_MAX)
@@ -1,11 +1,31 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.exc import SQLAlchemyError
 from .config import settings
+from .pool_monitor import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+from .replicas import ReplicaSet, RoutingSession
 
-def get_engine(database_url: str = settings.DATABASE_URL):
+def pool_options(default_poolclass, **options):
+    """Pool settings from config; options given by the caller win, and a ``poolclass`` replaces them all."""
+    if "poolclass" in options:
+        return options
+    return {
+        "poolclass": default_poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        **options,
+    }
+
+def get_engine(database_url: str = settings.DATABASE_URL, **options):
     try:
-        engine = create_engine(database_url, echo=True)
+        engine = create_engine(
+            database_url, echo=settings.DB_ECHO, **pool_options(InstrumentedQueuePool, **options)
+        )
         return engine
     except SQLAlchemyError as e:
         print(f"Error creating engine: {e}")
@@ -27,4 +47,106 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Read replicas (see app.replicas). Read-only paths use get_read_db; every
+# other session, and so every write, stays on the primary.
+
+def replica_urls() -> list:
+    return [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+def get_read_sessionmaker(engine, replicas: ReplicaSet):
+    return sessionmaker(
+        class_=RoutingSession,
+        autocommit=False,
+        autoflush=False,
+        bind=engine,
+        replicas=replicas,
+        read_only=True,
+    )
+
+replicas = ReplicaSet([get_engine(url) for url in replica_urls()], settings.REPLICA_EJECT_SECONDS)
+ReadSessionLocal = get_read_sessionmaker(engine, replicas)
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Async path (asyncpg) alongside the sync one, built from the same URL.
+# Database-bound async routes use it so they scale with connections rather
+# than with the threadpool that runs sync dependencies.
+
+def async_database_url(database_url: str) -> str:
+    """The same database with the asyncpg driver, e.g. postgresql+asyncpg://..."""
+    return make_url(database_url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+def get_async_engine(database_url: str = settings.DATABASE_URL, **options):
+    try:
+        engine = create_async_engine(
+            async_database_url(database_url),
+            echo=settings.DB_ECHO,
+            **pool_options(InstrumentedAsyncQueuePool, **options),
+        )
+        return engine
+    except SQLAlchemyError as e:
+        print(f"Error creating async engine: {e}")
+        raise
+
+def get_async_sessionmaker(engine):
+    # expire_on_commit=False: reloading expired attributes would need IO
+    # that cannot happen implicitly in async code.
+    return async_sessionmaker(
+        bind=engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+async_engine = get_async_engine()
+AsyncSessionLocal = get_async_sessionmaker(async_engine)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_async_read_sessionmaker(engine, replicas: ReplicaSet):
+    return async_sessionmaker(
+        bind=engine,
+        autoflush=False,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        replicas=replicas,
+        read_only=True,
+    )
+
+async_replica_engines = [get_async_engine(url) for url in replica_urls()]
+async_replicas = ReplicaSet(
+    [replica.sync_engine for replica in async_replica_engines], settings.REPLICA_EJECT_SECONDS
+)
+AsyncReadSessionLocal = get_async_read_sessionmaker(async_engine, async_replicas)
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+async def dispose_async_engines():
+    for async_db_engine in (async_engine, *async_replica_engines):
+        await async_db_engine.dispose()
+
+
+def pool_stats():
+    """Checkout waits, saturation and invalidations of the engines' pools (see app.pool_monitor)."""
+    pools = [("sync", engine.pool), ("async", async_engine.sync_engine.pool)]
+    for index, replica in enumerate(replicas.engines):
+        pools.append((f"sync-replica-{index}", replica.pool))
+    for index, replica in enumerate(async_replicas.engines):
+        pools.append((f"async-replica-{index}", replica.pool))
+    return {name: pool.stats() if hasattr(pool, "stats") else {} for name, pool in pools}
+
+def replica_stats():
+    """Health and read counts of the replicas behind the read sessions."""
+    return {"sync": replicas.stats(), "async": async_replicas.stats()}
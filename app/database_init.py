@@ -1,8 +1,13 @@
 from app.database import engine
 from app.models.user import Base
+from app.models.calculation import Calculation  # noqa: F401 - registers the table
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist; add indexes introduced since.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 def drop_db():
     Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,26 @@
+# app/models/calculation.py
+from datetime import datetime
+import uuid
+
+from sqlalchemy import Column, String, DateTime, Float
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.models.user import Base
+
+
+class Calculation(Base):
+    """One computation performed through the calculator routes."""
+    __tablename__ = "calculations"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Deliberately not a foreign key: rows are inserted in write-behind
+    # batches, and one stale token must not make the whole batch fail.
+    user_id = Column(UUID(as_uuid=True), nullable=True, index=True)
+    op = Column(String(20), nullable=False)
+    a = Column(Float, nullable=False)
+    b = Column(Float, nullable=False)
+    result = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<Calculation(op={self.op}, a={self.a}, b={self.b}, result={self.result})>"
@@ -1,16 +1,24 @@
 # app/models/user.py
 from datetime import datetime, timedelta
 import uuid
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Set, Tuple
 
-from sqlalchemy import Column, String, DateTime, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, Boolean, Index, any_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm.attributes import set_committed_value
 from passlib.context import CryptContext
 from jose import JWTError, jwt
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
-from app.schemas.user import UserCreate, UserResponse, Token
+from app.auth import hashing
+from app.auth.last_login import last_login_buffer
+from app.auth.login_throttle import login_throttle
+from app.auth.token_cache import token_cache
+from app.config import settings
+from app.schemas.base import UserCreate
+from app.schemas.user import UserResponse, Token
 
 Base = declarative_base()
 
@@ -21,6 +29,28 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 
+_users_adapter = TypeAdapter(List[UserCreate])
+
+
+def _validate_rows(rows: List[Any], errors: Dict[int, str]) -> List[Tuple[int, UserCreate]]:
+    """Validate all rows in one pass; failures are recorded in ``errors`` by index."""
+    try:
+        return list(enumerate(_users_adapter.validate_python(rows)))
+    except ValidationError as e:
+        for error in e.errors(include_url=False):
+            index, *field = error["loc"]
+            message = error["msg"]
+            if field:
+                message = f"{'.'.join(str(part) for part in field)}: {message}"
+            errors.setdefault(index, message)
+    # Only the failing rows are known; validate the rest on their own.
+    valid = []
+    for index, row in enumerate(rows):
+        if index not in errors:
+            valid.append((index, UserCreate.model_validate(row)))
+    return valid
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -40,6 +70,12 @@ class User(Base):
     updated_at = Column(DateTime, default=datetime.utcnow,
                         onupdate=datetime.utcnow, nullable=False)
 
+    # Case-insensitive login lookups (see _find_for_login).
+    __table_args__ = (
+        Index("ix_users_lower_email", func.lower(email)),
+        Index("ix_users_lower_username", func.lower(username)),
+    )
+
     def __repr__(self):
         return f"<User(name={self.first_name} {self.last_name}, email={self.email})>"
 
@@ -55,6 +91,21 @@ class User(Base):
         """Verify password using stored password_hash"""
         return pwd_context.verify(plain_password, self.password_hash)
 
+    # Async counterparts: bcrypt runs on the bounded hashing pool instead of
+    # the event loop, and raises HashingSaturatedError when that is full.
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """Hash password using bcrypt, off the event loop"""
+        return await hashing.hash_password_async(pwd_context, password)
+
+    async def verify_password_async(self, plain_password: str) -> bool:
+        """Verify password using stored password_hash, off the event loop"""
+        return await hashing.verify_password_async(pwd_context, plain_password, self.password_hash)
+
+    async def set_password_async(self, raw_password: str) -> None:
+        """Async counterpart of the ``password`` setter"""
+        self.password_hash = await hashing.hash_password_async(pwd_context, raw_password[:72])
+
     @property
     def password(self):
         raise AttributeError("Password is write-only.")
@@ -77,57 +128,249 @@ class User(Base):
 
     @staticmethod
     def verify_token(token: str) -> Optional[uuid.UUID]:
+        found, user_id = token_cache.lookup(token)
+        if found:
+            return user_id
         try:
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
             user_id = payload.get("sub")
-            return uuid.UUID(user_id) if user_id else None
+            user_id = uuid.UUID(user_id) if user_id else None
         except (JWTError, ValueError):
             return None
+        if user_id is not None and isinstance(payload.get("exp"), (int, float)):
+            token_cache.store(token, user_id, payload["exp"])
+        return user_id
+
+    @staticmethod
+    def revoke_token(token: str) -> bool:
+        """
+        Make ``token`` fail verification in this worker until it expires.
+        Returns False, revoking nothing, unless it is a valid, unexpired token
+        with an ``exp`` claim.
+        """
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options={"require_exp": True})
+        except JWTError:
+            return False
+        if not isinstance(payload.get("exp"), (int, float)):
+            return False
+        token_cache.revoke(token, payload["exp"])
+        return True
 
     # ----------------------------
     # REGISTRATION
     # ----------------------------
     @classmethod
-    def register(cls, db, user_data: Dict[str, Any]) -> "User":
+    def _validate_registration(cls, user_data: Dict[str, Any]) -> Tuple["User", str]:
+        """Validate ``user_data``; returns the unsaved user and its raw password."""
         try:
             # Pydantic validation first
             user_create = UserCreate.model_validate(user_data)
+        except ValidationError as e:
+            raise ValueError(str(e))
+
+        new_user = cls(
+            first_name=user_create.first_name,
+            last_name=user_create.last_name,
+            email=user_create.email,
+            username=user_create.username,
+        )
+        return new_user, user_create.password
+
+    @classmethod
+    def register(cls, db, user_data: Dict[str, Any]) -> "User":
+        new_user, password = cls._validate_registration(user_data)
+        new_user.password = password  # Calls setter → hashes
 
-            new_user = cls(
-                first_name=user_create.first_name,
-                last_name=user_create.last_name,
-                email=user_create.email,
-                username=user_create.username,
-            )
-            new_user.password = user_create.password  # Calls setter → hashes
+        db.add(new_user)
+        db.flush()
+        return new_user
 
-            db.add(new_user)
+    @classmethod
+    async def register_async(cls, db, user_data: Dict[str, Any]) -> "User":
+        new_user, password = cls._validate_registration(user_data)
+        await new_user.set_password_async(password)
+
+        db.add(new_user)
+        if isinstance(db, AsyncSession):
+            await db.flush()
+        else:
             db.flush()
-            return new_user
+        return new_user
 
-        except ValidationError as e:
-            raise ValueError(str(e))
+    @classmethod
+    def register_many(cls, db, rows: List[Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Register many users at once, reporting per row instead of failing
+        the whole batch.
+
+        Rows are validated in one pass, checked for duplicates within the
+        batch and (case-insensitively) against existing users with a single
+        query, hashed on the process pool, then inserted in batches of
+        ``BULK_REGISTER_INSERT_BATCH`` with ``ON CONFLICT DO NOTHING`` so a
+        concurrent registration only fails its own row. Like ``register``,
+        this does not commit.
+
+        Returns ``{"created": [{"index", "id"}], "errors": [{"index", "error"}]}``.
+        """
+        errors: Dict[int, str] = {}
+        accepted = _validate_rows(rows, errors)
+
+        emails: Set[str] = set()
+        usernames: Set[str] = set()
+        unique: List[Tuple[int, UserCreate]] = []
+        for index, user_create in accepted:
+            email, username = user_create.email.lower(), user_create.username.lower()
+            if email in emails or username in usernames:
+                errors[index] = "Duplicate username or email in batch"
+                continue
+            emails.add(email)
+            usernames.add(username)
+            unique.append((index, user_create))
+
+        if unique:
+            # One array parameter per column rather than one bind per value.
+            taken = db.execute(
+                select(func.lower(cls.email), func.lower(cls.username)).where(
+                    (func.lower(cls.email) == any_(bindparam("emails", list(emails), type_=ARRAY(String))))
+                    | (func.lower(cls.username) == any_(bindparam("usernames", list(usernames), type_=ARRAY(String))))
+                )
+            ).all()
+            taken_emails = {email for email, _ in taken}
+            taken_usernames = {username for _, username in taken}
+            available = []
+            for index, user_create in unique:
+                if user_create.email.lower() in taken_emails or user_create.username.lower() in taken_usernames:
+                    errors[index] = "Username or email already exists"
+                else:
+                    available.append((index, user_create))
+            unique = available
+
+        hashes = hashing.hash_passwords(pwd_context, [user_create.password for _, user_create in unique])
+        now = datetime.utcnow()
+        records = [
+            {
+                "id": uuid.uuid4(),
+                "first_name": user_create.first_name,
+                "last_name": user_create.last_name,
+                "email": user_create.email,
+                "username": user_create.username,
+                "password_hash": password_hash,
+                "is_active": True,
+                "is_verified": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for (_, user_create), password_hash in zip(unique, hashes)
+        ]
+        inserted: Set[uuid.UUID] = set()
+        statement = pg_insert(cls).on_conflict_do_nothing().returning(cls.id)
+        batch = settings.BULK_REGISTER_INSERT_BATCH
+        for start in range(0, len(records), batch):
+            inserted.update(db.execute(statement, records[start:start + batch]).scalars())
+
+        created = []
+        for (index, _), record in zip(unique, records):
+            if record["id"] in inserted:
+                created.append({"index": index, "id": record["id"]})
+            else:
+                errors[index] = "Username or email already exists"
+        return {
+            "created": created,
+            "errors": [{"index": index, "error": errors[index]} for index in sorted(errors)],
+        }
 
     # ----------------------------
     # AUTHENTICATION
     # ----------------------------
     @classmethod
-    def authenticate(cls, db, username: str, password: str) -> Optional[Dict[str, Any]]:
-        user = db.query(cls).filter(
-            (cls.username == username) | (cls.email == username)
-        ).first()
+    def _login_statement(cls, identifier: str, by_email: bool):
+        """Case-insensitive match on one column, so exactly one functional index is used."""
+        column = cls.email if by_email else cls.username
+        # Should accounts differ only in case, the exact spelling wins, then
+        # the oldest account, so the choice never depends on the plan.
+        return select(cls).where(func.lower(column) == identifier.lower()).order_by(
+            (column == identifier).desc(), cls.created_at, cls.id
+        ).limit(1)
 
-        if not user or not user.verify_password(password):
-            return None
+    @classmethod
+    def _find_for_login(cls, db, username: str) -> Optional["User"]:
+        """
+        One lookup: by email if ``username`` contains "@", otherwise by
+        username. Usernames cannot contain "@", so there is no fallback.
+        """
+        return db.scalars(cls._login_statement(username, by_email="@" in username)).first()
+
+    @classmethod
+    async def _find_for_login_async(cls, db: AsyncSession, username: str) -> Optional["User"]:
+        return (await db.scalars(cls._login_statement(username, by_email="@" in username))).first()
 
-        user.last_login = datetime.utcnow()
-        db.commit()
+    def _record_login(self, db) -> bool:
+        """Record the login time; returns whether ``db`` still needs a commit."""
+        now = datetime.utcnow()
+        if last_login_buffer.record(self.id, now):
+            # Written in bulk later; reflect it on this instance without dirtying it.
+            set_committed_value(self, "last_login", now)
+            return db.is_modified(self)  # e.g. a rehashed password
+        self.last_login = now
+        return True
 
-        user_response = UserResponse.model_validate(user)
+    def _token_response(self) -> Dict[str, Any]:
+        user_response = UserResponse.model_validate(self)
         token_response = Token(
-            access_token=cls.create_access_token({"sub": str(user.id)}),
+            access_token=self.create_access_token({"sub": str(self.id)}),
             token_type="bearer",
             user=user_response
         )
 
         return token_response.model_dump()
+
+    def _login(self, db) -> Dict[str, Any]:
+        """Record the login and build the token response."""
+        if self._record_login(db):
+            db.commit()
+        return self._token_response()
+
+    def _link_login_identifiers(self) -> None:
+        """Let the login throttle count failures by username and by email as one account."""
+        login_throttle.link(self.id, self.username, self.email)
+
+    @classmethod
+    def authenticate(cls, db, username: str, password: str) -> Optional[Dict[str, Any]]:
+        user = cls._find_for_login(db, username)
+        if user is not None:
+            user._link_login_identifiers()
+
+        if not user or not user.verify_password(password):
+            return None
+        if pwd_context.needs_update(user.password_hash):
+            # Stored at an outdated cost; persisted by the login commit.
+            user.password = password
+
+        return user._login(db)
+
+    @classmethod
+    async def authenticate_async(cls, db, username: str, password: str) -> Optional[Dict[str, Any]]:
+        """
+        ``authenticate`` with bcrypt on the hashing pool. ``db`` may be a
+        sync ``Session`` or an ``AsyncSession``; with the latter the lookup
+        and the commit do not block the event loop either.
+        """
+        is_async = isinstance(db, AsyncSession)
+        if is_async:
+            user = await cls._find_for_login_async(db, username)
+        else:
+            user = cls._find_for_login(db, username)
+        if user is not None:
+            user._link_login_identifiers()
+
+        if not user or not await user.verify_password_async(password):
+            return None
+        if pwd_context.needs_update(user.password_hash):
+            await user.set_password_async(password)
+
+        if not is_async:
+            return user._login(db)
+        if user._record_login(db):
+            await db.commit()
+        return user._token_response()
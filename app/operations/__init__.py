@@ -13,6 +13,9 @@ Functions:
 - multiply(a: Union[int, float], b: Union[int, float]) -> Union[int, float]: Returns the product of a and b.
 - divide(a: Union[int, float], b: Union[int, float]) -> float: Returns the quotient when a is divided by b. Raises ValueError if b is zero.
 
+Array-backed variants (batch_add, batch_subtract, batch_multiply, batch_divide,
+divide_masked and compute_batch) live in app.operations.batch and are re-exported here.
+
 Usage:
 These functions can be imported and used in other modules or integrated into APIs
 to perform arithmetic operations based on user input.
@@ -111,4 +114,24 @@ def divide(a: Number, b: Number) -> float:
         raise ValueError("Cannot divide by zero!")
     
     result = a / b
-    return result
\ No newline at end of file
+    return result
+
+
+# Imported last: the batch variants are built on the scalar functions above.
+from .batch import (  # noqa: E402
+    batch_add,
+    batch_subtract,
+    batch_multiply,
+    batch_divide,
+    divide_masked,
+    compute_batch,
+)
+from .reductions import (  # noqa: E402
+    reduce_sum,
+    reduce_product,
+    reduce_mean,
+    reduce_min,
+    reduce_max,
+    reduce_dot,
+    compute_reduction,
+)
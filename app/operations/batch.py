@@ -0,0 +1,200 @@
+# app/operations/batch.py
+
+"""
+Module: batch.py
+
+Array-backed variants of the arithmetic functions in ``app.operations``.
+Each function takes two columns of operands (plain sequences, ``array.array``
+or NumPy arrays) and computes the whole column in one vectorized pass instead
+of one Python call per pair.
+
+Functions:
+- as_array(values) -> np.ndarray: Converts a column of operands to a float64 array.
+- batch_add(a, b) -> np.ndarray: Element-wise sum of a and b.
+- batch_subtract(a, b) -> np.ndarray: Element-wise difference of a and b.
+- batch_multiply(a, b) -> np.ndarray: Element-wise product of a and b.
+- batch_divide(a, b) -> np.ndarray: Element-wise quotient of a and b. Raises ValueError if any divisor is zero.
+- divide_masked(a, b, policy) -> MaskedResult: Exception-free division returning quotients plus a validity mask.
+- compute_batch(op, a, b) -> np.ndarray: Dispatches to one of the functions above by name.
+"""
+
+from array import array
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from . import Number, add, subtract, multiply
+
+
+ArrayLike = Union[Sequence[Number], array, np.ndarray]
+
+
+def as_array(values: Union[ArrayLike, Number]) -> np.ndarray:
+    """
+    Convert a column of operands to a float64 NumPy array.
+
+    ``array.array`` buffers and float64 NumPy arrays are wrapped without
+    copying; other inputs are converted once. Scalars become 0-d arrays so
+    they broadcast against a column.
+
+    Raises:
+    - ValueError: If the input is not numeric or is not one-dimensional.
+    """
+    if isinstance(values, array):
+        if values.typecode == "u":
+            raise ValueError("Operands must be numeric")
+        values = np.frombuffer(values, dtype=np.dtype(values.typecode))
+    try:
+        result = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError("Operands must be numeric")
+    if result.ndim > 1:
+        raise ValueError("Operands must be one-dimensional")
+    return result
+
+
+def _operands(a: ArrayLike, b: ArrayLike):
+    left, right = as_array(a), as_array(b)
+    if left.ndim and right.ndim and left.shape != right.shape:
+        raise ValueError(
+            f"Operand columns must have the same length ({left.shape[0]} != {right.shape[0]})"
+        )
+    return left, right
+
+
+def batch_add(a: ArrayLike, b: ArrayLike) -> np.ndarray:
+    """
+    Add two columns of numbers element-wise.
+
+    Example:
+    >>> batch_add([1, 2], [3, 4]).tolist()
+    [4.0, 6.0]
+    """
+    return add(*_operands(a, b))
+
+
+def batch_subtract(a: ArrayLike, b: ArrayLike) -> np.ndarray:
+    """
+    Subtract the second column from the first element-wise.
+
+    Example:
+    >>> batch_subtract([5, 2], [3, 4]).tolist()
+    [2.0, -2.0]
+    """
+    return subtract(*_operands(a, b))
+
+
+def batch_multiply(a: ArrayLike, b: ArrayLike) -> np.ndarray:
+    """
+    Multiply two columns of numbers element-wise.
+
+    Example:
+    >>> batch_multiply([2, 2.5], [3, 4]).tolist()
+    [6.0, 10.0]
+    """
+    return multiply(*_operands(a, b))
+
+
+def batch_divide(a: ArrayLike, b: ArrayLike) -> np.ndarray:
+    """
+    Divide the first column by the second element-wise.
+
+    Raises:
+    - ValueError: If any divisor is zero, naming the first offending row.
+
+    Example:
+    >>> batch_divide([6, 5.5], [3, 2]).tolist()
+    [2.0, 2.75]
+    """
+    left, right = _operands(a, b)
+    zeros = np.flatnonzero(right == 0)
+    if zeros.size:
+        raise ValueError(f"Cannot divide by zero! (row {int(zeros[0])})")
+    return np.divide(left, right)
+
+
+class MaskedResult(NamedTuple):
+    """Quotients of a masked division and which rows had a valid divisor."""
+    values: np.ndarray
+    valid: np.ndarray
+
+    @property
+    def error_indices(self) -> np.ndarray:
+        """Row indices whose divisor was zero."""
+        return np.flatnonzero(~self.valid)
+
+
+DIVISION_POLICIES = ("nan", "inf", "null", "raise")
+
+
+def divide_masked(a: ArrayLike, b: ArrayLike, policy: str = "nan") -> MaskedResult:
+    """
+    Divide two columns in one vectorized pass without raising per zero divisor.
+
+    Parameters:
+    - policy: What to put in rows whose divisor is zero:
+      - "nan": NaN.
+      - "inf": the IEEE 754 result (+/-inf, or NaN for 0/0).
+      - "null": NaN in ``values``; callers serialize masked rows as null.
+      - "raise": fail fast with the same ValueError as batch_divide.
+
+    Returns:
+    - MaskedResult: ``values`` holds the quotients and ``valid`` is False for
+      rows whose divisor was zero.
+
+    Example:
+    >>> result = divide_masked([1, 2, 3], [1, 0, 3])
+    >>> result.error_indices.tolist()
+    [1]
+    """
+    if policy not in DIVISION_POLICIES:
+        raise ValueError(f"Unknown division policy: {policy}")
+    if policy == "raise":
+        values = batch_divide(a, b)
+        return MaskedResult(values, np.ones(values.shape, dtype=bool))
+
+    left, right = _operands(a, b)
+    valid = right != 0
+    if policy == "inf":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = np.divide(left, right)
+    else:
+        shape = np.broadcast_shapes(left.shape, right.shape)
+        values = np.divide(left, right, out=np.full(shape, np.nan), where=valid)
+    return MaskedResult(values, np.broadcast_to(valid, values.shape))
+
+
+def to_json_column(values: np.ndarray) -> Union[List[Optional[float]], Optional[float]]:
+    """
+    Convert a result column to JSON-safe Python values.
+
+    JSON has no NaN or infinity, so non-finite entries become None (null).
+    """
+    finite = np.isfinite(values)
+    if finite.all():
+        return values.tolist()
+    column = values.astype(object)
+    column[~finite] = None
+    return column.tolist()
+
+
+BATCH_OPERATIONS: Dict[str, Callable[[ArrayLike, ArrayLike], np.ndarray]] = {
+    "add": batch_add,
+    "subtract": batch_subtract,
+    "multiply": batch_multiply,
+    "divide": batch_divide,
+}
+
+
+def compute_batch(op: str, a: ArrayLike, b: ArrayLike) -> np.ndarray:
+    """
+    Run the batch operation named ``op`` over two operand columns.
+
+    Raises:
+    - ValueError: If ``op`` is unknown or the operands are invalid.
+    """
+    try:
+        func = BATCH_OPERATIONS[op]
+    except KeyError:
+        raise ValueError(f"Unknown operation: {op}")
+    return func(a, b)
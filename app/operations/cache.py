@@ -0,0 +1,235 @@
+# app/operations/cache.py
+
+"""
+Module: cache.py
+
+Memoizes the arithmetic functions in ``app.operations`` so repeated operand
+pairs (dashboards recomputing the same values every few seconds) are served
+from a bounded cache with LRU and TTL eviction.
+
+Two backends are available, selected by ``Settings.RESULT_CACHE_BACKEND``:
+- "memory": an in-process ``OrderedDict`` (the default).
+- "shared": a set-associative table in named shared memory that all uvicorn
+  workers on the host attach to, so one worker's result serves the others.
+"none" disables memoization.
+
+Hit, miss, eviction and expiration counters are kept per operation and per
+process.
+"""
+
+import functools
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from app.config import settings
+from app.shared_memory import StripedLock, attach_shared_memory
+from . import Number, add, subtract, multiply, divide
+
+
+OPERATIONS: Dict[str, Callable[[Number, Number], Number]] = {
+    "add": add,
+    "subtract": subtract,
+    "multiply": multiply,
+    "divide": divide,
+}
+
+Key = Tuple[str, float, float]
+
+
+class MemoryBackend:
+    """In-process LRU cache with a per-entry expiry time."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Key, Tuple[Number, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, key: Key, now: float) -> Tuple[Optional[Number], bool]:
+        """Return ``(value, expired)``; value is None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            value, expires = entry
+            if expires <= now:
+                del self._entries[key]
+                return None, True
+            self._entries.move_to_end(key)
+            return value, False
+
+    def store(self, key: Key, value: Number, now: float) -> bool:
+        """Insert a value; returns True if a live entry had to be evicted."""
+        with self._lock:
+            self._entries[key] = (value, now + self.ttl)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                return True
+            return False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SharedMemoryBackend:
+    """
+    Set-associative cache in a named shared memory segment.
+
+    Keys hash to a set of ``ways`` slots; within a set the least recently
+    used slot is replaced. Slots store the operation code and both operands,
+    so hash collisions can never return a wrong result. Sets are guarded by
+    striped cross-process locks.
+    """
+
+    # op code (0 = empty), padding, a, b, result, expires, last_used
+    SLOT = struct.Struct("<B7xddddd")
+    _LAST_USED_OFFSET = SLOT.size - 8
+
+    def __init__(self, name: str, maxsize: int, ttl: float, ways: int = 8, stripes: int = 64):
+        self.ttl = ttl
+        self.ways = ways
+        self.sets = max(1, maxsize // ways)
+        self._codes = {op: code for code, op in enumerate(OPERATIONS, start=1)}
+        self._segment = attach_shared_memory(name, self.sets * ways * self.SLOT.size)
+        self._buf = self._segment.buf
+        self._locks = StripedLock(name, stripes)
+
+    def _set_offset(self, code: int, a: float, b: float) -> Tuple[int, int]:
+        index = hash((code, a, b)) % self.sets
+        return index, index * self.ways * self.SLOT.size
+
+    def lookup(self, key: Key, now: float) -> Tuple[Optional[Number], bool]:
+        op, a, b = key
+        code = self._codes[op]
+        index, base = self._set_offset(code, a, b)
+        unpack, size = self.SLOT.unpack_from, self.SLOT.size
+        with self._locks.hold(index):
+            for offset in range(base, base + self.ways * size, size):
+                slot_code, slot_a, slot_b, result, expires, _ = unpack(self._buf, offset)
+                if slot_code == code and slot_a == a and slot_b == b:
+                    if expires <= now:
+                        self._buf[offset] = 0
+                        return None, True
+                    struct.pack_into("<d", self._buf, offset + self._LAST_USED_OFFSET, now)
+                    return result, False
+        return None, False
+
+    def store(self, key: Key, value: Number, now: float) -> bool:
+        op, a, b = key
+        code = self._codes[op]
+        index, base = self._set_offset(code, a, b)
+        unpack, size = self.SLOT.unpack_from, self.SLOT.size
+        with self._locks.hold(index):
+            free, lru, lru_used = None, base, None
+            for offset in range(base, base + self.ways * size, size):
+                slot_code, slot_a, slot_b, _, expires, last_used = unpack(self._buf, offset)
+                if slot_code == code and slot_a == a and slot_b == b:
+                    free = offset
+                    break
+                if free is None and (slot_code == 0 or expires <= now):
+                    free = offset
+                elif lru_used is None or last_used < lru_used:
+                    lru, lru_used = offset, last_used
+            victim = lru if free is None else free
+            self.SLOT.pack_into(self._buf, victim, code, a, b, value, now + self.ttl, now)
+            return free is None
+
+    def clear(self) -> None:
+        for index in range(self.sets):
+            base = index * self.ways * self.SLOT.size
+            with self._locks.hold(index):
+                for offset in range(base, base + self.ways * self.SLOT.size, self.SLOT.size):
+                    self._buf[offset] = 0
+
+    def close(self) -> None:
+        self._buf = None
+        self._segment.close()
+        self._locks.close()
+
+
+class ResultCache:
+    """Wraps two-operand functions so their results are served from a backend."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _counters(self, op: str) -> Dict[str, int]:
+        counters = self._stats.get(op)
+        if counters is None:
+            counters = self._stats.setdefault(
+                op, {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+            )
+        return counters
+
+    def wrap(self, op: str, func: Callable[[Number, Number], Number]) -> Callable[[Number, Number], Number]:
+        """
+        Return a memoized version of ``func``. Exceptions (such as division
+        by zero) are not cached.
+        """
+        counters = self._counters(op)
+        backend = self.backend
+
+        @functools.wraps(func)
+        def cached(a: Number, b: Number) -> Number:
+            key = (op, a, b)
+            now = time.time()
+            value, expired = backend.lookup(key, now)
+            if value is not None:
+                with self._lock:
+                    counters["hits"] += 1
+                return value
+            result = func(a, b)
+            evicted = backend.store(key, result, now)
+            with self._lock:
+                counters["misses"] += 1
+                counters["expirations"] += expired
+                counters["evictions"] += evicted
+            return result
+
+        return cached
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-operation counters plus the hit ratio."""
+        with self._lock:
+            report = {}
+            for op, counters in self._stats.items():
+                lookups = counters["hits"] + counters["misses"]
+                report[op] = dict(counters, hit_ratio=counters["hits"] / lookups if lookups else 0.0)
+            return report
+
+    def clear(self) -> None:
+        self.backend.clear()
+        with self._lock:
+            for counters in self._stats.values():
+                for name in counters:
+                    counters[name] = 0
+
+
+def create_backend(kind: str = settings.RESULT_CACHE_BACKEND):
+    """Build the backend named by ``kind``; returns None for "none"."""
+    if kind == "memory":
+        return MemoryBackend(settings.RESULT_CACHE_SIZE, settings.RESULT_CACHE_TTL)
+    if kind == "shared":
+        return SharedMemoryBackend(
+            settings.RESULT_CACHE_SHM_NAME, settings.RESULT_CACHE_SIZE, settings.RESULT_CACHE_TTL
+        )
+    if kind == "none":
+        return None
+    raise ValueError(f"Unknown result cache backend: {kind}")
+
+
+_backend = create_backend()
+result_cache: Optional[ResultCache] = ResultCache(_backend) if _backend is not None else None
+
+
+def memoized(op: str) -> Callable[[Number, Number], Number]:
+    """Return the (possibly memoized) ``app.operations`` function for ``op``."""
+    func = OPERATIONS[op]
+    return result_cache.wrap(op, func) if result_cache is not None else func
@@ -0,0 +1,239 @@
+# app/operations/calculator.py
+
+import math
+import uuid
+from typing import Dict, List, Literal, Optional, Union
+
+from fastapi import APIRouter, Depends, Request, WebSocket
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, ValidationError
+
+from app.auth.dependencies import get_optional_user_id
+from app.auth.routes import require_admin_key
+from app.config import settings
+from app.operations.batch import ArrayLike, MaskedResult, as_array, to_json_column
+from app.operations.cache import memoized, result_cache
+from app.operations.channel import serve_calculations
+from app.operations.executor import compute_inline, run_batch, should_offload
+from app.operations.expression import evaluate as evaluate_expression, expression_cache
+from app.operations.history import history_writer
+from app.operations.reductions import compute_reduction
+from app.operations.streaming import DuplexStreamingResponse, stream_calculations
+from app.operations import wire
+from app.rate_limit import calculator_rate_limit
+
+router = APIRouter(dependencies=[Depends(calculator_rate_limit)])
+
+add_numbers = memoized("add")
+subtract_numbers = memoized("subtract")
+multiply_numbers = memoized("multiply")
+divide_numbers = memoized("divide")
+
+
+class Numbers(BaseModel):
+    a: float
+    b: float
+
+
+class BatchRequest(BaseModel):
+    """Columns of operands for one vectorized operation."""
+    op: Literal["add", "subtract", "multiply", "divide"]
+    a: List[float]
+    b: List[float]
+    # Zero-divisor handling for "divide"; by default the whole batch is rejected.
+    on_zero: Optional[Literal["nan", "inf", "null", "raise"]] = None
+
+
+class ReduceRequest(BaseModel):
+    """A column folded to a single value; ``b`` is the second vector of "dot"."""
+    op: Literal["sum", "product", "mean", "min", "max", "dot"]
+    values: List[float]
+    b: Optional[List[float]] = None
+    method: Literal["pairwise", "kahan"] = "pairwise"
+
+
+class EvaluateRequest(BaseModel):
+    """An arithmetic expression and the values bound to its variables."""
+    expression: str
+    variables: Dict[str, Union[float, List[float]]] = {}
+
+
+def record(op: str, nums: Numbers, result: Optional[float], user_id: Optional[uuid.UUID]) -> None:
+    """Queue the computation for the history table; never waits on the database."""
+    if settings.HISTORY_ENABLED:
+        history_writer.record(op, nums.a, nums.b, result, user_id)
+
+
+def _json_number(result: float) -> Optional[float]:
+    """JSON has no NaN or infinity: an overflowed (or NaN) result becomes None (null)."""
+    return result if math.isfinite(result) else None
+
+
+@router.post("/add")
+def add(nums: Numbers, user_id: Optional[uuid.UUID] = Depends(get_optional_user_id)):
+    result = _json_number(add_numbers(nums.a, nums.b))
+    record("add", nums, result, user_id)
+    return {"result": result}
+
+
+@router.post("/subtract")
+def subtract(nums: Numbers, user_id: Optional[uuid.UUID] = Depends(get_optional_user_id)):
+    result = _json_number(subtract_numbers(nums.a, nums.b))
+    record("subtract", nums, result, user_id)
+    return {"result": result}
+
+
+@router.post("/multiply")
+def multiply(nums: Numbers, user_id: Optional[uuid.UUID] = Depends(get_optional_user_id)):
+    result = _json_number(multiply_numbers(nums.a, nums.b))
+    record("multiply", nums, result, user_id)
+    return {"result": result}
+
+
+@router.post("/divide")
+def divide(nums: Numbers, user_id: Optional[uuid.UUID] = Depends(get_optional_user_id)):
+    try:
+        result = _json_number(divide_numbers(nums.a, nums.b))
+    except ValueError as e:
+        record("divide", nums, None, user_id)
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    record("divide", nums, result, user_id)
+    return {"result": result}
+
+
+def _parse_batch(body: bytes, content_type: str):
+    """``(op, on_zero, a, b)`` of a /batch body, with the columns as float64 arrays."""
+    if content_type.startswith(wire.CONTENT_TYPE):
+        op, on_zero, a, b = wire.decode_request(body)
+    else:
+        try:
+            req = BatchRequest.model_validate_json(body)
+        except ValidationError as e:
+            raise RequestValidationError(e.errors(include_url=False))
+        op, on_zero, a, b = req.op, req.on_zero, req.a, req.b
+    return op, on_zero, as_array(a), as_array(b)
+
+
+def _batch_response(op: str, on_zero: Optional[str], result: MaskedResult, binary: bool):
+    if binary:
+        return Response(wire.encode_response(op, on_zero, result), media_type=wire.CONTENT_TYPE)
+    content = {"op": op, "count": int(result.values.size), "result": to_json_column(result.values)}
+    if op == "divide" and on_zero not in (None, "raise"):
+        content["errors"] = result.error_indices.tolist()
+    return content
+
+
+def _inline_batch(op: str, on_zero: Optional[str], a: ArrayLike, b: ArrayLike, binary: bool):
+    return _batch_response(op, on_zero, compute_inline(op, a, b, on_zero), binary)
+
+
+@router.post(
+    "/batch",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": BatchRequest.model_json_schema()},
+                wire.CONTENT_TYPE: {"schema": {"type": "string", "format": "binary"}},
+            },
+        }
+    },
+)
+async def batch(request: Request):
+    """
+    Apply one operation to every (a[i], b[i]) pair and return a result column.
+
+    The body is either a JSON ``BatchRequest`` or, with content type
+    ``application/x-calc-columns``, packed float64 columns (see
+    app.operations.wire). The response is JSON unless the client accepts
+    the binary format.
+
+    With ``on_zero`` set, division is masked: rows with a zero divisor are
+    returned as null and listed in ``errors`` instead of failing the batch.
+    Large batches run on the process pool (see app.operations.executor).
+    Parsing, inline computation and serialization run on the threadpool,
+    so a large body never blocks the event loop.
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+    binary = wire.CONTENT_TYPE in request.headers.get("accept", "")
+    try:
+        op, on_zero, a, b = await run_in_threadpool(_parse_batch, body, content_type)
+        if not should_offload(a, b):
+            return await run_in_threadpool(_inline_batch, op, on_zero, a, b, binary)
+        async with run_batch(op, a, b, on_zero) as result:
+            return await run_in_threadpool(_batch_response, op, on_zero, result, binary)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+
+@router.post("/reduce")
+def reduce(req: ReduceRequest):
+    """
+    Fold a column with sum, product, mean, min, max or dot in one call.
+
+    Sums use compensated chunked summation and are reproducible regardless
+    of core count (see app.operations.reductions).
+    """
+    try:
+        result = compute_reduction(req.op, req.values, req.b, req.method)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    return {"op": req.op, "count": len(req.values), "result": _json_number(result)}
+
+
+@router.post("/evaluate")
+def evaluate(req: EvaluateRequest):
+    """
+    Evaluate an expression such as ``(a + b) * c / d`` in a single call.
+    Results that overflow to infinity (or are NaN) are returned as null.
+    """
+    try:
+        result = evaluate_expression(req.expression, req.variables)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    if hasattr(result, "tolist"):
+        return {"result": to_json_column(result)}
+    return {"result": _json_number(result)}
+
+
+@router.get("/evaluate/stats", dependencies=[Depends(require_admin_key)])
+def evaluate_stats():
+    """Hit and miss counters of the compiled-expression cache."""
+    return expression_cache.stats()
+
+
+@router.post("/stream")
+async def stream(request: Request):
+    """
+    Evaluate an NDJSON body of ``{"op", "a", "b"}`` records, streaming one
+    result line per record back while the upload is still arriving.
+    """
+    return DuplexStreamingResponse(
+        stream_calculations(request.stream()),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.websocket("/ws/calc")
+async def calc_channel(websocket: WebSocket):
+    """
+    Pipelined calculator over one connection: ``{"id", "op", "a", "b"}``
+    frames, or arrays of them, answered in order with the ``id`` echoed
+    (see app.operations.channel).
+    """
+    await serve_calculations(websocket)
+
+
+@router.get("/cache/stats", dependencies=[Depends(require_admin_key)])
+def cache_stats():
+    """Per-operation hit ratio, eviction and expiration counts of the result cache."""
+    return result_cache.stats() if result_cache is not None else {}
+
+
+@router.get("/history/stats", dependencies=[Depends(require_admin_key)])
+def history_stats():
+    """Queue depth and written, dropped and failed row counts of the history writer."""
+    return history_writer.stats()
@@ -0,0 +1,105 @@
+# app/operations/channel.py
+
+"""
+Module: channel.py
+
+The calculator protocol spoken over one persistent WebSocket connection.
+
+Each client frame is either one request or a batch (a JSON array) of them:
+
+    {"id": 7, "op": "add", "a": 1, "b": 2}
+    [{"id": 8, "op": "divide", "a": 1, "b": 0}, {"id": 9, "op": "multiply", "a": 2, "b": 3}]
+
+and is answered by exactly one frame of the same shape, in order:
+
+    {"id": 7, "result": 3}
+    [{"id": 8, "error": "Cannot divide by zero!"}, {"id": 9, "result": 6}]
+
+``id`` is an opaque correlation id echoed back unchanged, so clients may
+pipeline frames without waiting for answers. Records are evaluated with
+``evaluate_record`` from app.operations.streaming; a non-finite result is
+answered as null, since JSON has no NaN or infinity.
+
+Backpressure: received frames wait in a queue of ``max_pending`` frames.
+When the client stops reading answers, sending blocks, the queue fills and
+the server stops reading the socket, which pushes back on the client
+through TCP flow control instead of buffering without bound.
+
+Functions:
+- answer_frame(raw, max_batch) -> str: Answers one client frame.
+- serve_calculations(websocket, max_pending, max_batch) -> None: Runs one connection.
+"""
+
+import asyncio
+import json
+import math
+from typing import Any, Dict, Optional, Union
+
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+from app.config import settings
+from .streaming import evaluate_record
+
+
+def _answer(record: Any) -> Dict[str, Any]:
+    request_id = record.get("id") if isinstance(record, dict) else None
+    try:
+        result = evaluate_record(record)
+        if not math.isfinite(result):
+            result = None
+    except (ValueError, ArithmeticError) as e:
+        # ArithmeticError: e.g. an integer result too large for a float.
+        return {"id": request_id, "error": str(e)}
+    return {"id": request_id, "result": result}
+
+
+def answer_frame(raw: Union[str, bytes], max_batch: int = settings.WS_MAX_BATCH) -> str:
+    """
+    Answer one frame. Problems with the frame as a whole (invalid JSON, an
+    oversized batch) are reported as a single ``{"id": null, "error"}`` frame.
+    """
+    try:
+        payload = json.loads(raw)
+    except ValueError:
+        return json.dumps({"id": None, "error": "Invalid JSON"})
+    if isinstance(payload, list):
+        if len(payload) > max_batch:
+            return json.dumps({"id": None, "error": f"Batch exceeds {max_batch} operations"})
+        return json.dumps([_answer(record) for record in payload])
+    return json.dumps(_answer(payload))
+
+
+async def serve_calculations(
+    websocket: WebSocket,
+    max_pending: int = settings.WS_MAX_PENDING_FRAMES,
+    max_batch: int = settings.WS_MAX_BATCH,
+) -> None:
+    """Accept the connection and answer frames until the client disconnects."""
+    await websocket.accept()
+    pending: "asyncio.Queue[Optional[Union[str, bytes]]]" = asyncio.Queue(max_pending)
+
+    async def read() -> None:
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                frame = message.get("text")
+                await pending.put(frame if frame is not None else message.get("bytes", b""))
+        except WebSocketDisconnect:
+            pass
+        # Not in a finally: when cancelled, the queue may be full and no longer drained.
+        await pending.put(None)
+
+    reader = asyncio.create_task(read())
+    try:
+        while (frame := await pending.get()) is not None:
+            await websocket.send_text(answer_frame(frame, max_batch))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        reader.cancel()
+        try:
+            await reader
+        except (asyncio.CancelledError, WebSocketDisconnect):
+            pass
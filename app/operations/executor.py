@@ -0,0 +1,226 @@
+# app/operations/executor.py
+
+"""
+Module: executor.py
+
+Runs large batch computations on a process pool so they scale across cores
+and do not hold the GIL of the worker serving small requests.
+
+Batches with at least ``Settings.CALC_OFFLOAD_THRESHOLD`` rows are copied
+once into a ``multiprocessing.shared_memory`` block laid out as three float64
+columns (a, b, result). The block is split into one slice per pool process;
+each process attaches by name and writes its slice of the result column in
+place, so neither operands nor results are pickled. The caller reads the
+result column directly from shared memory.
+
+Smaller batches are computed inline, where the pool round trip would cost
+more than the arithmetic.
+
+Functions:
+- run_batch(op, a, b, on_zero) -> AsyncContextManager[MaskedResult]: Computes a batch inline or on the pool.
+- should_offload(a, b, threshold) -> bool: Whether run_batch would use the pool.
+- compute_inline(op, a, b, on_zero) -> MaskedResult: The in-process path of run_batch.
+- get_pool() -> ProcessPoolExecutor: Returns the lazily created pool.
+- get_thread_pool() -> ThreadPoolExecutor: Returns the lazily created thread pool
+  used for chunked reductions, where NumPy releases the GIL.
+- shutdown_pool() -> None: Stops both pools; called on application shutdown.
+"""
+
+import asyncio
+import ctypes
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from multiprocessing import shared_memory
+from typing import AsyncIterator, List, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.shared_memory import open_shared_memory
+from .batch import (
+    DIVISION_POLICIES,
+    ArrayLike,
+    MaskedResult,
+    _operands,
+    compute_batch,
+    divide_masked,
+)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# Unlinked blocks whose result views were still referenced when released.
+_deferred_close: List[shared_memory.SharedMemory] = []
+_deferred_lock = threading.Lock()
+
+
+def pool_size() -> int:
+    """Configured pool size; 0 means one process per CPU."""
+    return settings.CALC_POOL_SIZE or os.cpu_count() or 1
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that already runs threads is unsafe.
+            _pool = ProcessPoolExecutor(
+                max_workers=pool_size(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    with _pool_lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(max_workers=pool_size(), thread_name_prefix="calc-reduce")
+        return _thread_pool
+
+
+def shutdown_pool() -> None:
+    global _pool, _thread_pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+        if _thread_pool is not None:
+            _thread_pool.shutdown(wait=True, cancel_futures=True)
+            _thread_pool = None
+    _close_deferred()
+
+
+class SharedBatch:
+    """Operand and result columns of one batch in a shared memory block."""
+
+    def __init__(self, rows: int):
+        self.rows = rows
+        self._segment = shared_memory.SharedMemory(create=True, size=3 * rows * 8)
+        # NumPy does not hold a buffer export on the mapping, so a plain view
+        # would not stop close() from unmapping memory it still points to.
+        # A ctypes array does hold one, which makes close() fail safely with
+        # BufferError for as long as any column view is alive.
+        raw = (ctypes.c_char * (3 * rows * 8)).from_buffer(self._segment.buf)
+        columns = np.ndarray((3, rows), dtype=np.float64, buffer=raw)
+        self.a, self.b, self.out = columns
+
+    @property
+    def name(self) -> str:
+        return self._segment.name
+
+    def close(self) -> None:
+        """Unlink the block. Views of the columns must not be used afterwards."""
+        self.a = self.b = self.out = None
+        self._segment.unlink()
+        with _deferred_lock:
+            # Callers usually still hold a result view at this point; the
+            # mapping is closed on a later call once those views are gone.
+            _deferred_close.append(self._segment)
+        _close_deferred()
+
+
+def _close_deferred() -> None:
+    with _deferred_lock:
+        for segment in list(_deferred_close):
+            try:
+                segment.close()
+            except BufferError:
+                continue
+            _deferred_close.remove(segment)
+
+
+def _compute_slice(name: str, rows: int, op: str, on_zero: Optional[str], start: int, stop: int) -> None:
+    """Pool task: compute result rows ``start:stop`` of a SharedBatch in place."""
+    segment = open_shared_memory(name)
+    try:
+        columns = np.ndarray((3, rows), dtype=np.float64, buffer=segment.buf)
+        left, right, out = columns[0, start:stop], columns[1, start:stop], columns[2, start:stop]
+        if op == "add":
+            np.add(left, right, out=out)
+        elif op == "subtract":
+            np.subtract(left, right, out=out)
+        elif op == "multiply":
+            np.multiply(left, right, out=out)
+        elif on_zero == "inf":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                np.divide(left, right, out=out)
+        else:
+            # Zero divisors were rejected up front unless a masking policy is set.
+            out.fill(np.nan)
+            np.divide(left, right, out=out, where=right != 0)
+        del columns, left, right, out
+    finally:
+        segment.close()
+
+
+def should_offload(a: ArrayLike, b: ArrayLike, threshold: Optional[int] = None) -> bool:
+    """Whether ``run_batch`` would compute these columns on the process pool."""
+    threshold = settings.CALC_OFFLOAD_THRESHOLD if threshold is None else threshold
+    left, right = _operands(a, b)
+    shape = np.broadcast_shapes(left.shape, right.shape)
+    rows = shape[0] if shape else 0
+    return rows > 0 and rows >= threshold
+
+
+def compute_inline(op: str, a: ArrayLike, b: ArrayLike, on_zero: Optional[str] = None) -> MaskedResult:
+    """Compute a batch in this process; blocking, so async callers run it on a thread."""
+    if op == "divide" and on_zero not in (None, "raise"):
+        return divide_masked(a, b, on_zero)
+    values = compute_batch(op, a, b)
+    return MaskedResult(values, np.broadcast_to(True, values.shape))
+
+
+@asynccontextmanager
+async def run_batch(
+    op: str,
+    a: ArrayLike,
+    b: ArrayLike,
+    on_zero: Optional[str] = None,
+    threshold: Optional[int] = None,
+) -> AsyncIterator[MaskedResult]:
+    """
+    Compute a batch and yield its result for the duration of the block.
+
+    Offloaded results are views of shared memory that is released when the
+    block exits, so serialize (or copy) them inside it.
+
+    Raises:
+    - ValueError: For unknown operations, mismatched columns or, without a
+      masking policy, a zero divisor.
+    """
+    left, right = _operands(a, b)
+    if not should_offload(left, right, threshold):
+        yield compute_inline(op, left, right, on_zero)
+        return
+    rows = np.broadcast_shapes(left.shape, right.shape)[0]
+    if op not in ("add", "subtract", "multiply", "divide"):
+        raise ValueError(f"Unknown operation: {op}")
+    if on_zero is not None and on_zero not in DIVISION_POLICIES:
+        raise ValueError(f"Unknown division policy: {on_zero}")
+
+    block = SharedBatch(rows)
+    try:
+        block.a[:] = left
+        block.b[:] = right
+        valid = block.b != 0
+        masked = op == "divide" and on_zero not in (None, "raise")
+        if op == "divide" and not masked and not valid.all():
+            raise ValueError(f"Cannot divide by zero! (row {int(np.argmin(valid))})")
+
+        pool = get_pool()
+        step = -(-rows // pool_size())
+        await asyncio.gather(*(
+            asyncio.wrap_future(
+                pool.submit(_compute_slice, block.name, rows, op, on_zero, start, min(start + step, rows))
+            )
+            for start in range(0, rows, step)
+        ))
+        yield MaskedResult(block.out, valid if masked else np.broadcast_to(True, (rows,)))
+    finally:
+        block.close()
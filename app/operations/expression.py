@@ -0,0 +1,290 @@
+# app/operations/expression.py
+
+"""
+Module: expression.py
+
+Compiles arithmetic expressions such as ``(a + b) * c / d`` into a flat
+instruction program and evaluates it with the functions in
+``app.operations``. Compiled programs are kept in a bounded LRU cache keyed
+by the expression text, so a formula is parsed once and then only evaluated.
+
+The grammar is deliberately small: numeric literals, variable names,
+parentheses, unary ``+``/``-`` and the binary operators ``+ - * /``. Nothing
+is ever passed to ``eval``.
+
+Functions:
+- compile_expression(text) -> Program: Returns the cached program for text, compiling it on a miss.
+- evaluate(text, variables) -> number or np.ndarray: Compiles (or fetches) and runs an expression.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Mapping, Tuple, Union
+
+import numpy as np
+
+from app.config import settings
+from . import Number, add, subtract, multiply, divide
+from .batch import ArrayLike, as_array, batch_divide
+
+
+MAX_EXPRESSION_LENGTH = 1024
+
+_TOKEN_RE = re.compile(
+    r"\s*(?:(?P<number>\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)"
+    r"|(?P<name>[A-Za-z_][A-Za-z0-9_]*)"
+    r"|(?P<op>[-+*/()]))"
+)
+
+# Binary operators: precedence and the app.operations function they map to.
+_BINARY = {
+    "+": (1, "add"),
+    "-": (1, "sub"),
+    "*": (2, "mul"),
+    "/": (2, "div"),
+}
+_UNARY_PRECEDENCE = 3
+
+Instruction = Tuple[str, Union[float, str, None]]
+Value = Union[Number, np.ndarray]
+
+
+class ExpressionError(ValueError):
+    """Raised when an expression cannot be compiled or evaluated."""
+
+
+class Program:
+    """A validated, flat postfix instruction sequence for one expression."""
+
+    __slots__ = ("source", "instructions", "variables")
+
+    def __init__(self, source: str, instructions: Tuple[Instruction, ...]):
+        self.source = source
+        self.instructions = instructions
+        self.variables: FrozenSet[str] = frozenset(
+            arg for code, arg in instructions if code == "load"
+        )
+
+    def __repr__(self):
+        return f"<Program({self.source!r}, {len(self.instructions)} instructions)>"
+
+    def evaluate(self, variables: Mapping[str, Union[Number, ArrayLike]] = None) -> Value:
+        """
+        Run the program against scalar or array-valued variable bindings.
+
+        Array bindings are evaluated element-wise in one vectorized pass per
+        instruction; scalars broadcast against them.
+
+        Raises:
+        - ExpressionError: If a variable is unbound or a divisor is zero.
+        """
+        variables = variables or {}
+        missing = self.variables.difference(variables)
+        if missing:
+            raise ExpressionError(f"Unbound variables: {', '.join(sorted(missing))}")
+
+        bindings: Dict[str, Value] = {}
+        for name in self.variables:
+            value = variables[name]
+            bindings[name] = value if isinstance(value, (int, float)) else as_array(value)
+
+        stack: List[Value] = []
+        push, pop = stack.append, stack.pop
+        try:
+            for code, arg in self.instructions:
+                if code == "const":
+                    push(arg)
+                elif code == "load":
+                    push(bindings[arg])
+                elif code == "neg":
+                    push(-pop())
+                else:
+                    right = pop()
+                    left = pop()
+                    if code == "add":
+                        push(add(left, right))
+                    elif code == "sub":
+                        push(subtract(left, right))
+                    elif code == "mul":
+                        push(multiply(left, right))
+                    elif isinstance(left, np.ndarray) or isinstance(right, np.ndarray):
+                        push(batch_divide(left, right))
+                    else:
+                        push(divide(left, right))
+        except ValueError as e:
+            raise ExpressionError(str(e))
+        return stack[0]
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position, end = 0, len(text.rstrip())
+    while position < end:
+        match = _TOKEN_RE.match(text, position)
+        if not match or match.end() == position:
+            raise ExpressionError(f"Unexpected character at position {position}: {text[position]!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+def _parse(text: str) -> Tuple[Instruction, ...]:
+    """Shunting-yard conversion of the token stream to postfix instructions."""
+    output: List[Instruction] = []
+    operators: List[str] = []
+    expect_operand = True
+
+    def emit(operator: str) -> None:
+        output.append(("neg", None) if operator == "u-" else (_BINARY[operator][1], None))
+
+    def precedence(operator: str) -> int:
+        return _UNARY_PRECEDENCE if operator in ("u-", "u+") else _BINARY[operator][0]
+
+    for kind, token in _tokenize(text):
+        if kind == "number":
+            if not expect_operand:
+                raise ExpressionError(f"Unexpected number {token!r}")
+            output.append(("const", float(token)))
+            expect_operand = False
+        elif kind == "name":
+            if not expect_operand:
+                raise ExpressionError(f"Unexpected name {token!r}")
+            output.append(("load", token))
+            expect_operand = False
+        elif token == "(":
+            if not expect_operand:
+                raise ExpressionError("Unexpected '('")
+            operators.append(token)
+        elif token == ")":
+            if expect_operand:
+                raise ExpressionError("Unexpected ')'")
+            while operators and operators[-1] != "(":
+                op = operators.pop()
+                if op != "u+":
+                    emit(op)
+            if not operators:
+                raise ExpressionError("Unbalanced parentheses")
+            operators.pop()
+        elif expect_operand:
+            if token not in "+-":
+                raise ExpressionError(f"Unexpected operator {token!r}")
+            operators.append("u" + token)
+        else:
+            # Unary operators are right-associative, binary ones left-associative.
+            while (
+                operators
+                and operators[-1] != "("
+                and precedence(operators[-1]) >= precedence(token)
+            ):
+                op = operators.pop()
+                if op != "u+":
+                    emit(op)
+            operators.append(token)
+            expect_operand = True
+
+    if expect_operand:
+        raise ExpressionError("Expression is incomplete")
+    while operators:
+        op = operators.pop()
+        if op == "(":
+            raise ExpressionError("Unbalanced parentheses")
+        if op != "u+":
+            emit(op)
+    return tuple(output)
+
+
+def _validate(instructions: Tuple[Instruction, ...]) -> None:
+    """Check that the program leaves exactly one value and never underflows."""
+    depth = 0
+    for code, _ in instructions:
+        if code in ("const", "load"):
+            depth += 1
+        elif code == "neg":
+            if depth < 1:
+                raise ExpressionError("Invalid expression")
+        else:
+            if depth < 2:
+                raise ExpressionError("Invalid expression")
+            depth -= 1
+    if depth != 1:
+        raise ExpressionError("Invalid expression")
+
+
+def parse_expression(text: str) -> Program:
+    """Compile an expression string without consulting the cache."""
+    if not text or not text.strip():
+        raise ExpressionError("Expression is empty")
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError(f"Expression exceeds {MAX_EXPRESSION_LENGTH} characters")
+    instructions = _parse(text)
+    _validate(instructions)
+    return Program(text, instructions)
+
+
+class ExpressionCache:
+    """Thread-safe LRU cache of compiled programs keyed by expression text."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._programs: "OrderedDict[str, Program]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._programs)
+
+    def get(self, text: str) -> Program:
+        with self._lock:
+            program = self._programs.get(text)
+            if program is not None:
+                self._programs.move_to_end(text)
+                self.hits += 1
+                return program
+            self.misses += 1
+
+        # Compile outside the lock; a concurrent miss on the same text just
+        # compiles twice and stores an equivalent program.
+        program = parse_expression(text)
+        with self._lock:
+            self._programs[text] = program
+            self._programs.move_to_end(text)
+            while len(self._programs) > self.maxsize:
+                self._programs.popitem(last=False)
+        return program
+
+    def clear(self) -> None:
+        with self._lock:
+            self._programs.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._programs),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+expression_cache = ExpressionCache(maxsize=settings.EXPRESSION_CACHE_SIZE)
+
+
+def compile_expression(text: str) -> Program:
+    """Return the compiled program for ``text``, using the shared cache."""
+    return expression_cache.get(text)
+
+
+def evaluate(text: str, variables: Mapping[str, Union[Number, ArrayLike]] = None) -> Value:
+    """
+    Evaluate an arithmetic expression against variable bindings.
+
+    Example:
+    >>> evaluate("(a + b) * c / d", {"a": 1, "b": 2, "c": 4, "d": 3})
+    4.0
+    """
+    return compile_expression(text).evaluate(variables)
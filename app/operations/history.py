@@ -0,0 +1,174 @@
+# app/operations/history.py
+
+"""
+Module: history.py
+
+Write-behind persistence of calculator computations. Routes call
+``history_writer.record(...)``, which only appends to a bounded in-memory
+queue; a background thread drains the queue and inserts rows into the
+``calculations`` table in batches, so no request waits on the database.
+
+A batch is flushed when it reaches ``Settings.HISTORY_MAX_BATCH`` rows or
+``Settings.HISTORY_FLUSH_INTERVAL`` seconds after its first row, using
+either a multi-row ``executemany`` INSERT or PostgreSQL ``COPY``
+(``Settings.HISTORY_FLUSH_METHOD``). When the queue holds
+``Settings.HISTORY_MAX_QUEUE`` rows, new records are dropped and counted
+rather than slowing the request path down. ``stop()`` flushes what is
+left and is called on application shutdown.
+"""
+
+import csv
+import io
+import logging
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.calculation import Calculation
+
+logger = logging.getLogger(__name__)
+
+_COPY_COLUMNS = ("id", "user_id", "op", "a", "b", "result", "created_at")
+_STOP = None
+_TICK = object()
+
+
+class HistoryWriter:
+    """Bounded queue plus a background thread that batch-inserts calculations."""
+
+    def __init__(
+        self,
+        session_factory: Callable = SessionLocal,
+        flush_interval: float = settings.HISTORY_FLUSH_INTERVAL,
+        max_batch: int = settings.HISTORY_MAX_BATCH,
+        max_queue: int = settings.HISTORY_MAX_QUEUE,
+        method: str = settings.HISTORY_FLUSH_METHOD,
+    ):
+        if method not in ("executemany", "copy"):
+            raise ValueError(f"Unknown history flush method: {method}")
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.method = method
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats = {"written": 0, "dropped": 0, "failed": 0, "flushes": 0}
+
+    def record(self, op: str, a: float, b: float, result: Optional[float], user_id: Optional[uuid.UUID] = None) -> bool:
+        """Queue one computation; returns False if it was dropped because the queue is full."""
+        row = {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "op": op,
+            "a": a,
+            "b": b,
+            "result": result,
+            "created_at": datetime.utcnow(),
+        }
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            with self._lock:
+                self._stats["dropped"] += 1
+            return False
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Flush everything queued so far and stop the background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+        self._thread = None
+        # Anything recorded while no thread was running is flushed here.
+        self._drain()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, queued=self._queue.qsize())
+
+    def _run(self) -> None:
+        batch: List[Dict[str, Any]] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                row = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                row = _TICK
+            if row is _STOP:
+                self._flush(batch)
+                return
+            if row is not _TICK:
+                batch.append(row)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if len(batch) >= self.max_batch or (deadline is not None and time.monotonic() >= deadline):
+                self._flush(batch)
+                batch, deadline = [], None
+
+    def _drain(self) -> None:
+        batch: List[Dict[str, Any]] = []
+        while True:
+            try:
+                row = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if row is not _STOP:
+                batch.append(row)
+            if len(batch) >= self.max_batch:
+                self._flush(batch)
+                batch = []
+        self._flush(batch)
+
+    def _flush(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        try:
+            with self.session_factory() as session:
+                if self.method == "copy":
+                    self._copy(session, rows)
+                else:
+                    session.execute(insert(Calculation), rows)
+                session.commit()
+        except Exception:
+            logger.exception("Failed to write %d calculation history rows", len(rows))
+            with self._lock:
+                self._stats["failed"] += len(rows)
+            return
+        with self._lock:
+            self._stats["written"] += len(rows)
+            self._stats["flushes"] += 1
+
+    @staticmethod
+    def _copy(session, rows: List[Dict[str, Any]]) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([
+                "" if row[column] is None else row[column] for column in _COPY_COLUMNS
+            ])
+        buffer.seek(0)
+        cursor = session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {Calculation.__tablename__} ({', '.join(_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
+
+history_writer = HistoryWriter()
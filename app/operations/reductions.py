@@ -0,0 +1,212 @@
+# app/operations/reductions.py
+
+"""
+Module: reductions.py
+
+Reductions over large arrays: sum, product, mean, min, max and dot product.
+
+Inputs are split into fixed-size chunks of ``CHUNK_SIZE`` elements. Chunks
+are reduced in parallel on a thread pool (NumPy releases the GIL inside its
+loops) and the partial results are combined in chunk order. Because the
+chunk boundaries do not depend on the number of threads, results are
+bit-for-bit reproducible on any machine size.
+
+Summation (used by sum, mean and dot) supports two methods:
+- "pairwise": NumPy's pairwise summation within each chunk.
+- "kahan": Neumaier-compensated summation within each chunk, vectorized
+  across ``LANES`` independent accumulators.
+Either way the chunk partials (and compensation terms) are combined with
+``math.fsum``, which is exact, so no precision is lost across chunks.
+
+A chunk whose partial is not finite (an infinity or NaN in the input, or a
+running sum that overflowed) contributes its raw values instead, so the
+final result is the exact sum rounded to a float: +/-inf when that
+overflows, NaN when the input holds NaN or infinities of both signs.
+
+Functions:
+- reduce_sum(values, method) -> float
+- reduce_product(values) -> float
+- reduce_mean(values, method) -> float
+- reduce_min(values) -> float
+- reduce_max(values) -> float
+- reduce_dot(a, b, method) -> float
+- compute_reduction(op, values, b, method) -> float: Dispatches by name.
+"""
+
+import math
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from .batch import ArrayLike, _operands, as_array
+from .executor import get_thread_pool
+
+
+CHUNK_SIZE = 1 << 16
+LANES = 1024
+SUM_METHODS = ("pairwise", "kahan")
+_SCALE_DOWN = 2.0 ** -64
+_SCALE_UP = 2.0 ** 64
+
+
+def _chunks(values: np.ndarray) -> List[np.ndarray]:
+    return [values[start:start + CHUNK_SIZE] for start in range(0, values.size, CHUNK_SIZE)]
+
+
+def _map_chunks(func: Callable[[np.ndarray], object], values: np.ndarray) -> list:
+    """Apply ``func`` to every chunk, in parallel when there is more than one."""
+    chunks = _chunks(values)
+    if len(chunks) <= 1:
+        return [func(chunk) for chunk in chunks]
+    # map() returns results in chunk order regardless of completion order.
+    return list(get_thread_pool().map(func, chunks))
+
+
+def _pairwise_partials(chunk: np.ndarray) -> List[float]:
+    with np.errstate(over="ignore", invalid="ignore"):
+        total = float(np.add.reduce(chunk))
+    # An intermediate overflow is not final; let fsum settle it exactly.
+    return [total] if math.isfinite(total) else chunk.tolist()
+
+
+def _kahan_partials(chunk: np.ndarray) -> List[float]:
+    """Neumaier summation over LANES interleaved accumulators; returns sums and compensations."""
+    if chunk.size < 4 * LANES or not np.isfinite(chunk).all():
+        # Too short to amortize the lanes, or holding inf/NaN that the
+        # compensation would turn into inf - inf; fsum over the raw values
+        # is exact anyway.
+        return chunk.tolist()
+    full = chunk.size - chunk.size % LANES
+    total = np.zeros(LANES)
+    compensation = np.zeros(LANES)
+    with np.errstate(over="ignore", invalid="ignore"):
+        for row in chunk[:full].reshape(-1, LANES):
+            step = total + row
+            compensation += np.where(
+                np.abs(total) >= np.abs(row), (total - step) + row, (row - step) + total
+            )
+            total = step
+    if not np.isfinite(compensation).all():
+        # A lane overflowed; the raw values still sum exactly.
+        return chunk.tolist()
+    return total.tolist() + compensation.tolist() + chunk[full:].tolist()
+
+
+def _fsum(partials: List[List[float]]) -> float:
+    """Exact sum of the chunk partials, rounded once; +/-inf on overflow, NaN for inf - inf."""
+    terms = [term for chunk in partials for term in chunk]
+    try:
+        return math.fsum(terms)
+    except OverflowError:
+        # fsum refuses partial sums beyond the float range. Scaling by a power
+        # of two is exact (for terms above ~1e-289), so the rescaled total
+        # overflows only if the sum itself does.
+        return math.fsum(term * _SCALE_DOWN for term in terms) * _SCALE_UP
+    except ValueError:
+        return math.nan
+
+
+def _sum(values: np.ndarray, method: str) -> float:
+    if method not in SUM_METHODS:
+        raise ValueError(f"Unknown summation method: {method}")
+    return _fsum(_map_chunks(_kahan_partials if method == "kahan" else _pairwise_partials, values))
+
+
+def _non_empty(values: ArrayLike, op: str) -> np.ndarray:
+    array = as_array(values).ravel()
+    if array.size == 0:
+        raise ValueError(f"Cannot compute {op} of an empty array")
+    return array
+
+
+def reduce_sum(values: ArrayLike, method: str = "pairwise") -> float:
+    """
+    Sum all values.
+
+    Example:
+    >>> reduce_sum([0.1] * 10)
+    1.0
+    """
+    return _sum(as_array(values).ravel(), method)
+
+
+def reduce_product(values: ArrayLike) -> float:
+    """Multiply all values; chunk products are combined in order."""
+    result = 1.0
+    for partial in _map_chunks(lambda chunk: float(np.multiply.reduce(chunk)), as_array(values).ravel()):
+        result *= partial
+    return result
+
+
+def reduce_mean(values: ArrayLike, method: str = "pairwise") -> float:
+    """Arithmetic mean. Raises ValueError for an empty input."""
+    array = _non_empty(values, "mean")
+    return _sum(array, method) / array.size
+
+
+def reduce_min(values: ArrayLike) -> float:
+    """Smallest value; NaN if any value is NaN. Raises ValueError for an empty input."""
+    # np.minimum propagates NaN wherever it is; builtin min() depends on its position.
+    return float(np.minimum.reduce(_map_chunks(lambda chunk: chunk.min(), _non_empty(values, "min"))))
+
+
+def reduce_max(values: ArrayLike) -> float:
+    """Largest value; NaN if any value is NaN. Raises ValueError for an empty input."""
+    return float(np.maximum.reduce(_map_chunks(lambda chunk: chunk.max(), _non_empty(values, "max"))))
+
+
+def reduce_dot(a: ArrayLike, b: ArrayLike, method: str = "pairwise") -> float:
+    """
+    Dot product, summed with the same chunked, compensated summation as
+    reduce_sum rather than BLAS (whose accumulation order varies by build).
+
+    Raises:
+    - ValueError: If the vectors have different lengths.
+    """
+    if method not in SUM_METHODS:
+        raise ValueError(f"Unknown summation method: {method}")
+    left, right = _operands(a, b)
+    left, right = np.broadcast_arrays(left.ravel(), right.ravel())
+    partial = _kahan_partials if method == "kahan" else _pairwise_partials
+    starts = range(0, left.size, CHUNK_SIZE)
+
+    def chunk_terms(start: int) -> List[float]:
+        # A product beyond the float range is inf, as is the exact dot product then.
+        with np.errstate(over="ignore"):
+            products = left[start:start + CHUNK_SIZE] * right[start:start + CHUNK_SIZE]
+        return partial(products)
+
+    if len(starts) <= 1:
+        partials = [chunk_terms(start) for start in starts]
+    else:
+        partials = list(get_thread_pool().map(chunk_terms, starts))
+    return _fsum(partials)
+
+
+REDUCTIONS = ("sum", "product", "mean", "min", "max", "dot")
+
+
+def compute_reduction(
+    op: str, values: ArrayLike, b: Optional[ArrayLike] = None, method: str = "pairwise"
+) -> float:
+    """
+    Run the reduction named ``op``. ``b`` is required for (and only used by) "dot".
+
+    Raises:
+    - ValueError: For unknown operations or methods, empty inputs where
+      the result is undefined, or a missing second vector for "dot".
+    """
+    if op == "dot":
+        if b is None:
+            raise ValueError("dot requires a second vector 'b'")
+        return reduce_dot(values, b, method)
+    reducers: Dict[str, Callable[[], float]] = {
+        "sum": lambda: reduce_sum(values, method),
+        "product": lambda: reduce_product(values),
+        "mean": lambda: reduce_mean(values, method),
+        "min": lambda: reduce_min(values),
+        "max": lambda: reduce_max(values),
+    }
+    if op not in reducers:
+        raise ValueError(f"Unknown reduction: {op}")
+    return reducers[op]()
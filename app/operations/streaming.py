@@ -0,0 +1,158 @@
+# app/operations/streaming.py
+
+"""
+Module: streaming.py
+
+Evaluates a newline-delimited JSON (NDJSON) stream of ``{"op", "a", "b"}``
+records with the functions in ``app.operations`` and produces one NDJSON
+result line per input line.
+
+Input is consumed chunk by chunk and results are emitted as soon as each
+chunk has been processed, so memory use is bounded by the chunk size plus
+``max_line_bytes`` no matter how long the stream is. A malformed record
+produces an ``{"line": n, "error": ...}`` line and the stream continues.
+JSON has no NaN or infinity, so a non-finite result is written as null.
+
+Functions:
+- evaluate_record(record) -> number: Applies one record's operation.
+- stream_calculations(chunks, max_line_bytes) -> AsyncIterator[bytes]: Turns request chunks into result chunks.
+
+Classes:
+- DuplexStreamingResponse: A StreamingResponse whose body iterator may keep reading the request.
+"""
+
+import json
+import math
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, List
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.config import settings
+from . import Number, add, subtract, multiply, divide
+
+
+STREAM_OPERATIONS: Dict[str, Callable[[Number, Number], Number]] = {
+    "add": add,
+    "subtract": subtract,
+    "multiply": multiply,
+    "divide": divide,
+}
+
+
+def _operand(record: Dict[str, Any], name: str) -> Number:
+    value = record.get(name)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"'{name}' must be a number")
+    if isinstance(value, int):
+        # JSON integers are unbounded; the operations need them as floats.
+        try:
+            float(value)
+        except OverflowError:
+            raise ValueError(f"'{name}' is out of range")
+    return value
+
+
+def evaluate_record(record: Any) -> Number:
+    """
+    Apply the operation described by one decoded record.
+
+    Raises:
+    - ValueError: If the record is not an object, names an unknown operation,
+      has non-numeric or out-of-range operands, or divides by zero.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("Record must be a JSON object")
+    func = STREAM_OPERATIONS.get(record.get("op"))
+    if func is None:
+        raise ValueError(f"Unknown operation: {record.get('op')}")
+    return func(_operand(record, "a"), _operand(record, "b"))
+
+
+def _result_line(line_number: int, raw: bytes) -> bytes:
+    try:
+        record = json.loads(raw)
+    except ValueError:
+        # Covers both json.JSONDecodeError and UnicodeDecodeError.
+        result = {"line": line_number, "error": "Invalid JSON"}
+    else:
+        try:
+            value = evaluate_record(record)
+            result = {"line": line_number, "result": value if math.isfinite(value) else None}
+        except (ValueError, ArithmeticError) as e:
+            # ArithmeticError: e.g. an integer result too large for a float.
+            result = {"line": line_number, "error": str(e)}
+    return json.dumps(result).encode() + b"\n"
+
+
+def _error_line(line_number: int, max_line_bytes: int) -> bytes:
+    return json.dumps(
+        {"line": line_number, "error": f"Line exceeds {max_line_bytes} bytes"}
+    ).encode() + b"\n"
+
+
+async def stream_calculations(
+    chunks: AsyncIterable[bytes],
+    max_line_bytes: int = settings.STREAM_MAX_LINE_BYTES,
+) -> AsyncIterator[bytes]:
+    """
+    Evaluate an NDJSON byte stream and yield NDJSON result chunks.
+
+    Blank lines are skipped but still counted, so ``line`` always matches the
+    1-based line number in the request body. A line longer than
+    ``max_line_bytes`` is reported as an error and skipped without being
+    buffered.
+    """
+    buffer = bytearray()
+    line_number = 0
+    oversized = False
+
+    async for chunk in chunks:
+        out: List[bytes] = []
+        start = 0
+        while True:
+            newline = chunk.find(b"\n", start)
+            if newline < 0:
+                break
+            line_number += 1
+            if oversized:
+                out.append(_error_line(line_number, max_line_bytes))
+                oversized = False
+            else:
+                buffer += chunk[start:newline]
+                if len(buffer) > max_line_bytes:
+                    out.append(_error_line(line_number, max_line_bytes))
+                elif buffer.strip():
+                    out.append(_result_line(line_number, bytes(buffer)))
+            buffer.clear()
+            start = newline + 1
+
+        if not oversized:
+            buffer += chunk[start:]
+            if len(buffer) > max_line_bytes:
+                oversized = True
+                buffer.clear()
+        if out:
+            yield b"".join(out)
+
+    if oversized:
+        yield _error_line(line_number + 1, max_line_bytes)
+    elif buffer.strip():
+        yield _result_line(line_number + 1, bytes(buffer))
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for bodies that are produced while the request body is
+    still being read.
+
+    On ASGI servers older than spec 2.4, ``StreamingResponse`` starts a task
+    that calls ``receive()`` to watch for disconnects, which would steal the
+    request body chunks our iterator is reading. Here the body iterator is
+    the only reader and sees the disconnect itself via ``request.stream()``.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,101 @@
+# app/operations/wire.py
+
+"""
+Module: wire.py
+
+Binary columnar wire format for batch calculator requests and responses,
+served as ``application/x-calc-columns``.
+
+A message is a 16-byte little-endian header followed by ``ncols`` columns of
+``nrows`` little-endian float64 values each, column after column:
+
+    offset  size  field
+    0       4     magic  b"CALC"
+    4       1     version (1)
+    5       1     op      (1 add, 2 subtract, 3 multiply, 4 divide)
+    6       1     on_zero (0 none, 1 nan, 2 inf, 3 null, 4 raise)
+    7       1     ncols
+    8       8     nrows
+
+Requests carry two columns (a, b). Responses carry the result column and,
+for masked division, a second column that is 1.0 for valid rows and 0.0
+where the divisor was zero. Decoding wraps the body with ``np.frombuffer``
+so operands are never copied or parsed.
+"""
+
+import struct
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .batch import MaskedResult
+
+
+CONTENT_TYPE = "application/x-calc-columns"
+MAGIC = b"CALC"
+VERSION = 1
+
+HEADER = struct.Struct("<4sBBBBQ")
+_FLOAT64 = np.dtype("<f8")
+
+OPS = ("add", "subtract", "multiply", "divide")
+POLICIES = (None, "nan", "inf", "null", "raise")
+
+
+class WireFormatError(ValueError):
+    """Raised when a binary message is malformed."""
+
+
+def _encode(op: str, on_zero: Optional[str], columns: Tuple[np.ndarray, ...]) -> bytes:
+    rows = len(columns[0]) if columns else 0
+    header = HEADER.pack(MAGIC, VERSION, OPS.index(op) + 1, POLICIES.index(on_zero), len(columns), rows)
+    # A single join is the only copy: each column is exposed as a buffer.
+    return b"".join([header] + [memoryview(np.ascontiguousarray(c, dtype=_FLOAT64)) for c in columns])
+
+
+def _decode(body: bytes) -> Tuple[str, Optional[str], np.ndarray]:
+    view = memoryview(body)
+    if len(view) < HEADER.size:
+        raise WireFormatError("Message is shorter than the header")
+    magic, version, op_code, policy_code, ncols, rows = HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION:
+        raise WireFormatError("Unsupported message format")
+    if not 1 <= op_code <= len(OPS) or policy_code >= len(POLICIES):
+        raise WireFormatError("Unknown operation or division policy")
+    if len(view) != HEADER.size + ncols * rows * _FLOAT64.itemsize:
+        raise WireFormatError(f"Expected {ncols} columns of {rows} rows")
+    columns = np.frombuffer(view, dtype=_FLOAT64, count=ncols * rows, offset=HEADER.size)
+    return OPS[op_code - 1], POLICIES[policy_code], columns.reshape(ncols, rows)
+
+
+def encode_request(op: str, a, b, on_zero: Optional[str] = None) -> bytes:
+    """Pack a batch request; used by clients and tests."""
+    return _encode(op, on_zero, (np.asarray(a, dtype=_FLOAT64), np.asarray(b, dtype=_FLOAT64)))
+
+
+def decode_request(body: bytes) -> Tuple[str, Optional[str], np.ndarray, np.ndarray]:
+    """
+    Unpack a batch request into ``(op, on_zero, a, b)`` without copying.
+
+    Raises:
+    - WireFormatError: If the header or body length is invalid.
+    """
+    op, on_zero, columns = _decode(body)
+    if columns.shape[0] != 2:
+        raise WireFormatError("A request must have exactly two columns")
+    return op, on_zero, columns[0], columns[1]
+
+
+def encode_response(op: str, on_zero: Optional[str], result: MaskedResult) -> bytes:
+    """Pack a batch result, adding the validity column for masked division."""
+    columns = (result.values,)
+    if op == "divide" and on_zero not in (None, "raise"):
+        columns += (result.valid.astype(_FLOAT64),)
+    return _encode(op, on_zero, columns)
+
+
+def decode_response(body: bytes) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Unpack a batch response into ``(values, valid)``; valid is None when unmasked."""
+    _, _, columns = _decode(body)
+    valid = columns[1] != 0 if columns.shape[0] > 1 else None
+    return columns[0], valid
@@ -0,0 +1,153 @@
+# app/pool_monitor.py
+
+"""
+Connection pool instrumentation.
+
+``QueuePool limit ... connection timed out`` alone cannot tell an undersized
+pool from slow queries holding connections. The pools built here record,
+per engine:
+
+- how long each checkout waited for a connection (including opening a new
+  one and the pre-ping), and how many gave up after ``pool_timeout``;
+- how many connections are checked out, how many of those are overflow
+  beyond ``pool_size``, and the peaks of both;
+- how many connections were opened and invalidated (e.g. by a failed
+  pre-ping or a dropped server connection).
+
+Long waits with the pool at its peak mean the pool is too small for the
+load; long waits with few connections checked out point at connection
+setup; a full pool with short waits means queries hold connections long.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolMonitor:
+    """Thread-safe counters fed by one pool's checkouts and events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.soft_invalidations = 0
+            self.checked_out = 0
+            self.peak_checked_out = 0
+            self.peak_overflow = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+    def attach(self, pool: Pool) -> None:
+        """Listen to ``pool``'s events; the listeners carry over when the pool is recreated."""
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "checkin", self._on_checkin)
+        event.listen(pool, "invalidate", self._on_invalidate)
+        event.listen(pool, "soft_invalidate", self._on_soft_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def _on_soft_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.soft_invalidations += 1
+
+    def record_wait(self, seconds: float, overflow: int, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.peak_overflow = max(self.peak_overflow, overflow)
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def stats(self, pool: Optional[Pool] = None) -> Dict[str, Any]:
+        with self._lock:
+            waits = self.checkouts + self.timeouts
+            stats = {
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": self.peak_overflow,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "soft_invalidations": self.soft_invalidations,
+                "wait_ms_total": round(self.wait_total * 1000, 3),
+                "wait_ms_mean": round(self.wait_total * 1000 / waits, 3) if waits else 0.0,
+                "wait_ms_max": round(self.wait_max * 1000, 3),
+            }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                overflow=max(0, pool.checkedout() - pool.size()),
+                idle=pool.checkedin(),
+                timeout=pool.timeout(),
+            )
+        return stats
+
+
+class _TimedCheckout:
+    """Mixin for QueuePool classes: times ``connect()`` into a PoolMonitor."""
+
+    monitor: PoolMonitor
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if "_dispatch" in kwargs:
+            return  # recreate(): the listeners are copied, the monitor is set below
+        self.monitor = PoolMonitor()
+        self.monitor.attach(self)
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.monitor.record_wait(time.perf_counter() - start, 0, timed_out=True)
+            raise
+        self.monitor.record_wait(time.perf_counter() - start, max(0, self.checkedout() - self.size()))
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool; keep counting into the same monitor.
+        pool = super().recreate()
+        pool.monitor = self.monitor
+        return pool
+
+    def stats(self) -> Dict[str, Any]:
+        return self.monitor.stats(self)
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    """QueuePool for sync engines with a ``monitor``."""
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool for asyncio engines with a ``monitor``."""
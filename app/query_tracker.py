@@ -0,0 +1,169 @@
+# app/query_tracker.py
+
+"""
+Per-request SQL instrumentation.
+
+``SQLInstrumentationMiddleware`` gives every HTTP request a ``QueryLog``
+held in a context variable. Engine-wide ``before_cursor_execute`` /
+``after_cursor_execute`` listeners add each statement to the log of the
+request that ran it, whichever engine and thread ran it: dependencies run
+in the threadpool and the async engine runs in greenlets, and both inherit
+the request's context. Statements outside any request (background
+writers, scripts) are not tracked and cost one context-variable lookup.
+
+For each request the log keeps the statement count, total database time,
+and per *normalized* statement (literals, bind parameters and expanded
+``IN`` lists collapsed to ``?``) its count and time. When one normalized
+statement runs at least ``SQL_REPEAT_THRESHOLD`` times in a request, which
+is the N+1 pattern, a warning names the route and the statement. With
+``SQL_SERVER_TIMING`` the response also carries
+``Server-Timing: db;dur=<ms>;desc="<n> queries"``.
+
+Tests use ``track_queries()`` to assert how many statements a code path
+issues, so regressions fail the suite.
+"""
+
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["QueryLog"]] = ContextVar("query_log", default=None)
+
+_PLACEHOLDER = re.compile(
+    r"%\(\w+\)s|\$\d+|\?|%s"                # bind parameters of the paramstyles in use
+    r"|'(?:[^']|'')*'"                      # string literals
+    r"|\b\d+(?:\.\d+)?\b"                   # numeric literals
+)
+_REPEATED = re.compile(r"\?(?:\s*,\s*\?)+")
+_ROWS = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize(statement: str) -> str:
+    """``statement`` with every literal and parameter as ``?`` and lists collapsed."""
+    normalized = _PLACEHOLDER.sub("?", _SPACE.sub(" ", statement).strip())
+    normalized = _REPEATED.sub("?", normalized)
+    return _ROWS.sub("(?)", normalized)
+
+
+class QueryLog:
+    """Statements run by one request: totals and per normalized statement."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        # normalized statement -> [count, total seconds, max seconds]
+        self.statements: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, statement: str, seconds: float) -> None:
+        key = normalize(statement)
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+            entry = self.statements.get(key)
+            if entry is None:
+                self.statements[key] = [1, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] = max(entry[2], seconds)
+
+    def slowest(self, n: int = settings.SQL_SLOWEST_STATEMENTS) -> List[Tuple[str, int, float]]:
+        """Up to ``n`` ``(statement, count, total seconds)``, most total time first."""
+        with self._lock:
+            ranked = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)
+        return [(statement, int(entry[0]), entry[1]) for statement, entry in ranked[:n]]
+
+    def repeated(self, threshold: int = settings.SQL_REPEAT_THRESHOLD) -> List[Tuple[str, int]]:
+        """Statements run at least ``threshold`` times: likely N+1 queries."""
+        with self._lock:
+            return [(statement, int(entry[0])) for statement, entry in self.statements.items()
+                    if entry[0] >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.seconds * 1000:.3f};desc="{self.count} queries"'
+
+
+def current_log() -> Optional[QueryLog]:
+    return _current.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryLog]:
+    """Record the statements run inside the block (in this context) into a fresh QueryLog."""
+    log = QueryLog()
+    token = _current.set(log)
+    try:
+        yield log
+    finally:
+        _current.reset(token)
+
+
+# The start time lives on the statement's execution context, which is
+# discarded with the statement, so one that fails leaves nothing behind on
+# the pooled connection.
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None and _current.get() is not None:
+        context._query_tracker_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    log = _current.get()
+    start = getattr(context, "_query_tracker_start", None)
+    if log is not None and start is not None:
+        log.add(statement, time.perf_counter() - start)
+
+
+def report(log: QueryLog, route: str) -> None:
+    """Log the request's statements; repeated ones as a warning."""
+    for statement, count in log.repeated():
+        logger.warning("%s ran the same statement %d times (N+1?): %s", route, count, statement)
+    if log.count and logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "%s: %d statements in %.3f ms; slowest: %s",
+            route, log.count, log.seconds * 1000, log.slowest(),
+        )
+
+
+class SQLInstrumentationMiddleware:
+    """ASGI middleware giving each HTTP request its own QueryLog."""
+
+    def __init__(self, app, server_timing: bool = settings.SQL_SERVER_TIMING):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.SQL_TRACKING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", log.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        with track_queries() as log:
+            try:
+                await self.app(scope, receive, send_with_timing if self.server_timing else send)
+            finally:
+                # The route template once routing has matched, so /users/{id} groups together.
+                route = getattr(scope.get("route"), "path", scope["path"])
+                report(log, f"{scope['method']} {route}")
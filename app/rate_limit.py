@@ -0,0 +1,252 @@
+# app/rate_limit.py
+
+"""
+Token-bucket rate limiting for the calculator router and login.
+
+Every client gets one bucket per limited scope (a route, or "login"). It
+is keyed by the user id of a valid bearer token, or else by the client IP,
+so one abusive client cannot starve everybody else on ``/divide``. A
+bucket holds up to ``burst`` tokens and gains ``rate`` tokens per second.
+A request takes one token, or is rejected with ``429 Too Many Requests``
+and a ``Retry-After`` header.
+
+Buckets store only ``(tokens, updated_at)``. The refill is computed lazily
+when the bucket is next used, so there is no timer per key. A bucket that
+has refilled completely is indistinguishable from a missing one, so idle
+buckets can be dropped without changing any decision.
+
+Two stores are available, selected by ``Settings.RATE_LIMIT_BACKEND``:
+
+- "memory": per-worker buckets split over lock-striped shards, each an
+  ``OrderedDict`` in least-recently-used order. Every call evicts from the
+  cold end while those buckets are idle, or while the shard is over its
+  share of ``RATE_LIMIT_MAX_KEYS``, so eviction is O(1) amortized.
+- "shared": a set-associative table in named shared memory, shared by all
+  uvicorn workers on the host and guarded by striped cross-process locks
+  (see ``app.shared_memory``). A key claims an empty or idle slot of its
+  set, or else the least recently used one.
+
+"none" disables rate limiting.
+"""
+
+import hashlib
+import math
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, WebSocketException, status
+from fastapi.security.utils import get_authorization_scheme_param
+from starlette.requests import HTTPConnection
+
+from app.config import settings
+from app.models.user import User
+from app.shared_memory import StripedLock, attach_shared_memory
+
+# key -> (tokens, updated_at, idle_at); idle_at is when the bucket will be full again.
+Bucket = Tuple[float, float, float]
+
+
+def _refill(tokens: float, updated_at: float, now: float, rate: float, burst: float) -> float:
+    return min(burst, tokens + (now - updated_at) * rate)
+
+
+def _take(tokens: float, cost: float, now: float, rate: float, burst: float) -> Tuple[float, float, float]:
+    """Spend ``cost`` if possible; returns ``(tokens left, idle_at, retry_after)``, retry_after 0 when allowed."""
+    retry_after = 0.0
+    if tokens >= cost:
+        tokens -= cost
+    else:
+        retry_after = (cost - tokens) / rate
+    return tokens, now + (burst - tokens) / rate, retry_after
+
+
+class _Shard:
+    __slots__ = ("lock", "buckets")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets: "OrderedDict[str, Bucket]" = OrderedDict()
+
+
+class MemoryBucketStore:
+    """In-process buckets in lock-striped shards with O(1) idle eviction."""
+
+    def __init__(self, max_keys: int, shards: int = 64):
+        self.shards: List[_Shard] = [_Shard() for _ in range(shards)]
+        self.max_per_shard = max(1, max_keys // shards)
+        self.evictions = 0
+
+    def __len__(self):
+        return sum(len(shard.buckets) for shard in self.shards)
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0, now: Optional[float] = None) -> float:
+        """Take ``cost`` tokens from ``key``'s bucket; returns 0 if allowed, else seconds to wait."""
+        now = time.monotonic() if now is None else now
+        shard = self.shards[hash(key) % len(self.shards)]
+        with shard.lock:
+            buckets = shard.buckets
+            bucket = buckets.get(key)
+            if bucket is None:
+                tokens = burst
+            else:
+                tokens = _refill(bucket[0], bucket[1], now, rate, burst)
+                buckets.move_to_end(key)
+            tokens, idle_at, retry_after = _take(tokens, cost, now, rate, burst)
+            buckets[key] = (tokens, now, idle_at)
+            # The cold end holds the least recently used buckets.
+            while buckets:
+                coldest = next(iter(buckets.values()))
+                if coldest[2] > now and len(buckets) <= self.max_per_shard:
+                    break
+                buckets.popitem(last=False)
+                self.evictions += 1
+            return retry_after
+
+    def clear(self) -> None:
+        for shard in self.shards:
+            with shard.lock:
+                shard.buckets.clear()
+
+
+class SharedMemoryBucketStore:
+    """Set-associative buckets in named shared memory, shared by the workers on a host."""
+
+    # key hash (0 = empty), tokens, updated_at, idle_at
+    SLOT = struct.Struct("<Qddd")
+
+    def __init__(self, name: str, max_keys: int, ways: int = 8, stripes: int = 64):
+        self.ways = ways
+        self.sets = max(1, max_keys // ways)
+        self._segment = attach_shared_memory(name, self.sets * ways * self.SLOT.size)
+        self._buf = self._segment.buf
+        self._locks = StripedLock(name, stripes)
+        self.evictions = 0
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        # Stable across processes, unlike hash(); 0 marks an empty slot.
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0, now: Optional[float] = None) -> float:
+        # CLOCK_MONOTONIC is system-wide, so the workers agree on it.
+        now = time.monotonic() if now is None else now
+        key_hash = self._hash(key)
+        index = key_hash % self.sets
+        size = self.SLOT.size
+        base = index * self.ways * size
+        with self._locks.hold(index):
+            found, free, lru, lru_used = None, None, base, None
+            for offset in range(base, base + self.ways * size, size):
+                slot_hash, tokens, updated_at, idle_at = self.SLOT.unpack_from(self._buf, offset)
+                if slot_hash == key_hash:
+                    found = offset
+                    break
+                if free is None and (slot_hash == 0 or idle_at <= now):
+                    free = offset
+                elif lru_used is None or updated_at < lru_used:
+                    lru, lru_used = offset, updated_at
+            if found is not None:
+                offset = found
+                tokens = _refill(tokens, updated_at, now, rate, burst)
+            else:
+                offset = lru if free is None else free
+                self.evictions += free is None
+                tokens = burst
+            tokens, idle_at, retry_after = _take(tokens, cost, now, rate, burst)
+            self.SLOT.pack_into(self._buf, offset, key_hash, tokens, now, idle_at)
+            return retry_after
+
+    def clear(self) -> None:
+        for index in range(self.sets):
+            base = index * self.ways * self.SLOT.size
+            with self._locks.hold(index):
+                self._buf[base:base + self.ways * self.SLOT.size] = bytes(self.ways * self.SLOT.size)
+
+    def close(self) -> None:
+        self._buf = None
+        self._segment.close()
+        self._locks.close()
+
+
+def create_store(kind: str = settings.RATE_LIMIT_BACKEND):
+    """Build the bucket store named by ``kind``; returns None for "none"."""
+    if kind == "memory":
+        return MemoryBucketStore(settings.RATE_LIMIT_MAX_KEYS)
+    if kind == "shared":
+        return SharedMemoryBucketStore(settings.RATE_LIMIT_SHM_NAME, settings.RATE_LIMIT_MAX_KEYS)
+    if kind == "none":
+        return None
+    raise ValueError(f"Unknown rate limit backend: {kind}")
+
+
+bucket_store = create_store()
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def client_key(connection: HTTPConnection) -> str:
+    """``user:<id>`` for a valid bearer token, otherwise ``ip:<address>``."""
+    scheme, token = get_authorization_scheme_param(connection.headers.get("authorization"))
+    if scheme.lower() == "bearer" and token:
+        user_id = User.verify_token(token)
+        if user_id is not None:
+            return f"user:{user_id}"
+    return f"ip:{connection.client.host if connection.client else 'unknown'}"
+
+
+class RateLimit:
+    """
+    Dependency enforcing a token bucket per client and scope. The scope
+    defaults to the matched route's path, so each route is limited on its own.
+    """
+
+    def __init__(self, rate: float, burst: float, scope: Optional[str] = None):
+        self.rate = rate
+        self.burst = burst
+        self.scope = scope
+
+    def __call__(self, connection: HTTPConnection) -> None:
+        store = bucket_store
+        if store is None:
+            return
+        scope = self.scope or getattr(connection.scope.get("route"), "path", connection.url.path)
+        retry_after = store.take(f"{scope}|{client_key(connection)}", self.rate, self.burst)
+        with _stats_lock:
+            counters = _stats.setdefault(scope, {"allowed": 0, "limited": 0})
+            counters["limited" if retry_after else "allowed"] += 1
+        if not retry_after:
+            return
+        if connection.scope["type"] == "websocket":
+            raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Rate limit exceeded")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+def stats() -> Dict[str, object]:
+    """Allowed and limited counts per scope, and store evictions, for this process."""
+    with _stats_lock:
+        scopes = {scope: dict(counters) for scope, counters in _stats.items()}
+    return {
+        "backend": settings.RATE_LIMIT_BACKEND,
+        "evictions": bucket_store.evictions if bucket_store is not None else 0,
+        "scopes": scopes,
+    }
+
+
+def reset() -> None:
+    """Forget all buckets and counters."""
+    if bucket_store is not None:
+        bucket_store.clear()
+    with _stats_lock:
+        _stats.clear()
+
+
+calculator_rate_limit = RateLimit(settings.RATE_LIMIT_RATE, settings.RATE_LIMIT_BURST)
+login_rate_limit = RateLimit(settings.RATE_LIMIT_LOGIN_RATE, settings.RATE_LIMIT_LOGIN_BURST, scope="login")
@@ -0,0 +1,133 @@
+# app/replicas.py
+
+"""
+Read-replica routing.
+
+Read-only paths (the ``get_current_user`` lookup, listings) open their
+session from ``ReadSessionLocal`` / ``get_read_db`` in ``app.database``.
+Such a ``RoutingSession`` sends its queries to one replica, picked round
+robin per transaction so every statement of a transaction sees the same
+snapshot. Flushes and INSERT/UPDATE/DELETE statements always go to the
+primary, as does every ordinary session: writes and read-your-writes paths
+(``User.register``, ``User.authenticate``'s ``last_login`` update) never
+touch a replica.
+
+A replica whose connection fails is ejected for ``REPLICA_EJECT_SECONDS``,
+and the failing read is retried on the next healthy replica, or on the
+primary when none is left. Without ``DATABASE_REPLICA_URLS`` every read
+session simply uses the primary.
+"""
+
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+
+class ReplicaSet:
+    """Round-robin over replica engines, skipping ejected ones."""
+
+    def __init__(self, engines: Sequence[Engine], eject_seconds: float):
+        self.engines = list(engines)
+        self.eject_seconds = eject_seconds
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+        self._ejected_until = [0.0] * len(self.engines)
+        self._reads = [0] * len(self.engines)
+        self._ejections = [0] * len(self.engines)
+        self.primary_fallbacks = 0
+
+    def __len__(self):
+        return len(self.engines)
+
+    def choose(self) -> Optional[Engine]:
+        """The next healthy replica, or None if there is none (use the primary)."""
+        if not self.engines:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self.engines)):
+                index = next(self._next) % len(self.engines)
+                if self._ejected_until[index] <= now:
+                    self._reads[index] += 1
+                    return self.engines[index]
+            self.primary_fallbacks += 1
+            return None
+
+    def eject(self, engine: Engine) -> None:
+        """Take ``engine`` out of rotation; it is tried again after ``eject_seconds``."""
+        with self._lock:
+            for index, candidate in enumerate(self.engines):
+                if candidate is engine:
+                    self._ejected_until[index] = time.monotonic() + self.eject_seconds
+                    self._ejections[index] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "replicas": [
+                    {
+                        "url": engine.url.render_as_string(hide_password=True),
+                        "healthy": self._ejected_until[index] <= now,
+                        "reads": self._reads[index],
+                        "ejections": self._ejections[index],
+                    }
+                    for index, engine in enumerate(self.engines)
+                ],
+                "primary_fallbacks": self.primary_fallbacks,
+            }
+
+
+class RoutingSession(Session):
+    """
+    Session that reads from ``replicas`` when created with ``read_only=True``.
+    Anything that writes is bound to the session's own (primary) bind.
+    """
+
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, read_only: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.read_only = read_only
+        self._read_bind: Optional[Engine] = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        primary = super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if not self.read_only or self.replicas is None or self._flushing or isinstance(clause, UpdateBase):
+            return primary
+        if self._read_bind is None:
+            self._read_bind = self.replicas.choose() or primary
+        return self._read_bind
+
+    def execute(self, statement, *args, **kwargs):
+        # Up to one attempt per replica, then the primary.
+        attempts: List[Engine] = []
+        while True:
+            try:
+                return super().execute(statement, *args, **kwargs)
+            except DBAPIError as e:
+                replica = self._read_bind
+                if not self._can_fail_over(e, replica) or replica in attempts:
+                    raise
+                attempts.append(replica)
+                self.replicas.eject(replica)
+                self.rollback()  # ends the transaction; the next statement picks again
+
+    def _can_fail_over(self, error: DBAPIError, replica: Optional[Engine]) -> bool:
+        if replica is None or self.replicas is None or replica not in self.replicas.engines:
+            return False
+        if self.new or self.dirty or self.deleted:
+            return False  # would lose pending changes
+        return isinstance(error, OperationalError) or error.connection_invalidated
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_replica(session: RoutingSession, transaction) -> None:
+    if transaction.parent is None:
+        session._read_bind = None
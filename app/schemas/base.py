@@ -9,7 +9,8 @@ class UserBase(BaseModel):
     first_name: str = Field(max_length=50, example="John")
     last_name: str = Field(max_length=50, example="Doe")
     email: EmailStr = Field(example="john.doe@example.com")
-    username: str = Field(min_length=3, max_length=50, example="johndoe")
+    # Logins look identifiers containing "@" up as emails only.
+    username: str = Field(min_length=3, max_length=50, pattern=r"^[^@]+$", example="johndoe")
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -21,9 +22,11 @@ class PasswordMixin(BaseModel):
     @model_validator(mode="before")
     @classmethod
     def validate_password(cls, values: dict) -> dict:
+        if not isinstance(values, dict):
+            return values  # reported as a model type error by pydantic
         password = values.get("password")
         if not password:
-            raise ValidationError("Password is required", model=cls) 
+            raise ValueError("Password is required")
         if len(password) < 6:
             raise ValueError("Password must be at least 6 characters long")
         if not any(char.isupper() for char in password):
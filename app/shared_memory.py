@@ -0,0 +1,99 @@
+# app/shared_memory.py
+
+"""
+Helpers for state shared between the uvicorn worker processes on one host.
+
+Workers are started independently (``uvicorn --workers N``), so there is no
+parent process to hand them a ``multiprocessing.Lock``. Segments are
+therefore attached by name, and mutual exclusion uses ``fcntl`` byte-range
+locks on a lock file next to the segment, striped so unrelated keys do not
+contend.
+"""
+
+import fcntl
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from typing import Iterator, List
+
+
+def attach_shared_memory(name: str, size: int) -> shared_memory.SharedMemory:
+    """
+    Create the named segment, or attach to it if another worker already did.
+
+    Newly created segments are zero-filled by the OS. The segment is
+    unregistered from this process's resource tracker so that a worker
+    exiting does not unlink memory the other workers are still using.
+    """
+    try:
+        segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+    except FileExistsError:
+        segment = shared_memory.SharedMemory(name=name)
+        if segment.size < size:
+            segment.close()
+            raise ValueError(
+                f"Shared memory segment {name!r} is {segment.size} bytes, expected {size}"
+            )
+    _untrack(segment)
+    return segment
+
+
+def open_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment owned (and later unlinked) by another process."""
+    segment = shared_memory.SharedMemory(name=name)
+    _untrack(segment)
+    return segment
+
+
+def unlink_shared(name: str) -> None:
+    """
+    Remove the segment ``name`` and its lock file. Only for when no worker
+    uses them any more: a worker that attached before would keep locking
+    the unlinked file while newcomers lock a new one.
+    """
+    shared_memory.SharedMemory(name=name).unlink()
+    try:
+        os.unlink(_lock_path(name))
+    except FileNotFoundError:
+        pass
+
+
+def _lock_path(name: str) -> str:
+    return os.path.join(tempfile.gettempdir(), f"{name}.lock")
+
+
+def _untrack(segment: shared_memory.SharedMemory) -> None:
+    try:
+        resource_tracker.unregister(segment._name, "shared_memory")
+    except Exception:  # pragma: no cover - tracker internals vary by version
+        pass
+
+
+class StripedLock:
+    """
+    A fixed number of locks that are exclusive across threads and processes.
+
+    Each stripe pairs a ``threading.Lock`` (fcntl locks are per process, so
+    they do not exclude threads of the same worker) with an ``fcntl`` lock on
+    one byte of a shared lock file.
+    """
+
+    def __init__(self, name: str, stripes: int = 64):
+        self.stripes = stripes
+        self._fd = os.open(_lock_path(name), os.O_RDWR | os.O_CREAT, 0o600)
+        self._thread_locks: List[threading.Lock] = [threading.Lock() for _ in range(stripes)]
+
+    @contextmanager
+    def hold(self, key: int) -> Iterator[None]:
+        stripe = key % self.stripes
+        with self._thread_locks[stripe]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, stripe)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, stripe)
+
+    def close(self) -> None:
+        os.close(self._fd)
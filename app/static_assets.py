@@ -0,0 +1,171 @@
+# app/static_assets.py
+
+"""
+Precompressed, cacheable static pages.
+
+Templates are read once at startup, minified and compressed with gzip and
+zlib (deflate) at maximum level, plus brotli when the optional ``brotli``
+package is installed. Serving a page is then a dictionary lookup: pick the
+best encoding the client accepts, answer ``304 Not Modified`` when its
+``If-None-Match`` still matches, otherwise return the prebuilt bytes.
+
+Every representation gets a strong ETag derived from the minified content
+(suffixed with the content coding for compressed variants) and the
+configured ``Cache-Control`` header.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import zlib
+from functools import lru_cache
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from starlette.responses import Response
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional: only adds the "br" variant
+    brotli = None
+
+
+# Preferred first when the client accepts several.
+ENCODINGS = ("br", "gzip", "deflate") if brotli is not None else ("gzip", "deflate")
+
+_HTML_COMMENT = re.compile(r"<!--(?!\[if).*?-->", re.DOTALL)
+_BLOCK_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_EMBEDDED = re.compile(r"(<(script|style)\b[^>]*>)(.*?)(</\2>)", re.DOTALL | re.IGNORECASE)
+
+
+def _strip_code(code: str) -> str:
+    code = _BLOCK_COMMENT.sub("", code)
+    # Only whole-line // comments: a trailing // may sit inside a string or URL.
+    return "\n".join(line for line in code.splitlines() if not line.lstrip().startswith("//"))
+
+
+def minify_html(text: str) -> str:
+    """
+    Remove comments, indentation and blank lines.
+
+    Inline ``<script>``/``<style>`` bodies lose their ``/* */`` and
+    whole-line ``//`` comments. Line breaks are kept so that scripts
+    relying on automatic semicolon insertion keep working. Not suitable for
+    pages with ``<pre>`` or ``<textarea>`` content.
+    """
+    text = _HTML_COMMENT.sub("", text)
+    text = _EMBEDDED.sub(lambda m: m.group(1) + _strip_code(m.group(3)) + m.group(4), text)
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=11)
+    if encoding == "gzip":
+        # mtime=0 keeps the bytes (and so the ETag) stable across restarts.
+        return gzip.compress(body, compresslevel=9, mtime=0)
+    return zlib.compress(body, 9)
+
+
+@lru_cache(maxsize=256)
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Best precompressed encoding acceptable to the client, or None for identity."""
+    accepted: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    candidates = [e for e in ENCODINGS if accepted.get(e, wildcard) > 0]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda e: accepted.get(e, wildcard))
+
+
+class Asset:
+    """One page with its prebuilt representations, keyed by content coding."""
+
+    __slots__ = ("variants", "etags", "not_modified_headers")
+
+    def __init__(self, body: bytes, media_type: str):
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        common = {"cache-control": settings.STATIC_CACHE_CONTROL, "vary": "Accept-Encoding"}
+        # (body, headers) per encoding; None is the identity representation.
+        self.variants: Dict[Optional[str], Tuple[bytes, Dict[str, str]]] = {
+            None: (body, {**common, "etag": f'"{digest}"', "content-type": media_type}),
+        }
+        for encoding in ENCODINGS:
+            compressed = _compress(body, encoding)
+            if len(compressed) < len(body):
+                self.variants[encoding] = (compressed, {
+                    **common,
+                    "etag": f'"{digest}-{encoding}"',
+                    "content-type": media_type,
+                    "content-encoding": encoding,
+                })
+        self.etags = frozenset(headers["etag"] for _, headers in self.variants.values())
+        self.not_modified_headers = {
+            encoding: {k: v for k, v in headers.items() if k in ("etag", "cache-control", "vary")}
+            for encoding, (_, headers) in self.variants.items()
+        }
+
+    def matches(self, if_none_match: str) -> bool:
+        """True when any listed ETag is one of ours (weak comparison, as RFC 9110 requires here)."""
+        if if_none_match.strip() == "*":
+            return True
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag in self.etags:
+                return True
+        return False
+
+    def response(self, headers: Mapping[str, str]) -> Response:
+        encoding = negotiate(headers.get("accept-encoding", ""))
+        if encoding not in self.variants:
+            encoding = None
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and self.matches(if_none_match):
+            return Response(status_code=304, headers=self.not_modified_headers[encoding])
+        body, variant_headers = self.variants[encoding]
+        return Response(body, headers=variant_headers)
+
+
+class AssetStore:
+    """Assets by name."""
+
+    def __init__(self):
+        self._assets: Dict[str, Asset] = {}
+
+    def add(self, name: str, text: str, media_type: Optional[str] = None) -> Asset:
+        media_type = media_type or mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if media_type == "text/html":
+            text = minify_html(text)
+        if media_type.startswith("text/"):
+            media_type += "; charset=utf-8"
+        asset = self._assets[name] = Asset(text.encode("utf-8"), media_type)
+        return asset
+
+    def load(self, directory: str, names: Optional[Iterable[str]] = None) -> None:
+        """Load ``names`` (default: every file) from ``directory``."""
+        for name in sorted(names if names is not None else os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                with open(path, encoding="utf-8") as fh:
+                    self.add(name, fh.read())
+
+    def __getitem__(self, name: str) -> Asset:
+        return self._assets[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._assets
@@ -1,53 +1,77 @@
-from fastapi import FastAPI
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Request
 from fastapi.responses import HTMLResponse
 
+from app.auth.hashing import calibrate_bcrypt, hashing_pool, shutdown_process_pool
+from app.auth.last_login import last_login_buffer
+from app.auth.routes import require_admin_key, router as auth_router
+from app.database import dispose_async_engines, pool_stats, replica_stats
+from app.models.user import pwd_context
 # Import calculator API routes
 from app.operations.calculator import router as calculator_router
+from app.operations.executor import shutdown_pool
+from app.operations.history import history_writer
+from app.query_tracker import SQLInstrumentationMiddleware
+from app import rate_limit
+from app.static_assets import AssetStore
+
+
+# Minified and precompressed once; the page handlers are dictionary lookups.
+assets = AssetStore()
+assets.load(os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    calibrate_bcrypt(pwd_context)
+    history_writer.start()
+    last_login_buffer.start()
+    yield
+    last_login_buffer.stop()
+    history_writer.stop()
+    shutdown_pool()
+    hashing_pool.shutdown()
+    shutdown_process_pool()
+    await dispose_async_engines()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(SQLInstrumentationMiddleware)
+
+
+@app.api_route("/", methods=["GET", "HEAD"], response_class=HTMLResponse)
+async def homepage(request: Request):
+    return assets["homepage.html"].response(request.headers)
 
-app = FastAPI()
 
+@app.api_route("/index.html", methods=["GET", "HEAD"], response_class=HTMLResponse)
+async def calculator_page(request: Request):
+    return assets["index.html"].response(request.headers)
 
-@app.get("/", response_class=HTMLResponse)
-def homepage():
-    html = """
-    <!DOCTYPE html>
-    <html>
-    <body>
-        <h1>Hello World</h1>
 
-        <input id="a" type="number" />
-        <input id="b" type="number" />
+@app.get("/db/pool/stats", dependencies=[Depends(require_admin_key)])
+def db_pool_stats():
+    """Checkout waits, in-use and overflow counts, and invalidations of the database pools."""
+    return pool_stats()
 
-        <button onclick="add()">Add</button>
-        <button onclick="divide()">Divide</button>
 
-        <div id="result"></div>
+@app.get("/db/replicas/stats", dependencies=[Depends(require_admin_key)])
+def db_replica_stats():
+    """Health, ejections and read counts of the read replicas."""
+    return replica_stats()
 
-        <script>
-            function add() {
-                const a = parseFloat(document.getElementById('a').value);
-                const b = parseFloat(document.getElementById('b').value);
-                document.getElementById('result').innerText = "Result: " + (a + b);
-            }
 
-            function divide() {
-                const a = parseFloat(document.getElementById('a').value);
-                const b = parseFloat(document.getElementById('b').value);
-                if (b === 0) {
-                    document.getElementById('result').innerText = "Error: Cannot divide by zero!";
-                } else {
-                    document.getElementById('result').innerText = "Result: " + (a / b);
-                }
-            }
-        </script>
-    </body>
-    </html>
-    """
-    return HTMLResponse(content=html)
+@app.get("/rate-limit/stats", dependencies=[Depends(require_admin_key)])
+def rate_limit_stats():
+    """Allowed and limited requests per rate-limited scope in this worker."""
+    return rate_limit.stats()
 
 
 # Include calculator API routes (required for integration tests)
 app.include_router(calculator_router)
+app.include_router(auth_router)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,72 @@
+# tests/benchmarks/__main__.py
+
+"""
+Run the benchmark suite or compare two runs.
+
+    python -m tests.benchmarks run --output bench.json [--suite asgi] [--quick]
+    python -m tests.benchmarks compare baseline.json bench.json [--tolerance 0.1] [--metric p99_us]
+    python -m tests.benchmarks run --output bench.json --baseline baseline.json
+
+``compare`` (and ``run --baseline``) exit with status 1 when any benchmark
+regressed by more than the tolerance, so the command can gate a release.
+"""
+
+import argparse
+import sys
+
+from tests.benchmarks.harness import compare, load, save
+from tests.benchmarks.suites import SUITES
+
+
+def _report(regressions) -> int:
+    if not regressions:
+        print("No regressions.")
+        return 0
+    print(f"{len(regressions)} regression(s):")
+    for entry in regressions:
+        print(
+            f"  {entry['benchmark']} {entry['metric']}: "
+            f"{entry['baseline']:.2f} -> {entry['current']:.2f} ({entry['change']:+.1%})"
+        )
+    return 1
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run benchmarks and save the results as JSON")
+    run.add_argument("--output", required=True)
+    run.add_argument("--suite", action="append", choices=sorted(SUITES), help="default: all suites")
+    run.add_argument("--quick", action="store_true", help="fewer iterations, for smoke testing")
+    run.add_argument("--baseline", help="compare against this saved run after running")
+
+    cmp = commands.add_parser("compare", help="compare a run against a baseline")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+
+    for sub in (run, cmp):
+        sub.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown (0.10 = 10%%)")
+        sub.add_argument("--metric", action="append", help="metrics to compare (default: p50_us)")
+
+    args = parser.parse_args(argv)
+    metrics = tuple(args.metric or ("p50_us",))
+
+    if args.command == "compare":
+        return _report(compare(load(args.baseline), load(args.current), args.tolerance, metrics))
+
+    results = {}
+    for name in args.suite or sorted(SUITES):
+        print(f"Running {name} benchmarks...", file=sys.stderr)
+        results.update(SUITES[name](quick=args.quick))
+    save(results, args.output)
+    for name, result in sorted(results.items()):
+        print(f"{name:45s} p50 {result['p50_us']:12.2f} us   p99 {result['p99_us']:12.2f} us   "
+              f"{result['ops_per_sec']:14.1f} ops/s")
+    if args.baseline:
+        return _report(compare(load(args.baseline), results, args.tolerance, metrics))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# tests/benchmarks/harness.py
+
+"""
+Timing, reporting and regression comparison for the benchmark suite.
+
+Every benchmark produces a result dict of per-call latency statistics in
+microseconds plus throughput, keyed by benchmark name. A run is saved as
+JSON; ``compare`` checks a run against a saved baseline and reports every
+benchmark whose median (or any other chosen metric) got slower than the
+allowed tolerance.
+"""
+
+import json
+import math
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+Result = Dict[str, float]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted sample list."""
+    if not samples:
+        raise ValueError("No samples")
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples_s: List[float], total_s: Optional[float] = None) -> Result:
+    """Turn per-call durations in seconds into the stored statistics."""
+    total_s = sum(samples_s) if total_s is None else total_s
+    us = [s * 1e6 for s in samples_s]
+    return {
+        "n": len(us),
+        "mean_us": statistics.fmean(us),
+        "p50_us": percentile(us, 50),
+        "p95_us": percentile(us, 95),
+        "p99_us": percentile(us, 99),
+        "ops_per_sec": len(us) / total_s if total_s else 0.0,
+    }
+
+
+def measure(func: Callable[[], object], iterations: int, warmup: int = 3, inner: int = 1) -> Result:
+    """
+    Time ``func``. Each sample runs it ``inner`` times and is divided back
+    down, which keeps timer overhead out of sub-microsecond measurements.
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    clock = time.perf_counter
+    for _ in range(iterations):
+        start = clock()
+        for _ in range(inner):
+            func()
+        samples.append((clock() - start) / inner)
+    return summarize(samples, total_s=sum(samples))
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def save(results: Dict[str, Result], path: str) -> None:
+    with open(path, "w") as fh:
+        json.dump({"environment": environment(), "results": results}, fh, indent=2, sort_keys=True)
+
+
+def load(path: str) -> Dict[str, Result]:
+    with open(path) as fh:
+        return json.load(fh)["results"]
+
+
+def compare(
+    baseline: Dict[str, Result],
+    current: Dict[str, Result],
+    tolerance: float = 0.10,
+    metrics: Iterable[str] = ("p50_us",),
+) -> List[Dict[str, object]]:
+    """
+    Return one entry per (benchmark, metric) that regressed by more than
+    ``tolerance`` (0.10 = 10% slower). Benchmarks missing from either run
+    are ignored.
+    """
+    regressions = []
+    for name in sorted(set(baseline) & set(current)):
+        for metric in metrics:
+            before, after = baseline[name].get(metric), current[name].get(metric)
+            if not before or after is None:
+                continue
+            change = after / before - 1
+            if change > tolerance:
+                regressions.append({
+                    "benchmark": name,
+                    "metric": metric,
+                    "baseline": before,
+                    "current": after,
+                    "change": change,
+                })
+    return regressions
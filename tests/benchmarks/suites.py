@@ -0,0 +1,225 @@
+# tests/benchmarks/suites.py
+
+"""
+The benchmark layers:
+
+- operations: scalar and batch arithmetic from ``app.operations``.
+- asgi: in-process request latency and throughput of the homepage and the
+  calculator router, driven through ``httpx.ASGITransport`` (no sockets).
+- websocket: the ``/ws/calc`` channel (one operation in flight, pipelined
+  windows and batched frames) next to the equivalent HTTP ``/add`` call.
+- auth: password hashing/verification and JWT creation/verification, the
+  latter both uncached and as a token-cache hit.
+
+Each suite returns ``{benchmark name: result}`` as produced by
+``harness.measure`` / ``harness.summarize``.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+import httpx
+import numpy as np
+
+from app import rate_limit
+from app.models.user import User
+from app.operations import add, subtract, multiply, divide
+from app.operations.batch import batch_add, batch_divide, divide_masked
+from app.operations.expression import evaluate
+from app.operations.reductions import reduce_sum
+from tests.benchmarks.harness import Result, measure, summarize
+
+
+def operations_suite(quick: bool = False) -> Dict[str, Result]:
+    iterations = 200 if quick else 2000
+    results = {}
+    for func in (add, subtract, multiply, divide):
+        results[f"operations.{func.__name__}"] = measure(lambda: func(6.0, 3.0), iterations, inner=100)
+
+    for rows in (1_000, 100_000):
+        a = np.random.default_rng(0).random(rows)
+        b = a + 1.0
+        listed_a, listed_b = a.tolist(), b.tolist()
+        batch_iterations = max(10, iterations // (rows // 1000))
+        results[f"operations.batch_add[{rows}]"] = measure(lambda: batch_add(a, b), batch_iterations)
+        results[f"operations.batch_add_list[{rows}]"] = measure(
+            lambda: batch_add(listed_a, listed_b), batch_iterations
+        )
+        results[f"operations.batch_divide[{rows}]"] = measure(lambda: batch_divide(a, b), batch_iterations)
+        results[f"operations.divide_masked[{rows}]"] = measure(lambda: divide_masked(a, b), batch_iterations)
+        for method in ("pairwise", "kahan"):
+            results[f"operations.reduce_sum_{method}[{rows}]"] = measure(
+                lambda: reduce_sum(a, method), batch_iterations
+            )
+
+    results["operations.evaluate"] = measure(
+        lambda: evaluate("(a + b) * c / d", {"a": 1.0, "b": 2.0, "c": 3.0, "d": 4.0}), iterations, inner=10
+    )
+    return results
+
+
+async def _drive(client: httpx.AsyncClient, make_request: Callable, requests: int, concurrency: int) -> Result:
+    """Issue ``requests`` requests from ``concurrency`` concurrent workers."""
+    latencies: List[float] = []
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await make_request(client)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 500:
+                raise RuntimeError(f"{response.request.url} returned {response.status_code}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, total_s=time.perf_counter() - started)
+
+
+@contextmanager
+def _unlimited():
+    """The suites measure the routes; a single benchmark client would just drain its rate limit."""
+    store, rate_limit.bucket_store = rate_limit.bucket_store, None
+    try:
+        yield
+    finally:
+        rate_limit.bucket_store = store
+
+
+def asgi_suite(quick: bool = False) -> Dict[str, Result]:
+    from main import app
+
+    requests = 200 if quick else 2000
+    batch = {"op": "add", "a": list(range(1000)), "b": list(range(1000))}
+    scenarios = {
+        "asgi.homepage": lambda c: c.get("/"),
+        "asgi.add": lambda c: c.post("/add", json={"a": 2, "b": 3}),
+        "asgi.divide_by_zero": lambda c: c.post("/divide", json={"a": 2, "b": 0}),
+        "asgi.batch[1000]": lambda c: c.post("/batch", json=batch),
+        "asgi.evaluate": lambda c: c.post(
+            "/evaluate", json={"expression": "(a + b) * c", "variables": {"a": 1, "b": 2, "c": 3}}
+        ),
+    }
+
+    async def run() -> Dict[str, Result]:
+        transport = httpx.ASGITransport(app=app)
+        results = {}
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, make_request in scenarios.items():
+                await _drive(client, make_request, min(50, requests), 4)  # warm up
+                for concurrency in (1, 16):
+                    results[f"{name}[c={concurrency}]"] = await _drive(
+                        client, make_request, requests, concurrency
+                    )
+        return results
+
+    with _unlimited():
+        return asyncio.run(run())
+
+
+class _WebSocketSession:
+    """A WebSocket connection driven straight through the ASGI interface, like httpx.ASGITransport."""
+
+    def __init__(self, app, path: str):
+        self._app, self._path = app, path
+        self._inbound: asyncio.Queue = asyncio.Queue()
+        self._outbound: asyncio.Queue = asyncio.Queue()
+
+    async def __aenter__(self) -> "_WebSocketSession":
+        scope = {
+            "type": "websocket", "asgi": {"version": "3.0"}, "scheme": "ws", "path": self._path,
+            "raw_path": self._path.encode(), "root_path": "", "query_string": b"", "headers": [],
+            "server": ("bench", 80), "client": ("bench", 1), "subprotocols": [],
+        }
+        self._task = asyncio.create_task(self._app(scope, self._inbound.get, self._outbound.put))
+        await self._inbound.put({"type": "websocket.connect"})
+        message = await self._outbound.get()
+        if message["type"] != "websocket.accept":
+            raise RuntimeError(f"{self._path} refused the connection: {message}")
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._inbound.put({"type": "websocket.disconnect", "code": 1000})
+        await self._task
+
+    async def send(self, text: str) -> None:
+        await self._inbound.put({"type": "websocket.receive", "text": text})
+
+    async def receive(self) -> str:
+        return (await self._outbound.get())["text"]
+
+
+def websocket_suite(quick: bool = False) -> Dict[str, Result]:
+    from main import app
+
+    requests = 200 if quick else 2000
+    window, batch_size = 64, 100
+    record = json.dumps({"id": 1, "op": "add", "a": 2, "b": 3})
+    batch = json.dumps([{"id": i, "op": "add", "a": i, "b": 3} for i in range(batch_size)])
+
+    async def run() -> Dict[str, Result]:
+        results = {}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            add = lambda c: c.post("/add", json={"a": 2, "b": 3})  # noqa: E731
+            await _drive(client, add, min(50, requests), 1)
+            results["websocket.http_add[c=1]"] = await _drive(client, add, requests, 1)
+
+        async with _WebSocketSession(app, "/ws/calc") as ws:
+            async def sample(frames: int, text: str, per: int) -> float:
+                start = time.perf_counter()
+                for _ in range(frames):
+                    await ws.send(text)
+                for _ in range(frames):
+                    await ws.receive()
+                return (time.perf_counter() - start) / per
+
+            for _ in range(min(50, requests)):
+                await sample(1, record, 1)
+            # One operation in flight: the round trip latency an interactive client sees.
+            results["websocket.add[round_trip]"] = summarize([await sample(1, record, 1) for _ in range(requests)])
+            # Frames pipelined without waiting; per-operation cost within each window.
+            results[f"websocket.add[pipelined={window}]"] = summarize(
+                [await sample(window, record, window) for _ in range(max(10, requests // window))]
+            )
+            # One frame carrying many operations; per-operation cost.
+            results[f"websocket.add[batch={batch_size}]"] = summarize(
+                [await sample(1, batch, batch_size) for _ in range(max(10, requests // batch_size))]
+            )
+        return results
+
+    with _unlimited():
+        return asyncio.run(run())
+
+
+def auth_suite(quick: bool = False) -> Dict[str, Result]:
+    bcrypt_iterations = 3 if quick else 10
+    jwt_iterations = 200 if quick else 2000
+    user = User(password_hash=User.hash_password("BenchPass123"))
+    token = User.create_access_token({"sub": "123e4567-e89b-12d3-a456-426614174000"})
+    # verify_token caches verified tokens; a distinct token per call measures
+    # the signature check, the repeated one the cache hit.
+    fresh = iter([
+        User.create_access_token({"sub": str(uuid.uuid4())}) for _ in range(jwt_iterations + 3)
+    ])
+    return {
+        "auth.hash_password": measure(lambda: User.hash_password("BenchPass123"), bcrypt_iterations, warmup=1),
+        "auth.verify_password": measure(lambda: user.verify_password("BenchPass123"), bcrypt_iterations, warmup=1),
+        "auth.create_access_token": measure(
+            lambda: User.create_access_token({"sub": "123e4567-e89b-12d3-a456-426614174000"}), jwt_iterations
+        ),
+        "auth.verify_token": measure(lambda: User.verify_token(next(fresh)), jwt_iterations, warmup=3),
+        "auth.verify_token_cached": measure(lambda: User.verify_token(token), jwt_iterations),
+    }
+
+
+SUITES = {
+    "operations": operations_suite,
+    "asgi": asgi_suite,
+    "websocket": websocket_suite,
+    "auth": auth_suite,
+}
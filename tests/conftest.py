@@ -10,8 +10,15 @@ import requests
 from faker import Faker
 from playwright.sync_api import sync_playwright, Browser, Page
 from sqlalchemy.orm import Session
-
-from app.database import Base, get_engine, get_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import rate_limit
+from app.auth.login_throttle import login_throttle
+from app.auth.principal_cache import principal_cache
+from app.auth.token_cache import token_cache
+from app.database import (
+    Base, get_async_db, get_async_engine, get_async_sessionmaker, get_engine, get_sessionmaker
+)
 from app.models.user import User
 from app.config import settings
 from app.database_init import init_db, drop_db
@@ -29,6 +36,10 @@ logger.info(f"Using database URL: {settings.DATABASE_URL}")
 
 test_engine = get_engine(database_url=settings.DATABASE_URL)
 TestingSessionLocal = get_sessionmaker(engine=test_engine)
+# TestClient runs each request on a new event loop, and pooled asyncpg
+# connections cannot move between loops.
+test_async_engine = get_async_engine(database_url=settings.DATABASE_URL, poolclass=NullPool)
+TestingAsyncSessionLocal = get_async_sessionmaker(engine=test_async_engine)
 
 
 def create_fake_user() -> Dict[str, str]:
@@ -89,6 +100,17 @@ def setup_test_database(request):
         logger.info("Dropped test database tables.")
 
 
+@pytest.fixture(scope="session", autouse=True)
+def bcrypt_calibration_file(tmp_path_factory):
+    """Keep the app's bcrypt calibration (and the test server's) out of the shared temp directory."""
+    path = str(tmp_path_factory.mktemp("bcrypt") / "rounds")
+    patch = pytest.MonkeyPatch()
+    patch.setattr(settings, "BCRYPT_CALIBRATION_FILE", path)
+    patch.setenv("BCRYPT_CALIBRATION_FILE", path)
+    yield path
+    patch.undo()
+
+
 @pytest.fixture(scope="session")
 def fastapi_server():
     server_url = "http://127.0.0.1:8000/"
@@ -122,6 +144,43 @@ def fastapi_server():
             process.kill()
 
 
+@pytest.fixture(autouse=True)
+def clear_auth_caches():
+    """Tests reuse user ids and tokens; never let one test see another's cached auth."""
+    principal_cache.clear()
+    token_cache.clear()
+    login_throttle.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """All TestClient requests share one client address; start every test with full buckets."""
+    rate_limit.reset()
+    yield
+
+
+@pytest.fixture
+def admin_headers(monkeypatch):
+    """Enable the admin-only routes and return headers that pass ``require_admin_key``."""
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "admin-secret")
+    return {"X-Admin-Key": "admin-secret"}
+
+
+@pytest.fixture
+def async_db_override():
+    """Serve ``get_async_db`` from unpooled connections for TestClient requests."""
+    from main import app
+
+    async def get_test_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = get_test_async_db
+    yield
+    app.dependency_overrides.pop(get_async_db, None)
+
+
 @pytest.fixture
 def db_session(request) -> Generator[Session, None, None]:
     session = TestingSessionLocal()
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth.dependencies import get_current_user_async
+from app.models.user import User
+from tests.conftest import TestingAsyncSessionLocal
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_register_and_authenticate_on_async_session(db_session, fake_user_data):
+    fake_user_data["password"] = "SecurePass123"
+
+    async def scenario():
+        async with TestingAsyncSessionLocal() as db:
+            user = await User.register_async(db, fake_user_data)
+            await db.commit()
+        async with TestingAsyncSessionLocal() as db:
+            token = await User.authenticate_async(db, fake_user_data["email"].upper(), "SecurePass123")
+            rejected = await User.authenticate_async(db, fake_user_data["username"], "WrongPass123")
+        return user, token, rejected
+
+    user, token, rejected = run(scenario())
+    assert token["user"]["id"] == user.id
+    assert rejected is None
+
+    stored = db_session.get(User, user.id)
+    assert stored.last_login is not None
+    assert stored.verify_password("SecurePass123")
+
+
+def test_authenticate_async_still_accepts_a_sync_session(db_session, fake_user_data):
+    fake_user_data["password"] = "SecurePass123"
+    User.register(db_session, fake_user_data)
+    db_session.commit()
+
+    token = run(User.authenticate_async(db_session, fake_user_data["username"], "SecurePass123"))
+    assert token["token_type"] == "bearer"
+
+
+def test_get_current_user_async(db_session, test_user):
+    token = User.create_access_token({"sub": str(test_user.id)})
+
+    async def scenario():
+        async with TestingAsyncSessionLocal() as db:
+            return await get_current_user_async(db=db, token=token)
+
+    assert run(scenario()).id == test_user.id
+
+    with pytest.raises(HTTPException) as exc_info:
+        run(get_current_user_async(db=None, token="not-a-token"))
+    assert exc_info.value.status_code == 401
@@ -0,0 +1,135 @@
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from jose import jwt
+from passlib.hash import bcrypt
+
+from app.auth.hashing import HashingSaturatedError, configure_bcrypt, hashing_pool
+from app.auth.login_throttle import login_throttle
+from app.config import settings
+from app.models.user import ALGORITHM, SECRET_KEY, User, pwd_context
+from app.rate_limit import login_rate_limit
+from main import app
+
+
+@pytest.fixture
+def client(async_db_override):
+    return TestClient(app)
+
+
+def test_register_then_login(client, db_session, fake_user_data):
+    fake_user_data["password"] = "SecurePass123"
+    response = client.post("/register", json=fake_user_data)
+    assert response.status_code == 201
+    assert response.json()["username"] == fake_user_data["username"]
+
+    duplicate = client.post("/register", json=fake_user_data)
+    assert duplicate.status_code == 400
+
+    response = client.post("/login", json={"username": fake_user_data["email"], "password": "SecurePass123"})
+    assert response.status_code == 200
+    assert response.json()["token_type"] == "bearer"
+
+    response = client.post("/login", json={"username": fake_user_data["username"], "password": "WrongPass123"})
+    assert response.status_code == 401
+
+
+def test_login_fails_fast_when_hashing_is_saturated(client, db_session, test_user, monkeypatch, admin_headers):
+    async def saturated(*args):
+        raise HashingSaturatedError("Password hashing is saturated, retry later")
+
+    monkeypatch.setattr(hashing_pool, "run", saturated)
+    response = client.post("/login", json={"username": test_user.username, "password": "whatever1A"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert client.get("/auth/hashing/stats", headers=admin_headers).json()["workers"] == hashing_pool.workers
+
+
+def test_login_rehashes_outdated_cost(client, db_session, test_user):
+    saved = pwd_context.to_dict()
+    try:
+        configure_bcrypt(pwd_context, rounds=5)
+        test_user.password_hash = bcrypt.using(rounds=4).hash("SecurePass123")
+        db_session.commit()
+
+        assert client.post("/login", json={"username": test_user.username, "password": "SecurePass123"}).status_code == 200
+        db_session.refresh(test_user)
+        assert test_user.password_hash.startswith("$2b$05$")
+        assert User.authenticate(db_session, test_user.username, "SecurePass123") is not None
+    finally:
+        pwd_context.load(saved)
+
+
+def test_logout_revokes_token(client, admin_headers):
+    token = User.create_access_token({"sub": str(uuid.uuid4())})
+    assert client.post("/logout", headers={"Authorization": f"Bearer {token}"}).status_code == 204
+    assert User.verify_token(token) is None
+    assert client.get("/auth/tokens/stats", headers=admin_headers).json()["revoked"] >= 1
+
+
+def test_logout_rejects_forged_and_non_expiring_tokens(client, admin_headers):
+    user_id = str(uuid.uuid4())
+    forged = jwt.encode({"sub": user_id, "exp": time.time() + 600}, "some-other-key", algorithm="HS256")
+    no_exp = jwt.encode({"sub": user_id}, SECRET_KEY, algorithm=ALGORITHM)
+    for token in (forged, no_exp, "not-a-token"):
+        response = client.post("/logout", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 401
+    assert client.get("/auth/tokens/stats", headers=admin_headers).json()["revoked"] == 0
+
+
+def test_login_is_rate_limited_before_hashing(client, monkeypatch):
+    monkeypatch.setattr(login_rate_limit, "burst", 1)
+    monkeypatch.setattr(login_rate_limit, "rate", 0.001)
+    credentials = {"username": "nobody", "password": "whatever1A"}
+    assert client.post("/login", json=credentials).status_code == 401
+    completed = hashing_pool.stats()["completed"]
+    response = client.post("/login", json=credentials)
+    assert response.status_code == 429
+    assert "retry-after" in response.headers
+    assert hashing_pool.stats()["completed"] == completed
+
+
+def test_failed_logins_lock_the_account_before_bcrypt(client, test_user, monkeypatch, admin_headers):
+    monkeypatch.setattr(login_throttle, "max_account_failures", 2)
+    wrong = {"username": test_user.username, "password": "WrongPass123"}
+    for _ in range(2):
+        assert client.post("/login", json=wrong).status_code == 401
+
+    verified = hashing_pool.stats()["completed"]
+    response = client.post("/login", json=wrong)
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    # The email names the same account, in any case.
+    response = client.post("/login", json={"username": test_user.email.upper(), "password": "WrongPass123"})
+    assert response.status_code == 429
+    assert hashing_pool.stats()["completed"] == verified
+
+    stats = client.get("/auth/login-throttle/stats", headers=admin_headers).json()
+    assert stats["failures"] == 2
+    assert stats["verifications_avoided"] == 2
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/auth/hashing/stats",
+        "/auth/tokens/stats",
+        "/auth/principals/stats",
+        "/auth/login-throttle/stats",
+        "/auth/last-login/stats",
+        "/db/pool/stats",
+        "/db/replicas/stats",
+        "/rate-limit/stats",
+        "/evaluate/stats",
+        "/cache/stats",
+        "/history/stats",
+    ],
+)
+def test_stats_routes_require_the_admin_key(client, path, admin_headers, monkeypatch):
+    assert client.get(path, headers=admin_headers).status_code == 200
+    assert client.get(path, headers={"X-Admin-Key": "wrong"}).status_code == 403
+    assert client.get(path).status_code == 403
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "")
+    assert client.get(path, headers=admin_headers).status_code == 404
@@ -0,0 +1,71 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth.hashing import configure_bcrypt, shutdown_process_pool
+from app.config import settings
+from app.models.user import User, pwd_context
+from main import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "admin-secret")
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def cheap_hashing():
+    saved = pwd_context.to_dict()
+    configure_bcrypt(pwd_context, rounds=4)
+    yield
+    pwd_context.load(saved)
+    shutdown_process_pool()
+
+
+def row(n, **overrides):
+    data = {
+        "first_name": "Bulk",
+        "last_name": f"User{n}",
+        "email": f"bulk{n}@example.com",
+        "username": f"bulkuser{n}",
+        "password": "SecurePass123",
+    }
+    data.update(overrides)
+    return data
+
+
+def test_register_many_reports_per_row(db_session, test_user):
+    rows = [row(n) for n in range(40)] + [
+        row(40, email="not-an-email"),
+        row(41, email="BULK0@example.com"),
+        row(42, username=test_user.username.upper()),
+        "not an object",
+    ]
+    report = User.register_many(db_session, rows)
+    db_session.commit()
+
+    assert [entry["index"] for entry in report["created"]] == list(range(40))
+    assert {entry["index"]: entry["error"] for entry in report["errors"]} == {
+        40: report["errors"][0]["error"],
+        41: "Duplicate username or email in batch",
+        42: "Username or email already exists",
+        43: "Input should be a valid dictionary or object to extract fields from",
+    }
+    assert report["errors"][0]["error"].startswith("email:")
+    created = db_session.get(User, report["created"][39]["id"])
+    assert created.verify_password("SecurePass123")
+    assert created.password_hash.startswith("$2b$04$")
+
+    again = User.register_many(db_session, [row(0)])
+    assert again == {"created": [], "errors": [{"index": 0, "error": "Username or email already exists"}]}
+
+
+def test_bulk_endpoint_requires_admin_key(client, db_session, monkeypatch):
+    assert client.post("/admin/users/bulk", json=[row(100)]).status_code == 403
+    assert client.post("/admin/users/bulk", json=[row(100)], headers={"X-Admin-Key": "wrong"}).status_code == 403
+    response = client.post("/admin/users/bulk", json=[row(100)], headers={"X-Admin-Key": "admin-secret"})
+    assert response.status_code == 200
+    assert len(response.json()["created"]) == 1
+
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "")
+    assert client.post("/admin/users/bulk", json=[row(101)]).status_code == 404
@@ -0,0 +1,76 @@
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.models.calculation import Calculation
+from app.operations.history import HistoryWriter, history_writer
+from app.models.user import User
+from main import app
+
+
+@pytest.fixture
+def calculations():
+    """Yields a session and empties the calculations table afterwards."""
+    history_writer.stop()  # flush rows queued by other tests' route calls
+    session = SessionLocal()
+    session.query(Calculation).delete()
+    session.commit()
+    yield session
+    session.query(Calculation).delete()
+    session.commit()
+    session.close()
+
+
+@pytest.mark.parametrize("method", ["executemany", "copy"])
+def test_writer_flushes_in_batches(calculations, method):
+    writer = HistoryWriter(flush_interval=60.0, max_batch=10, max_queue=100, method=method)
+    writer.start()
+    user_id = uuid.uuid4()
+    for i in range(25):
+        assert writer.record("divide", float(i), 0.0 if i == 3 else 2.0, None if i == 3 else i / 2, user_id)
+    writer.stop()
+
+    assert writer.stats() == {"written": 25, "dropped": 0, "failed": 0, "flushes": 3, "queued": 0}
+    rows = calculations.query(Calculation).order_by(Calculation.a).all()
+    assert len(rows) == 25
+    assert rows[3].result is None
+    assert rows[4].result == 2.0
+    assert {row.user_id for row in rows} == {user_id}
+
+
+def test_writer_flushes_on_interval(calculations):
+    writer = HistoryWriter(flush_interval=0.05, max_batch=1000, max_queue=100)
+    writer.start()
+    writer.record("add", 1.0, 2.0, 3.0)
+    for _ in range(100):
+        if writer.stats()["written"]:
+            break
+        time.sleep(0.02)
+    assert writer.stats()["written"] == 1
+    writer.stop()
+
+
+def test_writer_drops_when_queue_is_full(calculations):
+    writer = HistoryWriter(max_queue=2)
+    assert writer.record("add", 1.0, 1.0, 2.0)
+    assert writer.record("add", 2.0, 2.0, 4.0)
+    assert not writer.record("add", 3.0, 3.0, 6.0)
+    assert writer.stats()["dropped"] == 1
+    writer.stop()
+    assert calculations.query(Calculation).count() == 2
+
+
+def test_calculator_routes_record_history(calculations):
+    user_id = uuid.uuid4()
+    token = User.create_access_token({"sub": str(user_id)})
+    with TestClient(app) as client:
+        client.post("/multiply", json={"a": 6, "b": 7}, headers={"Authorization": f"Bearer {token}"})
+        client.post("/divide", json={"a": 1, "b": 0})
+    rows = calculations.query(Calculation).order_by(Calculation.op).all()
+    assert [(row.op, row.result, row.user_id) for row in rows] == [
+        ("divide", None, None),
+        ("multiply", 42.0, user_id),
+    ]
@@ -0,0 +1,251 @@
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.models.user import User
+from app.operations import wire
+from app.rate_limit import calculator_rate_limit
+from main import app
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "path, a, b, expected",
+    [
+        ("/add", 2, 3, 5),
+        ("/subtract", 5, 3, 2),
+        ("/multiply", 2.5, 4, 10),
+        ("/divide", 6, 3, 2),
+    ],
+)
+def test_scalar_routes(client, path, a, b, expected):
+    response = client.post(path, json={"a": a, "b": b})
+    assert response.status_code == 200
+    assert response.json() == {"result": expected}
+
+
+@pytest.mark.parametrize(
+    "path, a, b",
+    [("/add", 1.7e308, 1.7e308), ("/subtract", -1.7e308, 1.7e308), ("/multiply", 1e308, 10), ("/divide", 1e308, 0.1)],
+)
+def test_scalar_route_overflow_is_null(client, path, a, b):
+    for _ in range(2):  # computed, then served from the result cache
+        response = client.post(path, json={"a": a, "b": b})
+        assert response.status_code == 200
+        assert response.json() == {"result": None}
+
+
+def test_divide_by_zero_route(client):
+    response = client.post("/divide", json={"a": 1, "b": 0})
+    assert response.status_code == 400
+    assert response.json() == {"error": "Cannot divide by zero!"}
+
+
+def test_batch_route(client):
+    response = client.post("/batch", json={"op": "add", "a": [1, 2, 3], "b": [4, 5, 6]})
+    assert response.status_code == 200
+    assert response.json() == {"op": "add", "count": 3, "result": [5.0, 7.0, 9.0]}
+
+
+def test_batch_route_large_payload(client):
+    n = 100_000
+    response = client.post("/batch", json={"op": "multiply", "a": list(range(n)), "b": [2] * n})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == n
+    assert body["result"][-1] == 2.0 * (n - 1)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"op": "divide", "a": [1, 2], "b": [1, 0]},
+        {"op": "add", "a": [1, 2], "b": [1]},
+    ],
+    ids=["zero_divisor", "length_mismatch"],
+)
+def test_batch_route_errors(client, payload):
+    response = client.post("/batch", json=payload)
+    assert response.status_code == 400
+    assert "error" in response.json()
+
+
+def test_batch_route_rejects_unknown_op(client):
+    response = client.post("/batch", json={"op": "power", "a": [1], "b": [1]})
+    assert response.status_code == 422
+
+
+def test_reduce_route(client):
+    response = client.post("/reduce", json={"op": "sum", "values": [0.1] * 10, "method": "kahan"})
+    assert response.status_code == 200
+    assert response.json() == {"op": "sum", "count": 10, "result": 1.0}
+    response = client.post("/reduce", json={"op": "dot", "values": [1, 2, 3], "b": [4, 5, 6]})
+    assert response.json()["result"] == 32.0
+
+
+def test_reduce_route_overflow_is_null(client):
+    response = client.post("/reduce", json={"op": "sum", "values": [1e308, 1e308], "method": "kahan"})
+    assert response.status_code == 200
+    assert response.json() == {"op": "sum", "count": 2, "result": None}
+
+
+@pytest.mark.parametrize(
+    "payload, status",
+    [
+        ({"op": "mean", "values": []}, 400),
+        ({"op": "dot", "values": [1, 2]}, 400),
+        ({"op": "median", "values": [1, 2]}, 422),
+    ],
+    ids=["empty_mean", "dot_missing_b", "unknown_op"],
+)
+def test_reduce_route_errors(client, payload, status):
+    assert client.post("/reduce", json=payload).status_code == status
+
+
+def test_evaluate_route(client):
+    response = client.post(
+        "/evaluate",
+        json={"expression": "(a + b) * c / d", "variables": {"a": [1, 2], "b": 2, "c": 4, "d": 3}},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"result": pytest.approx([4.0, 16 / 3])}
+
+
+def test_evaluate_route_errors(client):
+    response = client.post("/evaluate", json={"expression": "a / 0", "variables": {"a": 1}})
+    assert response.status_code == 400
+    assert response.json() == {"error": "Cannot divide by zero!"}
+
+
+def test_evaluate_route_overflow_is_null(client):
+    response = client.post("/evaluate", json={"expression": "a * b", "variables": {"a": 1e308, "b": 10}})
+    assert response.status_code == 200
+    assert response.json() == {"result": None}
+    response = client.post("/evaluate", json={"expression": "a * b", "variables": {"a": [1e308, 2], "b": 10}})
+    assert response.json() == {"result": [None, 20.0]}
+
+
+def test_evaluate_stats_route(client, admin_headers):
+    before = client.get("/evaluate/stats", headers=admin_headers).json()
+    client.post("/evaluate", json={"expression": "1 + 41"})
+    client.post("/evaluate", json={"expression": "1 + 41"})
+    after = client.get("/evaluate/stats", headers=admin_headers).json()
+    assert after["hits"] - before["hits"] >= 1
+    assert set(after) == {"size", "maxsize", "hits", "misses"}
+
+
+def test_stream_route(client):
+    def body():
+        for i in range(1000):
+            yield f'{{"op": "multiply", "a": {i}, "b": 2}}\n'.encode()
+        yield b'{"op": "divide", "a": 1, "b": 0}\n'
+
+    response = client.post("/stream", content=body())
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 1001
+    assert lines[999] == {"line": 1000, "result": 1998}
+    assert lines[1000] == {"line": 1001, "error": "Cannot divide by zero!"}
+
+
+def test_cache_stats_route(client, admin_headers):
+    client.post("/add", json={"a": 123, "b": 456})
+    client.post("/add", json={"a": 123, "b": 456})
+    stats = client.get("/cache/stats", headers=admin_headers).json()
+    assert stats["add"]["hits"] >= 1
+    assert 0.0 < stats["add"]["hit_ratio"] <= 1.0
+
+
+def test_batch_route_masked_divide(client):
+    response = client.post(
+        "/batch", json={"op": "divide", "a": [4, 1, 9], "b": [2, 0, 3], "on_zero": "null"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"op": "divide", "count": 3, "result": [2.0, None, 3.0], "errors": [1]}
+
+
+def test_batch_route_binary_format(client):
+    response = client.post(
+        "/batch",
+        content=wire.encode_request("divide", [4.0, 1.0, 9.0], [2.0, 0.0, 3.0], on_zero="nan"),
+        headers={"Content-Type": wire.CONTENT_TYPE, "Accept": wire.CONTENT_TYPE},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == wire.CONTENT_TYPE
+    values, valid = wire.decode_response(response.content)
+    assert values[[0, 2]].tolist() == [2.0, 3.0]
+    assert valid.tolist() == [True, False, True]
+
+
+def test_batch_route_binary_request_json_response(client):
+    response = client.post(
+        "/batch",
+        content=wire.encode_request("add", [1.0, 2.0], [3.0, 4.0]),
+        headers={"Content-Type": wire.CONTENT_TYPE},
+    )
+    assert response.json() == {"op": "add", "count": 2, "result": [4.0, 6.0]}
+
+
+def test_batch_route_malformed_binary(client):
+    response = client.post("/batch", content=b"CALC", headers={"Content-Type": wire.CONTENT_TYPE})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("path", ["/", "/index.html"])
+def test_pages_are_precompressed_and_revalidated(client, path):
+    response = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "<h1>Hello World</h1>" in response.text
+    assert "<!--" not in response.text
+
+    cached = client.get(path, headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+
+
+def test_ws_calc_pipelines_frames(client):
+    with client.websocket_connect("/ws/calc") as ws:
+        for i in range(100):
+            ws.send_json({"id": i, "op": "add", "a": i, "b": 1})
+        ws.send_json([{"id": "b1", "op": "multiply", "a": 2, "b": 3}, {"id": "b2", "op": "divide", "a": 1, "b": 0}])
+        ws.send_bytes(json.dumps({"id": "raw", "op": "subtract", "a": 5, "b": 3}).encode())
+        assert [ws.receive_json()["result"] for _ in range(100)] == [i + 1 for i in range(100)]
+        assert ws.receive_json() == [
+            {"id": "b1", "result": 6},
+            {"id": "b2", "error": "Cannot divide by zero!"},
+        ]
+        assert ws.receive_json() == {"id": "raw", "result": 2}
+
+
+def test_db_pool_stats(client, admin_headers):
+    response = client.get("/db/pool/stats", headers=admin_headers)
+    assert response.status_code == 200
+    stats = response.json()["sync"]
+    assert stats["size"] == settings.DB_POOL_SIZE
+    assert {"checked_out", "overflow", "timeouts", "invalidations", "wait_ms_max"} <= set(stats)
+
+
+def test_rate_limit_per_client_and_route(client, monkeypatch, admin_headers):
+    monkeypatch.setattr(calculator_rate_limit, "burst", 2)
+    monkeypatch.setattr(calculator_rate_limit, "rate", 0.001)
+    for _ in range(2):
+        assert client.post("/divide", json={"a": 1, "b": 2}).status_code == 200
+    limited = client.post("/divide", json={"a": 1, "b": 2})
+    assert limited.status_code == 429
+    assert int(limited.headers["retry-after"]) >= 1
+
+    # Another route, and an authenticated user, have buckets of their own.
+    assert client.post("/add", json={"a": 1, "b": 2}).status_code == 200
+    token = User.create_access_token({"sub": str(uuid.uuid4())})
+    response = client.post("/divide", json={"a": 1, "b": 2}, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+
+    assert client.get("/rate-limit/stats", headers=admin_headers).json()["scopes"]["/divide"] == {"allowed": 3, "limited": 1}
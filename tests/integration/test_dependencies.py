@@ -4,6 +4,7 @@ from fastapi import HTTPException, status
 from app.auth.dependencies import get_current_user, get_current_active_user
 from app.schemas.user import UserResponse
 from app.models.user import User
+from app.query_tracker import track_queries
 from uuid import uuid4
 from datetime import datetime
 
@@ -109,4 +110,25 @@ def test_get_current_active_user_inactive(mock_db, mock_verify_token):
         get_current_active_user(current_user=current_user)
 
     assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
-    assert exc_info.value.detail == "Inactive user"
\ No newline at end of file
+    assert exc_info.value.detail == "Inactive user"
+
+def test_get_current_user_is_cached_until_user_changes(db_session, test_user):
+    token = User.create_access_token({"sub": str(test_user.id)})
+    db = MagicMock(wraps=db_session)
+
+    assert get_current_user(db=db, token=token).first_name == test_user.first_name
+    assert get_current_user(db=db, token=token).first_name == test_user.first_name
+    assert db.query.call_count == 1
+
+    test_user.first_name = "Renamed"
+    db_session.commit()
+    assert get_current_user(db=db, token=token).first_name == "Renamed"
+    assert db.query.call_count == 2
+
+
+def test_get_current_user_queries_once_per_user(db_session, test_user):
+    token = User.create_access_token({"sub": str(test_user.id)})
+    with track_queries() as log:
+        get_current_user(db=db_session, token=token)
+        get_current_user(db=db_session, token=token)
+    assert log.count == 1
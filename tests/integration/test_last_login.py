@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.auth.last_login import LastLoginBuffer
+from app.models import user as user_module
+from app.models.user import User
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    buffer = LastLoginBuffer(flush_interval=60)
+    buffer.start()
+    monkeypatch.setattr(user_module, "last_login_buffer", buffer)
+    yield buffer
+    buffer.stop()
+
+
+def test_flush_keeps_latest_time_per_user(db_session, seed_users, buffer):
+    first, second = seed_users[:2]
+    t0 = datetime(2024, 1, 1, 12, 0)
+    buffer.record(first.id, t0 + timedelta(minutes=5))
+    buffer.record(first.id, t0)
+    buffer.record(second.id, t0)
+    assert buffer.stats()["pending"] == 2
+    assert buffer.flush() == 2
+
+    # An older time never overwrites a newer one.
+    buffer.record(first.id, t0 - timedelta(days=1))
+    buffer.flush()
+    db_session.expire_all()
+    assert (first.last_login, second.last_login) == (t0 + timedelta(minutes=5), t0)
+    assert buffer.stats()["coalesced"] == 1
+
+
+def test_authenticate_defers_last_login(db_session, test_user, buffer):
+    test_user.password = "SecurePass123"
+    db_session.commit()
+
+    assert User.authenticate(db_session, test_user.username, "SecurePass123") is not None
+    assert buffer.stats()["pending"] == 1
+    db_session.expire_all()
+    assert test_user.last_login is None
+
+    buffer.stop()
+    db_session.expire_all()
+    assert test_user.last_login is not None
+
+
+def test_authenticate_writes_directly_when_buffer_is_stopped(db_session, test_user):
+    test_user.password = "SecurePass123"
+    db_session.commit()
+    assert User.authenticate(db_session, test_user.username, "SecurePass123") is not None
+    db_session.expire_all()
+    assert test_user.last_login is not None
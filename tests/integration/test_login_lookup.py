@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.models.user import User
+from app.query_tracker import track_queries
+
+
+def explain(db_session, statement) -> str:
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = "\n".join(row[0] for row in db_session.execute(text(f"EXPLAIN {sql}")))
+    db_session.rollback()
+    return plan
+
+
+@pytest.mark.parametrize(
+    "identifier, by_email, index",
+    [
+        ("Someone@Example.com", True, "ix_users_lower_email"),
+        ("SomeUser", False, "ix_users_lower_username"),
+    ],
+    ids=["email", "username"],
+)
+def test_login_lookup_uses_one_functional_index(db_session, identifier, by_email, index):
+    plan = explain(db_session, User._login_statement(identifier, by_email))
+    assert index in plan, plan
+    assert "BitmapOr" not in plan, plan
+
+
+def test_login_lookup_is_case_insensitive(db_session, test_user):
+    assert User._find_for_login(db_session, test_user.email.upper()).id == test_user.id
+    assert User._find_for_login(db_session, test_user.username.upper()).id == test_user.id
+    assert User._find_for_login(db_session, "nobody@example.com") is None
+
+
+def test_failed_email_login_is_one_query(db_session, test_user):
+    with track_queries() as log:
+        assert User._find_for_login(db_session, "nobody@example.com") is None
+        assert User._find_for_login(db_session, test_user.email) is not None
+    assert log.count == 2, log.statements
+
+
+def test_case_variants_resolve_deterministically(db_session):
+    for days, spelling in enumerate(("caseUSER", "CASEUSER", "CaseUser")):
+        db_session.add(User(
+            first_name="Case", last_name="User", email=f"{spelling}@example.com",
+            username=spelling, password_hash="x", created_at=datetime(2024, 1, 1) + timedelta(days=days),
+        ))
+    db_session.commit()
+    # Exact spelling first, otherwise the oldest account.
+    assert User._find_for_login(db_session, "CaseUser").username == "CaseUser"
+    assert User._find_for_login(db_session, "caseuser").username == "caseUSER"
+    assert User._find_for_login(db_session, "CASEuser@example.com").email == "caseUSER@example.com"
+
+
+def test_authenticate_query_count(db_session, fake_user_data):
+    fake_user_data["password"] = "SecurePass123"
+    User.register(db_session, fake_user_data)
+    db_session.commit()
+
+    with track_queries() as log:
+        assert User.authenticate(db_session, fake_user_data["username"], "SecurePass123") is not None
+    # Lookup, last_login update, and the reload of the row expired by the commit.
+    assert log.count == 3, log.statements
+    assert log.repeated(threshold=2) == []
@@ -23,6 +23,16 @@ def test_user_base_invalid_email():
     with pytest.raises(ValidationError):
         UserBase(**data)
 
+def test_user_base_username_cannot_contain_at_sign():
+    data = {
+        "first_name": "John",
+        "last_name": "Doe",
+        "email": "john.doe@example.com",
+        "username": "john@doe",
+    }
+    with pytest.raises(ValidationError):
+        UserBase(**data)
+
 def test_password_mixin_valid():
     data = {"password": "SecurePass123"}
     password_mixin = PasswordMixin(**data)
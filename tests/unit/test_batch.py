@@ -0,0 +1,128 @@
+# tests/unit/test_batch.py
+
+from array import array
+
+import numpy as np
+import pytest
+
+from app.operations import (
+    batch_add,
+    batch_subtract,
+    batch_multiply,
+    batch_divide,
+    divide_masked,
+    compute_batch,
+)
+from app.operations.batch import as_array, to_json_column
+
+
+# ---------------------------------------------
+# Input Conversion
+# ---------------------------------------------
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [1, 2, 3],
+        (1.0, 2.0, 3.0),
+        array("d", [1.0, 2.0, 3.0]),
+        array("i", [1, 2, 3]),
+        np.array([1, 2, 3], dtype=np.int64),
+    ],
+    ids=["list", "tuple", "array_double", "array_int", "numpy_int"],
+)
+def test_as_array_accepts_supported_inputs(values) -> None:
+    """Every supported column type converts to the same float64 array."""
+    result = as_array(values)
+    assert result.dtype == np.float64
+    assert result.tolist() == [1.0, 2.0, 3.0]
+
+
+def test_as_array_wraps_double_buffers_without_copy() -> None:
+    """An array('d') column is viewed in place rather than copied."""
+    values = array("d", [1.0, 2.0])
+    result = as_array(values)
+    values[0] = 9.0
+    assert result[0] == 9.0
+
+
+@pytest.mark.parametrize(
+    "values",
+    [["a", "b"], [[1, 2], [3, 4]], array("u", "ab")],
+    ids=["strings", "two_dimensional", "unicode_array"],
+)
+def test_as_array_rejects_invalid_inputs(values) -> None:
+    with pytest.raises(ValueError):
+        as_array(values)
+
+
+# ---------------------------------------------
+# Batch Operations
+# ---------------------------------------------
+
+@pytest.mark.parametrize(
+    "func, a, b, expected",
+    [
+        (batch_add, [2, -2, 2.5], [3, -3, 3.5], [5.0, -5.0, 6.0]),
+        (batch_subtract, [5, -5, 5.5], [3, -3, 2.5], [2.0, -2.0, 3.0]),
+        (batch_multiply, [2, -2, 2.5], [3, 3, 4.0], [6.0, -6.0, 10.0]),
+        (batch_divide, [6, -6, 0], [3, 3, 5], [2.0, -2.0, 0.0]),
+        (batch_add, [1, 2, 3], 10, [11.0, 12.0, 13.0]),
+    ],
+    ids=["add", "subtract", "multiply", "divide", "broadcast_scalar"],
+)
+def test_batch_operations(func, a, b, expected) -> None:
+    assert func(a, b).tolist() == expected
+
+
+def test_batch_divide_by_zero_names_row() -> None:
+    with pytest.raises(ValueError, match=r"Cannot divide by zero! \(row 1\)"):
+        batch_divide([1, 2, 3], [1, 0, 0])
+
+
+def test_batch_length_mismatch() -> None:
+    with pytest.raises(ValueError, match="same length"):
+        batch_add([1, 2, 3], [1, 2])
+
+
+def test_compute_batch_dispatch_and_unknown_op() -> None:
+    assert compute_batch("multiply", [2], [4]).tolist() == [8.0]
+    with pytest.raises(ValueError, match="Unknown operation"):
+        compute_batch("power", [2], [4])
+
+
+# ---------------------------------------------
+# Masked Division
+# ---------------------------------------------
+
+@pytest.mark.parametrize(
+    "policy, expected",
+    [
+        ("nan", [2.0, np.nan, np.nan, 1.0]),
+        ("null", [2.0, np.nan, np.nan, 1.0]),
+        ("inf", [2.0, np.inf, np.nan, 1.0]),
+    ],
+    ids=["nan", "null", "inf"],
+)
+def test_divide_masked_policies(policy: str, expected) -> None:
+    """Zero divisors are masked in one pass instead of raising."""
+    result = divide_masked([4, 1, 0, 3], [2, 0, 0, 3], policy=policy)
+    np.testing.assert_array_equal(result.values, expected)
+    assert result.valid.tolist() == [True, False, False, True]
+    assert result.error_indices.tolist() == [1, 2]
+
+
+def test_divide_masked_fail_fast() -> None:
+    with pytest.raises(ValueError, match="Cannot divide by zero!"):
+        divide_masked([1, 2], [1, 0], policy="raise")
+    assert divide_masked([4], [2], policy="raise").values.tolist() == [2.0]
+
+
+def test_divide_masked_unknown_policy() -> None:
+    with pytest.raises(ValueError, match="Unknown division policy"):
+        divide_masked([1], [1], policy="zero")
+
+
+def test_to_json_column_replaces_non_finite_values() -> None:
+    assert to_json_column(np.array([1.0, np.nan, np.inf, -np.inf])) == [1.0, None, None, None]
+    assert to_json_column(np.array([1.0, 2.0])) == [1.0, 2.0]
@@ -0,0 +1,46 @@
+# tests/unit/test_benchmark_harness.py
+
+import pytest
+
+from tests.benchmarks.__main__ import main
+from tests.benchmarks.harness import compare, load, measure, percentile, save, summarize
+
+
+def test_percentile_nearest_rank() -> None:
+    samples = list(range(1, 101))
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 99) == 99
+    assert percentile(samples, 100) == 100
+    with pytest.raises(ValueError):
+        percentile([], 50)
+
+
+def test_summarize_reports_microseconds_and_throughput() -> None:
+    result = summarize([0.001] * 10, total_s=0.005)
+    assert result["n"] == 10
+    assert result["p50_us"] == pytest.approx(1000.0)
+    assert result["ops_per_sec"] == pytest.approx(2000.0)
+
+
+def test_measure_runs_function() -> None:
+    calls = []
+    result = measure(lambda: calls.append(1), iterations=5, warmup=2, inner=3)
+    assert len(calls) == 2 + 5 * 3
+    assert result["n"] == 5
+
+
+def test_compare_flags_only_regressions_beyond_tolerance() -> None:
+    baseline = {"fast": {"p50_us": 100.0}, "slow": {"p50_us": 100.0}, "gone": {"p50_us": 1.0}}
+    current = {"fast": {"p50_us": 105.0}, "slow": {"p50_us": 150.0}, "new": {"p50_us": 1.0}}
+    regressions = compare(baseline, current, tolerance=0.10)
+    assert [(r["benchmark"], r["metric"]) for r in regressions] == [("slow", "p50_us")]
+    assert regressions[0]["change"] == pytest.approx(0.5)
+
+
+def test_compare_command_exit_status(tmp_path) -> None:
+    baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+    save({"asgi.add": {"p50_us": 100.0, "p99_us": 200.0}}, str(baseline))
+    save({"asgi.add": {"p50_us": 101.0, "p99_us": 400.0}}, str(current))
+    assert load(str(current))["asgi.add"]["p99_us"] == 400.0
+    assert main(["compare", str(baseline), str(current)]) == 0
+    assert main(["compare", str(baseline), str(current), "--metric", "p99_us"]) == 1
@@ -0,0 +1,74 @@
+# tests/unit/test_channel.py
+
+import asyncio
+import json
+
+import pytest
+
+from app.operations.channel import answer_frame, serve_calculations
+
+
+@pytest.mark.parametrize(
+    "frame, expected",
+    [
+        ({"id": 1, "op": "add", "a": 1, "b": 2}, {"id": 1, "result": 3}),
+        ({"id": "x", "op": "divide", "a": 1, "b": 0}, {"id": "x", "error": "Cannot divide by zero!"}),
+        ({"op": "power", "a": 1, "b": 2}, {"id": None, "error": "Unknown operation: power"}),
+        ([1, {"id": 2, "op": "multiply", "a": 2, "b": 3}],
+         [{"id": None, "error": "Record must be a JSON object"}, {"id": 2, "result": 6}]),
+        ({"id": 3, "op": "multiply", "a": 1e308, "b": 10}, {"id": 3, "result": None}),
+    ],
+    ids=["single", "divide_by_zero", "unknown_op", "batch", "overflow"],
+)
+def test_answer_frame(frame, expected):
+    answer = answer_frame(json.dumps(frame))
+    assert "Infinity" not in answer
+    assert json.loads(answer) == expected
+
+
+def test_answer_frame_reports_out_of_range_integers_per_record():
+    frame = json.dumps([
+        {"id": 1, "op": "divide", "a": 10 ** 400, "b": 3},
+        {"id": 2, "op": "multiply", "a": 10 ** 300, "b": 10 ** 300},
+        {"id": 3, "op": "add", "a": 1, "b": 1},
+    ])
+    first, second, third = json.loads(answer_frame(frame))
+    assert first == {"id": 1, "error": "'a' is out of range"}
+    assert second["id"] == 2 and "error" in second
+    assert third == {"id": 3, "result": 2}
+
+
+def test_answer_frame_rejects_whole_frame():
+    assert json.loads(answer_frame("{not json")) == {"id": None, "error": "Invalid JSON"}
+    oversized = json.dumps([{"op": "add", "a": 1, "b": 1}] * 3)
+    assert json.loads(answer_frame(oversized, max_batch=2)) == {"id": None, "error": "Batch exceeds 2 operations"}
+
+
+class _StalledClient:
+    """A client that sends frames as fast as it can but never reads answers."""
+
+    def __init__(self):
+        self.received = 0
+
+    async def accept(self):
+        pass
+
+    async def receive(self):
+        self.received += 1
+        return {"type": "websocket.receive", "text": '{"op": "add", "a": 1, "b": 1}'}
+
+    async def send_text(self, text):
+        await asyncio.Event().wait()
+
+
+def test_serve_calculations_stops_reading_when_answers_back_up():
+    client = _StalledClient()
+
+    async def run():
+        task = asyncio.create_task(serve_calculations(client, max_pending=4))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+    asyncio.run(run())
+    # One frame being answered, four queued, one read and waiting to be queued.
+    assert client.received == 6
@@ -0,0 +1,78 @@
+# tests/unit/test_executor.py
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.operations import executor
+from app.operations.executor import SharedBatch, run_batch
+
+
+@pytest.fixture(scope="module")
+def process_pool():
+    """Two spawned pool processes shared by the tests in this module."""
+    original = settings.CALC_POOL_SIZE
+    settings.CALC_POOL_SIZE = 2
+    yield executor.get_pool()
+    executor.shutdown_pool()
+    settings.CALC_POOL_SIZE = original
+
+
+def compute(op, a, b, on_zero=None, threshold=1):
+    async def run():
+        async with run_batch(op, a, b, on_zero, threshold=threshold) as result:
+            return result.values.copy(), result.valid.copy()
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    "op, expected",
+    [
+        ("add", lambda a, b: a + b),
+        ("subtract", lambda a, b: a - b),
+        ("multiply", lambda a, b: a * b),
+        ("divide", lambda a, b: a / b),
+    ],
+    ids=["add", "subtract", "multiply", "divide"],
+)
+def test_offloaded_batch_matches_numpy(process_pool, op, expected) -> None:
+    a = np.arange(1, 10_001, dtype=np.float64)
+    b = np.full(10_000, 4.0)
+    values, valid = compute(op, a, b)
+    np.testing.assert_array_equal(values, expected(a, b))
+    assert valid.all()
+
+
+def test_offloaded_masked_divide(process_pool) -> None:
+    values, valid = compute("divide", [4.0, 1.0, 9.0], [2.0, 0.0, 3.0], on_zero="nan")
+    np.testing.assert_array_equal(values, [2.0, np.nan, 3.0])
+    assert valid.tolist() == [True, False, True]
+
+
+def test_offloaded_divide_by_zero_fails_fast(process_pool) -> None:
+    with pytest.raises(ValueError, match=r"Cannot divide by zero! \(row 2\)"):
+        compute("divide", [1.0, 2.0, 3.0], [1.0, 1.0, 0.0])
+
+
+def test_small_batches_stay_inline(monkeypatch) -> None:
+    monkeypatch.setattr(executor, "get_pool", lambda: pytest.fail("pool should not be used"))
+    values, _ = compute("add", [1.0, 2.0], [3.0, 4.0], threshold=100)
+    assert values.tolist() == [4.0, 6.0]
+
+
+def test_should_offload() -> None:
+    assert not executor.should_offload([1.0, 2.0], [3.0, 4.0], threshold=3)
+    assert executor.should_offload([1.0, 2.0, 3.0], 1.0, threshold=3)
+    assert not executor.should_offload([], [], threshold=0)
+
+
+def test_shared_batch_close_with_live_view() -> None:
+    """Closing while a result view is alive must not fail; the mapping is released later."""
+    block = SharedBatch(4)
+    view = block.out
+    view[:] = 1.0
+    block.close()
+    assert view.sum() == 4.0
@@ -0,0 +1,115 @@
+# tests/unit/test_expression.py
+
+import numpy as np
+import pytest
+
+from app.operations.expression import (
+    ExpressionCache,
+    ExpressionError,
+    evaluate,
+    parse_expression,
+)
+
+
+# ---------------------------------------------
+# Compilation
+# ---------------------------------------------
+
+def test_program_is_flat_postfix() -> None:
+    program = parse_expression("(a + b) * c / d")
+    assert program.instructions == (
+        ("load", "a"), ("load", "b"), ("add", None),
+        ("load", "c"), ("mul", None),
+        ("load", "d"), ("div", None),
+    )
+    assert program.variables == {"a", "b", "c", "d"}
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "1 +", "(1 + 2", "1 + 2)", "1 2", "a b", "2 ** 3", "__import__('os')", "1 ; 2", "()"],
+    ids=[
+        "empty", "dangling_operator", "unclosed_paren", "extra_paren", "adjacent_numbers",
+        "adjacent_names", "power_operator", "call", "statement_separator", "empty_parens",
+    ],
+)
+def test_invalid_expressions_are_rejected(text: str) -> None:
+    with pytest.raises(ExpressionError):
+        parse_expression(text)
+
+
+# ---------------------------------------------
+# Evaluation
+# ---------------------------------------------
+
+@pytest.mark.parametrize(
+    "text, variables, expected",
+    [
+        ("1 + 2 * 3", {}, 7.0),
+        ("(1 + 2) * 3", {}, 9.0),
+        ("10 - 4 - 3", {}, 3.0),
+        ("8 / 4 / 2", {}, 1.0),
+        ("-a * -b", {"a": 2, "b": 3}, 6.0),
+        ("-(a + b)", {"a": 2, "b": 3}, -5.0),
+        ("+a - -1.5e1", {"a": 1}, 16.0),
+        ("(a+b)*c/d", {"a": 1, "b": 2, "c": 4, "d": 3}, 4.0),
+    ],
+    ids=[
+        "precedence", "parentheses", "left_assoc_subtract", "left_assoc_divide",
+        "unary_minus", "negated_group", "unary_plus_and_exponent", "formula",
+    ],
+)
+def test_scalar_evaluation(text: str, variables: dict, expected: float) -> None:
+    assert evaluate(text, variables) == pytest.approx(expected)
+
+
+def test_array_evaluation_broadcasts_scalars() -> None:
+    result = evaluate("(a + b) * c", {"a": [1, 2, 3], "b": np.array([1, 1, 1]), "c": 2})
+    assert result.tolist() == [4.0, 6.0, 8.0]
+
+
+def test_unbound_variable() -> None:
+    with pytest.raises(ExpressionError, match="Unbound variables: b"):
+        evaluate("a + b", {"a": 1})
+
+
+@pytest.mark.parametrize(
+    "variables",
+    [{"a": 1, "b": 0}, {"a": [1, 2], "b": [1, 0]}],
+    ids=["scalar", "array"],
+)
+def test_division_by_zero(variables: dict) -> None:
+    with pytest.raises(ExpressionError, match="Cannot divide by zero!"):
+        evaluate("a / b", variables)
+
+
+# ---------------------------------------------
+# Program Cache
+# ---------------------------------------------
+
+def test_cache_counts_hits_and_misses() -> None:
+    cache = ExpressionCache(maxsize=4)
+    first = cache.get("a + 1")
+    second = cache.get("a + 1")
+    assert first is second
+    assert cache.stats() == {"size": 1, "maxsize": 4, "hits": 1, "misses": 1}
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = ExpressionCache(maxsize=2)
+    cache.get("1")
+    cache.get("2")
+    cache.get("1")
+    cache.get("3")
+    cache.get("1")
+    cache.get("2")
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 4
+    assert len(cache) == 2
+
+
+def test_cache_does_not_store_invalid_expressions() -> None:
+    cache = ExpressionCache(maxsize=2)
+    with pytest.raises(ExpressionError):
+        cache.get("1 +")
+    assert len(cache) == 0
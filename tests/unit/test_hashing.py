@@ -0,0 +1,130 @@
+# tests/unit/test_hashing.py
+
+import asyncio
+import threading
+
+import pytest
+
+from passlib.hash import bcrypt
+
+from app.auth import hashing
+from app.auth.hashing import HashingPool, HashingSaturatedError
+from app.config import settings
+from app.models.user import User, pwd_context
+
+
+def test_pool_rejects_when_saturated():
+    pool = HashingPool(workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def run():
+        first = asyncio.ensure_future(pool.run(release.wait))
+        second = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        assert pool.stats()["running"] == 1
+        assert pool.stats()["queued"] == 1
+        with pytest.raises(HashingSaturatedError):
+            await pool.run(release.wait)
+        release.set()
+        await asyncio.gather(first, second)
+
+    try:
+        asyncio.run(run())
+    finally:
+        release.set()
+        pool.shutdown()
+    stats = pool.stats()
+    assert (stats["completed"], stats["rejected"], stats["peak_queued"]) == (2, 1, 1)
+    assert (stats["running"], stats["queued"]) == (0, 0)
+
+
+def test_cancelled_queued_call_frees_its_slot():
+    pool = HashingPool(workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def run():
+        first = asyncio.ensure_future(pool.run(release.wait))
+        queued = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        await asyncio.sleep(0)
+        assert pool.stats()["queued"] == 0
+        # The slot is free again, so a new call is accepted rather than rejected.
+        third = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.gather(first, third)
+
+    try:
+        asyncio.run(run())
+    finally:
+        release.set()
+        pool.shutdown()
+    stats = pool.stats()
+    assert (stats["completed"], stats["rejected"]) == (2, 0)
+    assert (stats["running"], stats["queued"]) == (0, 0)
+
+
+def test_async_password_methods_match_sync():
+    async def run():
+        user = User()
+        await user.set_password_async("SecurePass123")
+        assert user.verify_password("SecurePass123")
+        assert await user.verify_password_async("SecurePass123")
+        assert not await user.verify_password_async("WrongPass123")
+        assert User(password_hash=await User.hash_password_async("x" * 8)).verify_password("x" * 8)
+
+    asyncio.run(run())
+
+
+@pytest.fixture
+def restore_context():
+    saved = pwd_context.to_dict()
+    yield pwd_context
+    pwd_context.load(saved)
+
+
+@pytest.mark.parametrize(
+    "probe_ms, expected",
+    [(25.0, 11), (100.0, 10), (1.0, 15)],
+    ids=["fits_target", "floor", "ceiling"],
+)
+def test_calibrate_rounds_extrapolates_probe(probe_ms, expected, monkeypatch):
+    monkeypatch.setattr(hashing, "measure_bcrypt", lambda rounds: probe_ms / 1000)
+    # 25 ms at 8 rounds -> 200 ms at 11, 400 ms at 12.
+    assert hashing.calibrate_rounds(250.0, min_rounds=10, max_rounds=15) == expected
+
+
+def test_configure_bcrypt_flags_hashes_outside_tolerance(restore_context):
+    hashing.configure_bcrypt(restore_context, rounds=5, tolerance=1)
+    assert restore_context.hash("SecurePass123").startswith("$2b$05$")
+    at_cost = {rounds: bcrypt.using(rounds=rounds).hash("SecurePass123") for rounds in (4, 5, 6, 7)}
+    assert {r: restore_context.needs_update(h) for r, h in at_cost.items()} == {4: True, 5: False, 6: False, 7: True}
+
+
+def test_workers_share_the_first_calibration(tmp_path):
+    path = str(tmp_path / "rounds")
+    assert hashing._shared_rounds(path, lambda: 11) == 11
+    assert hashing._shared_rounds(path, lambda: pytest.fail("calibrated twice")) == 11
+
+
+def test_calibration_file_depends_on_settings_and_master(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_CALIBRATION_FILE", str(tmp_path / "rounds"))
+    path = hashing.calibration_path()
+    assert path.startswith(str(tmp_path / "rounds-"))
+    monkeypatch.setattr(settings, "BCRYPT_TARGET_MS", 500.0)
+    assert hashing.calibration_path() != path
+    monkeypatch.setattr(hashing.os, "getppid", lambda: -1)
+    assert hashing.calibration_path().endswith("-1")
+
+
+def test_calibrate_bcrypt_shares_rounds_per_settings(tmp_path, monkeypatch, restore_context):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 0)
+    monkeypatch.setattr(settings, "BCRYPT_CALIBRATION_FILE", str(tmp_path / "rounds"))
+    monkeypatch.setattr(hashing, "calibrate_rounds", lambda target_ms, min_rounds, max_rounds: min_rounds)
+    monkeypatch.setattr(settings, "BCRYPT_MIN_ROUNDS", 5)
+    assert hashing.calibrate_bcrypt(restore_context) == 5
+    # New bounds mean a new file, not the cost calibrated under the old ones.
+    monkeypatch.setattr(settings, "BCRYPT_MIN_ROUNDS", 6)
+    assert hashing.calibrate_bcrypt(restore_context) == 6
+    assert len(list(tmp_path.iterdir())) == 2
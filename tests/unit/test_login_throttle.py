@@ -0,0 +1,69 @@
+import pytest
+
+from app.auth.login_throttle import LoginThrottle
+
+
+@pytest.fixture
+def throttle():
+    return LoginThrottle(max_account_failures=3, max_ip_failures=5, window=60.0, maxsize=100)
+
+
+def test_account_is_locked_after_repeated_failures(throttle):
+    for _ in range(3):
+        assert throttle.check("Alice", "10.0.0.1", now=0.0) == 0.0
+        throttle.record_failure("Alice", "10.0.0.1", now=0.0)
+
+    # Case-insensitive, like the login lookup, and from any address.
+    assert throttle.check("alice", "10.0.0.2", now=1.0) > 0
+    assert throttle.check("bob", "10.0.0.2", now=1.0) == 0.0
+    assert throttle.stats()["verifications_avoided"] == 1
+
+
+def test_linked_username_and_email_share_one_account(throttle):
+    throttle.link(42, "Alice", "alice@example.com")
+    for identifier in ("alice", "ALICE@example.com", "Alice"):
+        throttle.record_failure(identifier, "10.0.0.1", now=0.0)
+    assert throttle.check("alice@EXAMPLE.com", "10.0.0.2", now=1.0) > 0
+    throttle.record_success("alice@example.com", "10.0.0.2")
+    assert throttle.check("alice", "10.0.0.2", now=1.0) == 0.0
+    assert throttle.stats()["linked_identifiers"] == 2
+
+
+def test_sliding_window_forgets_old_failures(throttle):
+    for _ in range(6):
+        throttle.record_failure("alice", "10.0.0.1", now=50.0)
+
+    retry_after = throttle.check("alice", None, now=59.0)
+    # Next window, six failures from the previous one weigh 6 * (1 - t/60) until ...
+    assert retry_after == pytest.approx(1.0 + 30.0)
+    # ... half of it has passed: 6 * 0.5 = 3, the limit.
+    assert throttle.check("alice", None, now=60.0 + 29.5) > 0
+    assert throttle.check("alice", None, now=60.0 + 30.5) == 0.0
+    # Two windows later nothing is left.
+    assert throttle.check("alice", None, now=121.0) == 0.0
+
+
+def test_ip_limit_spans_accounts(throttle):
+    for attempt in range(5):
+        throttle.record_failure(f"user{attempt}", "10.0.0.1", now=0.0)
+    assert throttle.check("someone-else", "10.0.0.1", now=0.0) > 0
+    assert throttle.check("someone-else", "10.0.0.2", now=0.0) == 0.0
+
+
+def test_success_clears_the_account_but_not_the_ip(throttle):
+    for _ in range(3):
+        throttle.record_failure("alice", "10.0.0.1", now=0.0)
+    throttle.record_success("alice", "10.0.0.1")
+    assert throttle.check("alice", "10.0.0.9", now=0.0) == 0.0
+    assert len(throttle) == 1
+
+
+def test_expired_and_excess_entries_are_evicted():
+    throttle = LoginThrottle(max_account_failures=3, max_ip_failures=5, window=60.0, maxsize=4)
+    throttle.record_failure("alice", "10.0.0.1", now=0.0)
+    throttle.record_failure("bob", "10.0.0.2", now=0.0)
+    assert len(throttle) == 4
+    throttle.record_failure("carol", "10.0.0.3", now=1.0)
+    assert len(throttle) == 4  # capped: alice's entries went first
+    throttle.record_failure("dave", "10.0.0.4", now=200.0)
+    assert len(throttle) == 2  # the rest expired
@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.pool_monitor import InstrumentedQueuePool
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_checkouts_overflow_and_timeouts_are_counted(engine):
+    first = engine.connect()
+    second = engine.connect()  # overflow
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+
+    stats = engine.pool.stats()
+    assert stats["checked_out"] == 2
+    assert stats["overflow"] == 1
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["wait_ms_max"] >= 50
+
+    second.close()
+    first.close()
+    stats = engine.pool.stats()
+    assert stats["checked_out"] == 0
+    assert stats["peak_checked_out"] == 2
+    assert stats["peak_overflow"] == 1
+    assert stats["connects"] == 2
+
+
+def test_invalidations_are_counted(engine):
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        connection.invalidate()
+    assert engine.pool.stats()["invalidations"] == 1
+
+
+def test_monitor_survives_dispose(engine):
+    with engine.connect():
+        pass
+    monitor = engine.pool.monitor
+    engine.dispose()
+    with engine.connect():
+        pass
+    assert engine.pool.monitor is monitor
+    assert engine.pool.stats()["checkouts"] == 2
+    assert engine.pool.stats()["connects"] == 2
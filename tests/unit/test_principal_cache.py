@@ -0,0 +1,48 @@
+# tests/unit/test_principal_cache.py
+
+import uuid
+from datetime import datetime
+
+from app.auth.principal_cache import PrincipalCache
+from app.schemas.user import UserResponse
+
+
+def principal(user_id):
+    now = datetime.utcnow()
+    return UserResponse(
+        id=user_id, username="alice", email="alice@example.com", first_name="Alice", last_name="A",
+        is_active=True, is_verified=True, created_at=now, updated_at=now,
+    )
+
+
+def test_put_get_and_invalidate():
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    user_id = uuid.uuid4()
+    assert cache.get(user_id) is None
+    cache.put(user_id, principal(user_id), cache.generation)
+    assert cache.get(user_id).username == "alice"
+    cache.invalidate(user_id)
+    assert cache.get(user_id) is None
+    assert cache.stats() == {"size": 0, "maxsize": 10, "hits": 1, "misses": 2, "invalidations": 1}
+
+
+def test_put_is_dropped_after_concurrent_invalidation():
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    user_id = uuid.uuid4()
+    generation = cache.generation  # read the row ...
+    cache.invalidate(user_id)       # ... while another request updates it
+    cache.put(user_id, principal(user_id), generation)
+    assert cache.get(user_id) is None
+
+
+def test_ttl_and_size_bounds():
+    expired = PrincipalCache(maxsize=10, ttl=-1)
+    user_id = uuid.uuid4()
+    expired.put(user_id, principal(user_id), expired.generation)
+    assert expired.get(user_id) is None
+
+    small = PrincipalCache(maxsize=2, ttl=60)
+    ids = [uuid.uuid4() for _ in range(3)]
+    for user_id in ids:
+        small.put(user_id, principal(user_id), small.generation)
+    assert [small.get(user_id) is not None for user_id in ids] == [False, True, True]
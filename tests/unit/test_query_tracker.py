@@ -0,0 +1,88 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.query_tracker import QueryLog, SQLInstrumentationMiddleware, normalize, track_queries
+
+
+def test_normalize_collapses_literals_parameters_and_lists():
+    assert (
+        normalize("SELECT users.id FROM users\n WHERE users.id IN (%(id_1_1)s, %(id_1_2)s) AND name = 'o''x' LIMIT 5")
+        == "SELECT users.id FROM users WHERE users.id IN (?) AND name = ? LIMIT ?"
+    )
+    assert normalize("INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4)") == "INSERT INTO t (a, b) VALUES (?)"
+    assert normalize("SELECT x::text FROM t") == "SELECT x::text FROM t"
+
+
+def test_query_log_ranks_and_detects_repeats():
+    log = QueryLog()
+    for user_id in range(3):
+        log.add(f"SELECT * FROM calculations WHERE user_id = {user_id}", 0.001)
+    log.add("SELECT * FROM users", 0.01)
+
+    assert log.count == 4
+    assert log.slowest(1) == [("SELECT * FROM users", 1, 0.01)]
+    assert log.repeated(threshold=3) == [("SELECT * FROM calculations WHERE user_id = ?", 3)]
+    assert log.repeated(threshold=4) == []
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'queries.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_track_queries_only_counts_inside_the_block(engine):
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        with track_queries() as log:
+            connection.execute(text("SELECT 2"))
+            connection.execute(text("SELECT 3"))
+        connection.execute(text("SELECT 4"))
+    assert log.count == 2
+    assert list(log.statements) == ["SELECT ?"]
+
+
+def test_failed_statements_leave_no_state_on_the_connection(engine):
+    with engine.connect() as connection:
+        with track_queries() as log:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    connection.execute(text("SELECT * FROM missing_table"))
+                connection.rollback()
+            connection.execute(text("SELECT 1"))
+        assert not any(key.startswith("query") for key in connection.info)
+    assert log.count == 1
+    assert list(log.statements) == ["SELECT ?"]
+
+
+def make_client(engine, server_timing):
+    app = FastAPI()
+    app.add_middleware(SQLInstrumentationMiddleware, server_timing=server_timing)
+
+    @app.get("/items")
+    def items():
+        with engine.connect() as connection:
+            for item_id in range(12):
+                connection.execute(text("SELECT :id"), {"id": item_id})
+        return {}
+
+    return TestClient(app)
+
+
+def test_middleware_warns_about_repeated_statements(engine, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.query_tracker"):
+        response = make_client(engine, server_timing=False).get("/items")
+    assert "server-timing" not in response.headers
+    assert "GET /items ran the same statement 12 times" in caplog.text
+
+
+def test_middleware_adds_server_timing(engine):
+    response = make_client(engine, server_timing=True).get("/items")
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert response.headers["server-timing"].endswith('desc="12 queries"')
@@ -0,0 +1,69 @@
+# tests/unit/test_rate_limit.py
+
+import multiprocessing
+import uuid
+
+import pytest
+
+from app.rate_limit import MemoryBucketStore, SharedMemoryBucketStore
+from app.shared_memory import unlink_shared
+
+
+@pytest.fixture
+def shared_store():
+    name = f"test_rate_{uuid.uuid4().hex[:12]}"
+    store = SharedMemoryBucketStore(name, max_keys=64, ways=4)
+    yield store
+    store.close()
+    unlink_shared(name)
+
+
+def _drain_in_child(name: str) -> None:
+    store = SharedMemoryBucketStore(name, max_keys=64, ways=4)
+    for _ in range(3):
+        store.take("/divide|ip:10.0.0.1", rate=1.0, burst=3, now=1000.0)
+    store.close()
+
+
+@pytest.mark.parametrize("store_name", ["memory", "shared"])
+def test_burst_then_lazy_refill(store_name, shared_store) -> None:
+    store = MemoryBucketStore(max_keys=64) if store_name == "memory" else shared_store
+    key = "/divide|ip:10.0.0.1"
+    assert [store.take(key, rate=2.0, burst=3, now=0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert store.take(key, rate=2.0, burst=3, now=0.0) == pytest.approx(0.5)
+    assert store.take(key, rate=2.0, burst=3, now=0.25) == pytest.approx(0.25)
+    assert store.take(key, rate=2.0, burst=3, now=0.5) == 0.0
+    # Other clients are unaffected.
+    assert store.take("/divide|ip:10.0.0.2", rate=2.0, burst=3, now=0.5) == 0.0
+    # Refill never exceeds the burst.
+    assert [store.take(key, rate=2.0, burst=3, now=100.0) for _ in range(4)][-1] > 0
+
+
+def test_memory_store_evicts_idle_buckets() -> None:
+    store = MemoryBucketStore(max_keys=1000, shards=1)
+    for client in range(100):
+        store.take(f"ip:{client}", rate=1.0, burst=5, now=0.0)
+    assert len(store) == 100
+    # Each bucket is full again 1 s after its single request: all of them are idle.
+    store.take("ip:late", rate=1.0, burst=5, now=2.0)
+    assert len(store) == 1
+    assert store.evictions == 100
+
+
+def test_memory_store_caps_keys_per_shard() -> None:
+    store = MemoryBucketStore(max_keys=10, shards=1)
+    for client in range(50):
+        store.take(f"ip:{client}", rate=1.0, burst=5, now=0.0)
+    assert len(store) == 10
+    # The most recently used buckets survive.
+    assert store.take("ip:49", rate=1.0, burst=5, now=0.0) == 0.0
+    assert store.shards[0].buckets["ip:49"][0] == 3.0
+
+
+def test_shared_store_is_shared_between_processes(shared_store) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    child = ctx.Process(target=_drain_in_child, args=(shared_store._segment.name,))
+    child.start()
+    child.join(30)
+    assert child.exitcode == 0
+    assert shared_store.take("/divide|ip:10.0.0.1", rate=1.0, burst=3, now=1000.0) == pytest.approx(1.0)
@@ -0,0 +1,131 @@
+# tests/unit/test_reductions.py
+
+import math
+
+import numpy as np
+import pytest
+
+from app.operations import (
+    reduce_sum,
+    reduce_product,
+    reduce_mean,
+    reduce_min,
+    reduce_max,
+    reduce_dot,
+    compute_reduction,
+)
+from app.operations import reductions
+from app.operations.reductions import CHUNK_SIZE, LANES
+
+
+@pytest.fixture
+def large():
+    # Several chunks plus a ragged tail, with a wide dynamic range.
+    rng = np.random.default_rng(7)
+    return rng.standard_normal(3 * CHUNK_SIZE + 123) * 10.0 ** rng.integers(-8, 8, 3 * CHUNK_SIZE + 123)
+
+
+@pytest.mark.parametrize("method", ["pairwise", "kahan"])
+def test_sum_matches_exact_sum(large, method):
+    assert reduce_sum(large, method) == pytest.approx(math.fsum(large.tolist()), rel=1e-15, abs=1e-9)
+
+
+def test_kahan_sum_recovers_cancelled_terms():
+    values = [1e16, 1.0, -1e16] * 1000
+    assert reduce_sum(values, "kahan") == 1000.0
+    assert reduce_sum([0.1] * 10) == 1.0
+
+
+class _SerialPool:
+    def map(self, func, items):
+        return [func(item) for item in items]
+
+
+@pytest.mark.parametrize("method", ["pairwise", "kahan"])
+def test_sum_is_independent_of_thread_count(large, method, monkeypatch):
+    parallel = reduce_sum(large, method)
+    monkeypatch.setattr(reductions, "get_thread_pool", lambda: _SerialPool())
+    assert reduce_sum(large, method) == parallel
+
+
+@pytest.mark.parametrize("method", ["pairwise", "kahan"])
+def test_sum_overflow_is_signed_infinity(method):
+    assert reduce_sum([1e308, 1e308], method) == math.inf
+    assert reduce_sum([-1e308, -1e308], method) == -math.inf
+    # The running sum overflows but the exact sum does not.
+    assert reduce_sum([1e308, 1e308, -1e308], method) == 1e308
+    assert reduce_dot([1e200, 1.0], [1e200, 1.0], method) == math.inf
+
+
+def test_pairwise_chunk_partials_near_the_float_limit():
+    share = 9e307 / CHUNK_SIZE
+    values = np.concatenate([np.full(2 * CHUNK_SIZE, share), np.full(CHUNK_SIZE, -share)])
+    # Two chunk partials of 9e307 overflow when combined, the third brings the total back.
+    assert reduce_sum(values) == pytest.approx(9e307)
+    assert reduce_sum(values[:2 * CHUNK_SIZE]) == math.inf
+
+
+@pytest.mark.parametrize("method", ["pairwise", "kahan"])
+def test_sum_of_non_finite_values(method):
+    values = np.ones(4 * LANES + 10)
+    values[10] = math.inf
+    assert reduce_sum(values, method) == math.inf
+    values[20] = -math.inf
+    assert math.isnan(reduce_sum(values, method))
+    values[20] = math.nan
+    assert math.isnan(reduce_sum(values, method))
+
+
+@pytest.mark.parametrize(
+    "op, values, expected",
+    [
+        ("sum", [], 0.0),
+        ("sum", [1, 2, 3.5], 6.5),
+        ("product", [], 1.0),
+        ("product", [2, 3, 4], 24.0),
+        ("mean", [1, 2, 3, 4], 2.5),
+        ("min", [3, -1, 2], -1.0),
+        ("max", [3, -1, 2], 3.0),
+    ],
+    ids=["sum_empty", "sum", "product_empty", "product", "mean", "min", "max"],
+)
+def test_compute_reduction(op, values, expected):
+    assert compute_reduction(op, values) == expected
+
+
+def test_min_max_product_across_chunks(large):
+    assert reduce_min(large) == large.min()
+    assert reduce_max(large) == large.max()
+    assert reduce_product(np.full(2 * CHUNK_SIZE + 1, 1.0)) == 1.0
+    assert reduce_mean(large) == pytest.approx(math.fsum(large.tolist()) / large.size)
+
+
+@pytest.mark.parametrize("position", [0, CHUNK_SIZE + 5, 3 * CHUNK_SIZE + 1])
+def test_min_max_propagate_nan_from_any_chunk(position):
+    values = np.arange(3 * CHUNK_SIZE + 10, dtype=float)
+    values[position] = math.nan
+    assert math.isnan(reduce_min(values))
+    assert math.isnan(reduce_max(values))
+
+
+def test_dot(large):
+    assert reduce_dot([1, 2, 3], [4, 5, 6]) == 32.0
+    assert reduce_dot(large, 2.0, "kahan") == pytest.approx(2 * math.fsum(large.tolist()), rel=1e-15, abs=1e-9)
+    assert compute_reduction("dot", large, large) == pytest.approx(math.fsum((large * large).tolist()), rel=1e-14)
+
+
+@pytest.mark.parametrize(
+    "op, values, b, method",
+    [
+        ("mean", [], None, "pairwise"),
+        ("min", [], None, "pairwise"),
+        ("dot", [1, 2], None, "pairwise"),
+        ("dot", [1, 2], [1, 2, 3], "pairwise"),
+        ("sum", [1, 2], None, "naive"),
+        ("median", [1, 2], None, "pairwise"),
+    ],
+    ids=["mean_empty", "min_empty", "dot_missing_b", "dot_length", "unknown_method", "unknown_op"],
+)
+def test_compute_reduction_errors(op, values, b, method):
+    with pytest.raises(ValueError):
+        compute_reduction(op, values, b, method)
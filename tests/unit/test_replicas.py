@@ -0,0 +1,27 @@
+from unittest.mock import MagicMock
+
+from app import replicas as replicas_module
+from app.replicas import ReplicaSet
+
+
+def test_round_robin_skips_ejected_replicas_until_they_recover(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(replicas_module.time, "monotonic", lambda: clock[0])
+    first, second = MagicMock(name="first"), MagicMock(name="second")
+    replicas = ReplicaSet([first, second], eject_seconds=10)
+
+    assert [replicas.choose() for _ in range(4)] == [first, second, first, second]
+
+    replicas.eject(first)
+    assert [replicas.choose() for _ in range(2)] == [second, second]
+
+    replicas.eject(second)
+    assert replicas.choose() is None
+    assert replicas.primary_fallbacks == 1
+
+    clock[0] += 10
+    assert {replicas.choose(), replicas.choose()} == {first, second}
+
+
+def test_without_replicas_reads_use_the_primary():
+    assert ReplicaSet([], eject_seconds=10).choose() is None
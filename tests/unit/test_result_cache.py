@@ -0,0 +1,93 @@
+# tests/unit/test_result_cache.py
+
+import multiprocessing
+import uuid
+
+import pytest
+
+from app.operations import add, divide
+from app.operations.cache import MemoryBackend, ResultCache, SharedMemoryBackend
+from app.shared_memory import unlink_shared
+
+
+@pytest.fixture
+def shared_backend():
+    name = f"test_cache_{uuid.uuid4().hex[:12]}"
+    backend = SharedMemoryBackend(name, maxsize=16, ttl=60.0, ways=4)
+    yield backend
+    backend.close()
+    unlink_shared(name)
+
+
+def _store_in_child(name: str) -> None:
+    backend = SharedMemoryBackend(name, maxsize=16, ttl=60.0, ways=4)
+    backend.store(("add", 40.0, 2.0), 42.0, now=1000.0)
+    backend.close()
+
+
+# ---------------------------------------------
+# Backends
+# ---------------------------------------------
+
+@pytest.mark.parametrize("backend_name", ["memory", "shared"])
+def test_backend_hit_and_ttl_expiry(backend_name, shared_backend) -> None:
+    backend = MemoryBackend(maxsize=16, ttl=60.0) if backend_name == "memory" else shared_backend
+    key = ("add", 1.0, 2.0)
+    assert backend.lookup(key, now=0.0) == (None, False)
+    assert backend.store(key, 3.0, now=0.0) is False
+    assert backend.lookup(key, now=59.0) == (3.0, False)
+    assert backend.lookup(key, now=60.0) == (None, True)
+    assert backend.lookup(key, now=60.0) == (None, False)
+
+
+def test_memory_backend_evicts_least_recently_used() -> None:
+    backend = MemoryBackend(maxsize=2, ttl=60.0)
+    backend.store(("add", 1.0, 1.0), 2.0, now=0.0)
+    backend.store(("add", 2.0, 2.0), 4.0, now=0.0)
+    backend.lookup(("add", 1.0, 1.0), now=1.0)
+    assert backend.store(("add", 3.0, 3.0), 6.0, now=2.0) is True
+    assert backend.lookup(("add", 2.0, 2.0), now=3.0) == (None, False)
+    assert backend.lookup(("add", 1.0, 1.0), now=3.0) == (2.0, False)
+
+
+def test_shared_backend_evicts_within_a_set(shared_backend) -> None:
+    shared_backend.sets = 1  # force every key into the same set of four ways
+    for i in range(4):
+        assert shared_backend.store(("add", float(i), 0.0), float(i), now=float(i)) is False
+    shared_backend.lookup(("add", 0.0, 0.0), now=10.0)
+    assert shared_backend.store(("add", 9.0, 0.0), 9.0, now=11.0) is True
+    assert shared_backend.lookup(("add", 1.0, 0.0), now=12.0) == (None, False)
+    assert shared_backend.lookup(("add", 0.0, 0.0), now=12.0) == (0.0, False)
+
+
+def test_shared_backend_is_visible_across_processes(shared_backend) -> None:
+    name = shared_backend._segment.name
+    process = multiprocessing.get_context("spawn").Process(target=_store_in_child, args=(name,))
+    process.start()
+    process.join(timeout=30)
+    assert process.exitcode == 0
+    assert shared_backend.lookup(("add", 40.0, 2.0), now=1001.0) == (42.0, False)
+
+
+# ---------------------------------------------
+# ResultCache
+# ---------------------------------------------
+
+def test_result_cache_counts_per_operation() -> None:
+    cache = ResultCache(MemoryBackend(maxsize=1, ttl=60.0))
+    cached_add = cache.wrap("add", add)
+    assert cached_add(1.0, 2.0) == 3.0
+    assert cached_add(1.0, 2.0) == 3.0
+    assert cached_add(2.0, 2.0) == 4.0
+    assert cache.stats() == {
+        "add": {"hits": 1, "misses": 2, "evictions": 1, "expirations": 0, "hit_ratio": 1 / 3},
+    }
+
+
+def test_result_cache_does_not_cache_errors() -> None:
+    cache = ResultCache(MemoryBackend(maxsize=4, ttl=60.0))
+    cached_divide = cache.wrap("divide", divide)
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Cannot divide by zero!"):
+            cached_divide(1.0, 0.0)
+    assert cache.stats()["divide"]["hits"] == 0
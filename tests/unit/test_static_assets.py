@@ -0,0 +1,86 @@
+# tests/unit/test_static_assets.py
+
+import gzip
+import zlib
+
+import pytest
+
+from app.static_assets import AssetStore, minify_html, negotiate
+
+
+PAGE = """<!DOCTYPE html>
+<!-- a long explanatory comment -->
+<html>
+<head>
+    <style>
+        /* block comment */
+        body { margin: 0; }
+    </style>
+</head>
+<body>
+    <h1>Hi</h1>
+    <script>
+        // whole-line comment
+        fetch('http://example.com/' + op);  // trailing comment kept
+    </script>
+</body>
+</html>
+""" + "<p>filler</p>\n" * 50
+
+
+def test_minify_html_strips_comments_and_indentation():
+    minified = minify_html(PAGE)
+    assert "comment" not in minified.replace("trailing comment", "")
+    assert "fetch('http://example.com/' + op);" in minified
+    assert "\n<h1>Hi</h1>\n" in minified
+    assert not any(line != line.strip() for line in minified.splitlines())
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("", None),
+        ("gzip, deflate", "gzip"),
+        ("deflate", "deflate"),
+        ("gzip;q=0.5, deflate", "deflate"),
+        ("gzip;q=0, deflate;q=0", None),
+        ("*", "br"),
+        ("identity", None),
+    ],
+    ids=["none", "prefers_gzip", "deflate_only", "quality", "refused", "wildcard", "identity"],
+)
+def test_negotiate(header, expected, monkeypatch):
+    if expected == "br":
+        from app import static_assets
+        expected = static_assets.ENCODINGS[0]
+    assert negotiate(header) == expected
+
+
+@pytest.fixture
+def asset():
+    store = AssetStore()
+    store.add("page.html", PAGE)
+    return store["page.html"]
+
+
+def test_variants_decompress_to_the_same_body(asset):
+    identity = asset.variants[None][0]
+    assert gzip.decompress(asset.variants["gzip"][0]) == identity
+    assert zlib.decompress(asset.variants["deflate"][0]) == identity
+    assert len({headers["etag"] for _, headers in asset.variants.values()}) == len(asset.variants)
+
+
+def test_response_and_not_modified(asset):
+    response = asset.response({"accept-encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["cache-control"] == "public, max-age=300"
+    etag = response.headers["etag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+
+    cached = asset.response({"accept-encoding": "gzip", "if-none-match": etag})
+    assert cached.status_code == 304
+    assert cached.body == b""
+    assert cached.headers["etag"] == etag
+
+    assert asset.response({"if-none-match": '"stale"'}).status_code == 200
@@ -0,0 +1,104 @@
+# tests/unit/test_streaming.py
+
+import asyncio
+import json
+from typing import List
+
+import pytest
+
+from app.operations.streaming import evaluate_record, stream_calculations
+
+
+async def _chunks(parts: List[bytes]):
+    for part in parts:
+        yield part
+
+
+def run_stream(parts: List[bytes], max_line_bytes: int = 1024) -> List[dict]:
+    async def collect():
+        return [chunk async for chunk in stream_calculations(_chunks(parts), max_line_bytes)]
+
+    output = b"".join(asyncio.run(collect()))
+    return [json.loads(line) for line in output.splitlines()]
+
+
+@pytest.mark.parametrize(
+    "record, expected",
+    [
+        ({"op": "add", "a": 2, "b": 3}, 5),
+        ({"op": "subtract", "a": 5, "b": 3}, 2),
+        ({"op": "multiply", "a": 2.5, "b": 4}, 10.0),
+        ({"op": "divide", "a": 6, "b": 3}, 2.0),
+    ],
+    ids=["add", "subtract", "multiply", "divide"],
+)
+def test_evaluate_record(record: dict, expected: float) -> None:
+    assert evaluate_record(record) == expected
+
+
+@pytest.mark.parametrize(
+    "record, message",
+    [
+        ([1, 2], "Record must be a JSON object"),
+        ({"op": "power", "a": 1, "b": 2}, "Unknown operation: power"),
+        ({"op": "add", "a": "1", "b": 2}, "'a' must be a number"),
+        ({"op": "add", "a": 1, "b": True}, "'b' must be a number"),
+        ({"op": "divide", "a": 1, "b": 0}, "Cannot divide by zero!"),
+    ],
+    ids=["not_object", "unknown_op", "string_operand", "bool_operand", "zero_divisor"],
+)
+def test_evaluate_record_errors(record, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        evaluate_record(record)
+
+
+def test_records_split_across_chunks() -> None:
+    parts = [b'{"op": "add", "a": 1,', b' "b": 2}\n{"op": "mul', b'tiply", "a": 3, "b": 4}\n']
+    assert run_stream(parts) == [
+        {"line": 1, "result": 3},
+        {"line": 2, "result": 12},
+    ]
+
+
+def test_bad_lines_do_not_abort_stream() -> None:
+    parts = [b'not json\n\n{"op": "divide", "a": 1, "b": 0}\n{"op": "add", "a": 1, "b": 1}']
+    assert run_stream(parts) == [
+        {"line": 1, "error": "Invalid JSON"},
+        {"line": 3, "error": "Cannot divide by zero!"},
+        {"line": 4, "result": 2},
+    ]
+
+
+def test_non_finite_results_are_null() -> None:
+    parts = [b'{"op": "multiply", "a": 1e308, "b": 10}\n{"op": "add", "a": NaN, "b": 1}\n']
+
+    async def collect():
+        return b"".join([chunk async for chunk in stream_calculations(_chunks(parts))])
+
+    output = asyncio.run(collect())
+    assert b"Infinity" not in output and b"NaN" not in output
+    assert run_stream(parts) == [{"line": 1, "result": None}, {"line": 2, "result": None}]
+
+
+def test_out_of_range_integers_are_line_errors() -> None:
+    huge = str(10 ** 400).encode()
+    parts = [
+        b'{"op": "add", "a": 1, "b": 1}\n'
+        b'{"op": "add", "a": ' + huge + b', "b": 1}\n'
+        b'{"op": "multiply", "a": ' + str(10 ** 300).encode() + b', "b": ' + str(10 ** 300).encode() + b'}\n'
+        b'{"op": "add", "a": 2, "b": 2}\n'
+    ]
+    lines = run_stream(parts, max_line_bytes=4096)
+    assert lines[0] == {"line": 1, "result": 2}
+    assert lines[1] == {"line": 2, "error": "'a' is out of range"}
+    assert lines[2]["line"] == 3 and "error" in lines[2]
+    assert lines[3] == {"line": 4, "result": 4}
+
+
+def test_oversized_line_is_skipped_without_buffering() -> None:
+    long_line = b'{"op": "add", "a": 1, "b": 1, "pad": "' + b"x" * 100 + b'"}'
+    parts = [long_line[:60], long_line[60:], b'\n{"op": "add", "a": 2, "b": 2}\n']
+    assert run_stream(parts, max_line_bytes=50) == [
+        {"line": 1, "error": "Line exceeds 50 bytes"},
+        {"line": 2, "result": 4},
+    ]
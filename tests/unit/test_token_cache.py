@@ -0,0 +1,82 @@
+# tests/unit/test_token_cache.py
+
+import time
+import uuid
+from datetime import timedelta
+
+import pytest
+
+from app.auth.token_cache import TokenCache, token_cache
+from app.models.user import User
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+def test_lookup_store_and_expiry():
+    cache = TokenCache(maxsize=10)
+    user_id = uuid.uuid4()
+    assert cache.lookup("tok", now=100.0) == (False, None)
+    cache.store("tok", user_id, expires_at=200.0)
+    assert cache.lookup("tok", now=199.0) == (True, user_id)
+    assert cache.lookup("tok", now=200.0) == (False, None)
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 1
+
+
+def test_lru_eviction():
+    cache = TokenCache(maxsize=2)
+    for token in ("a", "b"):
+        cache.store(token, uuid.uuid4(), time.time() + 60)
+    cache.lookup("a")
+    cache.store("c", uuid.uuid4(), time.time() + 60)
+    assert [cache.lookup(t)[0] for t in ("a", "b", "c")] == [True, False, True]
+
+
+def test_verify_token_is_cached_until_revoked():
+    user_id = uuid.uuid4()
+    token = User.create_access_token({"sub": str(user_id)})
+    assert User.verify_token(token) == user_id
+    assert User.verify_token(token) == user_id
+    assert token_cache.stats()["hits"] == 1
+
+    User.revoke_token(token)
+    assert User.verify_token(token) is None
+    assert token_cache.stats()["revoked"] == 1
+
+
+def test_verify_token_rejects_expired_and_invalid_tokens():
+    expired = User.create_access_token({"sub": str(uuid.uuid4())}, expires_delta=timedelta(seconds=-1))
+    assert User.verify_token(expired) is None
+    assert User.verify_token("not-a-token") is None
+    assert len(token_cache) == 0
+
+
+def test_revocations_expire_and_are_capped():
+    cache = TokenCache(maxsize=10, max_revoked=3)
+    for index, token in enumerate(("a", "b", "c")):
+        cache.revoke(token, expires_at=200.0 + index, now=100.0)
+    assert cache.lookup("a", now=150.0) == (True, None)
+
+    # Full: the revocation closest to expiry makes room.
+    cache.revoke("d", expires_at=300.0, now=150.0)
+    assert cache.stats()["revoked"] == 3
+    assert cache.stats()["revocations_dropped"] == 1
+    assert cache.lookup("a", now=150.0) == (False, None)
+    assert cache.lookup("d", now=150.0) == (True, None)
+
+    # Expired revocations are purged by the next revoke.
+    cache.revoke("e", expires_at=400.0, now=250.0)
+    assert cache.stats()["revoked"] == 2
+    assert cache.stats()["revocations_dropped"] == 1
+
+
+def test_revoke_token_requires_a_valid_expiring_token():
+    assert User.revoke_token("not-a-token") is False
+    expired = User.create_access_token({"sub": str(uuid.uuid4())}, expires_delta=timedelta(seconds=-1))
+    assert User.revoke_token(expired) is False
+    assert token_cache.stats()["revoked"] == 0
@@ -0,0 +1,53 @@
+# tests/unit/test_wire.py
+
+import numpy as np
+import pytest
+
+from app.operations.batch import MaskedResult
+from app.operations.wire import (
+    HEADER,
+    WireFormatError,
+    decode_request,
+    decode_response,
+    encode_request,
+    encode_response,
+)
+
+
+def test_request_round_trip_is_zero_copy() -> None:
+    body = encode_request("divide", [1.0, 2.0, 3.0], [4.0, 5.0, 6.0], on_zero="nan")
+    assert len(body) == HEADER.size + 2 * 3 * 8
+    op, on_zero, a, b = decode_request(body)
+    assert (op, on_zero) == ("divide", "nan")
+    assert a.tolist() == [1.0, 2.0, 3.0]
+    assert b.tolist() == [4.0, 5.0, 6.0]
+    assert not a.flags.owndata and not a.flags.writeable
+
+
+def test_masked_response_carries_validity_column() -> None:
+    result = MaskedResult(np.array([2.0, np.nan]), np.array([True, False]))
+    values, valid = decode_response(encode_response("divide", "nan", result))
+    np.testing.assert_array_equal(values, [2.0, np.nan])
+    assert valid.tolist() == [True, False]
+
+
+def test_unmasked_response_has_single_column() -> None:
+    result = MaskedResult(np.array([3.0]), np.broadcast_to(True, (1,)))
+    values, valid = decode_response(encode_response("add", None, result))
+    assert values.tolist() == [3.0]
+    assert valid is None
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"CALC",
+        b"JSON" + encode_request("add", [1.0], [2.0])[4:],
+        encode_request("add", [1.0], [2.0])[:-8],
+        encode_request("add", [1.0], [2.0])[:5] + b"\x09" + encode_request("add", [1.0], [2.0])[6:],
+    ],
+    ids=["truncated_header", "bad_magic", "truncated_column", "unknown_op"],
+)
+def test_malformed_messages_are_rejected(body: bytes) -> None:
+    with pytest.raises(WireFormatError):
+        decode_request(body)